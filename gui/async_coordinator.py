@@ -0,0 +1,218 @@
+import asyncio
+import time
+
+from collections import deque
+
+import chess
+
+from gui.async_engine import AsyncEngine
+from gui.coordinator import ParallelTournament, _crash_result
+from gui.types import GameAssignment, GameUpdate, GameResult
+from gui.worker import _position_cmd, _build_pgn, _termination, HANG_GRACE
+
+
+class AsyncTournament(ParallelTournament):
+    """
+    every game in one process on one event loop — config.workers is the number
+    of concurrent games, each lane keeping a long-lived engine pair. engines are
+    the only other processes, so concurrency is bounded by CPU for them rather
+    than by python workers. updates land straight in game_states for the Terminal
+    """
+
+    def run(self):
+        assignments = self._build_assignments()
+        self.start_time = time.time()
+        self._print_header()
+
+        try:
+            asyncio.run(self._run_all(assignments))
+        except KeyboardInterrupt:
+            print('\n\n  Tournament interrupted.\n')
+
+        self._print_summary()
+
+    async def _run_all(self, assignments):
+        pending = deque(assignments)
+        lanes = [{} for _ in range(self.config.workers)]
+        display = asyncio.create_task(self._display_loop()) if self.display else None
+        try:
+            await asyncio.gather(*(self._lane(lane, pending) for lane in lanes))
+        finally:
+            if display:
+                display.cancel()
+            await asyncio.gather(*(engine.quit() for lane in lanes for engine in lane.values()),
+                                 return_exceptions=True)
+        self._refresh_display()
+
+    async def _display_loop(self):
+        while True:
+            self._refresh_display()
+            await asyncio.sleep(0.1)
+
+    async def _lane(self, lane, pending):
+        while pending:
+            a = pending.popleft()
+            try:
+                result = await self._play_game(lane, a)
+            except Exception as e:
+                # state unknown — don't hand either engine to the next game
+                for engine in lane.values():
+                    engine.kill()
+                lane.clear()
+                result = _crash_result(a, 'Engine Crash', e)
+            self._handle_result(result)
+
+            if self.sprt and self.sprt.status() and pending:
+                # decided: drop every game that hasn't started; running ones finish into the PGN
+                self.cancelled += len(pending)
+                pending.clear()
+                if self.headless:
+                    print(f'  SPRT decided — cancelled {self.cancelled} queued games')
+
+    async def _acquire(self, lane, slot, path):
+        """engine for this slot, reset with ucinewgame; returns (engine, startup seconds or None if reused)"""
+        engine = lane.get(slot)
+        if engine is not None and engine.alive and await engine.new_game():
+            return engine, None
+        if engine is not None:
+            engine.kill()
+
+        t0 = time.monotonic()
+        engine = AsyncEngine(path)
+        lane[slot] = engine  # registered first so a failed handshake is still cleaned up
+        await engine.start()
+        engine.send('ucinewgame')
+        return engine, time.monotonic() - t0
+
+    def _update(self, a, board, w_time, b_time, w_name, b_name, status, result):
+        self.game_states[a.game_id] = GameUpdate(
+            game_id=a.game_id, move_number=len(board.move_stack), fen=board.fen(),
+            w_time=w_time, b_time=b_time, white_name=w_name, black_name=b_name,
+            status=status, result=result
+        )
+
+    async def _play_game(self, lane, a: GameAssignment) -> GameResult:
+        tc_str = f'{a.time_control}+{a.increment}'
+        if a.white_is_engine_1:
+            w_path, w_name, w_slot = a.engine_1_path, a.engine_1_name, 'engine_1'
+            b_path, b_name, b_slot = a.engine_2_path, a.engine_2_name, 'engine_2'
+        else:
+            w_path, w_name, w_slot = a.engine_2_path, a.engine_2_name, 'engine_2'
+            b_path, b_name, b_slot = a.engine_1_path, a.engine_1_name, 'engine_1'
+
+        startup_time = 0.0
+        engine_starts = 0
+        engines = {}
+        for colour, slot, path in ((chess.WHITE, w_slot, w_path), (chess.BLACK, b_slot, b_path)):
+            engines[colour], startup = await self._acquire(lane, slot, path)
+            if startup is not None:
+                startup_time += startup
+                engine_starts += 1
+
+        names = {engines[chess.WHITE]: w_name, engines[chess.BLACK]: b_name}
+        move_times = []
+        stop_latencies = []
+        board = chess.Board(a.starting_fen) if a.starting_fen else chess.Board()
+        loop = asyncio.get_running_loop()
+        clocks = {chess.WHITE: float(a.time_control), chess.BLACK: float(a.time_control)}
+        inc_ms = int(a.increment * 1000)
+        ponder_state = {}
+        result_text = ''
+        termination = 'Unknown'
+
+        def go_cmd(prefix='go'):
+            return (f'{prefix} wtime {int(clocks[chess.WHITE] * 1000)} btime {int(clocks[chess.BLACK] * 1000)}'
+                    f' winc {inc_ms} binc {inc_ms}')
+
+        self._update(a, board, clocks[chess.WHITE], clocks[chess.BLACK], w_name, b_name, 'playing', None)
+
+        while not result_text:
+            if board.is_game_over():
+                result_text, termination = board.result(), _termination(board)
+                break
+
+            mover = board.turn
+            engine = engines[mover]
+            slot = w_slot if mover == chess.WHITE else b_slot
+
+            clock_ms = int(clocks[mover] * 1000)
+            predicted = ponder_state.pop(engine, None)
+            ponderhit = predicted is not None and board.peek().uci() == predicted
+            if ponderhit:
+                engine.send('ponderhit')
+            else:
+                if predicted is not None:
+                    # abandoning a ponder search is harness time, not the engine's
+                    await self._stop_search(engine, names[engine], stop_latencies)
+                    await engine.sync(timeout=1.0)
+                engine.send(_position_cmd(board, a.starting_fen))
+                engine.send(go_cmd())
+            turn_start = loop.time()  # monotonic; the clock starts once go / ponderhit is on the pipe
+
+            # a hung engine is killed once it's well past its clock
+            timeout = clocks[mover] + a.increment + HANG_GRACE if a.time_control > 0 else None
+            best_move_str, ponder_move_str = await engine.bestmove(timeout)
+            elapsed = loop.time() - turn_start
+            # pipe latency, measured off the clock while the engine is idle
+            round_trip = await engine.round_trip() if best_move_str is not None else None
+            move_times.append((names[engine], round(elapsed * 1000, 1), round_trip, clock_ms))
+            elapsed = max(0.0, elapsed - a.move_overhead_ms / 1000)
+
+            if not engine.alive or best_move_str is None:
+                engine.kill()
+                lane.pop(slot, None)
+
+            clocks[mover] = max(0, clocks[mover] - elapsed + a.increment)
+            if clocks[mover] <= 0 and a.time_control > 0:
+                result_text = '0-1' if mover == chess.WHITE else '1-0'
+                termination = 'Time Forfeit'
+                break
+
+            if best_move_str:
+                try:
+                    move = chess.Move.from_uci(best_move_str)
+                except ValueError:
+                    result_text = '0-1' if mover == chess.WHITE else '1-0'
+                    termination = f'Invalid UCI ({best_move_str})'
+                    break
+                if move not in board.legal_moves:
+                    result_text = '0-1' if mover == chess.WHITE else '1-0'
+                    termination = f'Illegal Move ({best_move_str})'
+                    break
+                board.push(move)
+            else:
+                result_text = '0-1' if mover == chess.WHITE else '1-0'
+                termination = 'Engine Crash'
+                break
+
+            if ponder_move_str and engine.supports_ponder and not board.is_game_over():
+                # position must include ponder move as last move, not the fen after it
+                engine.send(_position_cmd(board, a.starting_fen, extra_moves=[ponder_move_str]))
+                engine.send(go_cmd('go ponder'))
+                ponder_state[engine] = ponder_move_str
+
+            self._update(a, board, clocks[chess.WHITE], clocks[chess.BLACK], w_name, b_name, 'playing', None)
+
+        # clean up any active ponder
+        for pondering_engine in ponder_state:
+            await self._stop_search(pondering_engine, names[pondering_engine], stop_latencies)
+            await pondering_engine.sync(timeout=1.0)
+
+        self._update(a, board, clocks[chess.WHITE], clocks[chess.BLACK], w_name, b_name, 'completed', result_text)
+
+        return GameResult(
+            game_id=a.game_id, white_name=w_name, black_name=b_name,
+            result=result_text, termination=termination,
+            pgn_string=_build_pgn(board, w_name, b_name, result_text, termination, a.game_id, tc_str, a.starting_fen),
+            moves=len(board.move_stack), time_control=tc_str, error=None,
+            startup_time=startup_time, engine_starts=engine_starts,
+            move_times=move_times, stop_latencies=stop_latencies
+        )
+
+    async def _stop_search(self, engine, name, stop_latencies):
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        engine.send('stop')
+        best, _ = await engine.bestmove(timeout=3.0)
+        if best is not None:
+            stop_latencies.append((name, round((loop.time() - t0) * 1000, 1)))
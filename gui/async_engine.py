@@ -0,0 +1,118 @@
+import asyncio
+import os
+import signal
+import time
+
+
+class AsyncEngine:
+    """
+    UCI engine driven from an asyncio event loop — same protocol as Wrapper,
+    but every read is awaited, so one process can keep hundreds of engines busy
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.name = path.split('/')[0]  # folder name of engine
+        self.process = None
+        self.supports_ponder = False
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self, timeout=60.0):
+        if not os.path.exists(self.path):
+            raise RuntimeError(f'Could not find engine file at: {self.path}')
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                self.path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                start_new_session=(os.name != 'nt'),  # own process group, so kill() reaches the python under engine.sh
+            )
+        except OSError as e:
+            raise RuntimeError(f'Error starting engine {self.name}: {e}')
+
+        self.send('uci')
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    line = await self.readline()
+                    if line is None:
+                        raise RuntimeError(f'Engine {self.name} failed UCI handshake')
+                    if 'option name Ponder' in line:
+                        self.supports_ponder = True
+                    if 'uciok' in line:
+                        return
+        except TimeoutError:
+            self.kill()
+            raise RuntimeError(f'Engine {self.name} failed UCI handshake')
+
+    def send(self, cmd):
+        if not self.alive: return
+        try:
+            self.process.stdin.write(f'{cmd}\n'.encode())
+        except (ConnectionError, RuntimeError):
+            pass
+
+    async def readline(self):
+        """next line of output, or None once the engine has gone"""
+        try:
+            raw = await self.process.stdout.readline()
+        except (ConnectionError, ValueError):
+            return None
+        if not raw:
+            return None
+        return raw.decode(errors='replace').strip()
+
+    async def wait_for(self, prefix, timeout=None):
+        """first line starting with prefix; None on EOF or timeout"""
+        try:
+            async with asyncio.timeout(timeout):
+                while True:
+                    line = await self.readline()
+                    if line is None or line.startswith(prefix):
+                        return line
+        except TimeoutError:
+            return None
+
+    async def sync(self, timeout=5.0):
+        self.send('isready')
+        return await self.wait_for('readyok', timeout) is not None
+
+    async def round_trip(self, timeout=1.0):
+        """ms for an isready / readyok exchange with an idle engine; None if it doesn't answer"""
+        t0 = time.monotonic()
+        if not await self.sync(timeout): return None
+        return round((time.monotonic() - t0) * 1000, 1)
+
+    async def new_game(self):
+        self.send('ucinewgame')
+        return await self.sync()
+
+    async def bestmove(self, timeout=None):
+        """(move, ponder move) from the next bestmove line; (None, None) on EOF or timeout"""
+        line = await self.wait_for('bestmove', timeout)
+        if line is None:
+            return None, None
+        parts = line.split()
+        best = parts[1] if len(parts) >= 2 else None
+        ponder = parts[3] if len(parts) >= 4 and parts[2] == 'ponder' else None
+        return best, ponder
+
+    async def quit(self, timeout=2.0):
+        if not self.alive: return
+        self.send('quit')
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except TimeoutError:
+            self.kill()
+
+    def kill(self):
+        if not self.process: return
+        try:
+            if os.name != 'nt': os.killpg(self.process.pid, signal.SIGKILL)
+            else: self.process.kill()
+        except OSError:
+            pass
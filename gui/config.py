@@ -13,6 +13,12 @@ class Config:
     workers: int = 0            # 0 = auto (cpu_count - 2)
     pgn_path: str = 'games.pgn'
     openings_file: str | None = None
+    move_overhead_ms: int = 0   # per-move pipe/harness allowance not billed to the engine's clock
+    sprt: bool = False          # stop early once SPRT(elo0, elo1) decides; total_games is the cap
+    elo0: float = 0.0
+    elo1: float = 5.0
+    alpha: float = 0.05
+    beta: float = 0.05
 
     def __post_init__(self):
         if not self.engine_1_name:
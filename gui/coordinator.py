@@ -9,29 +9,33 @@ from gui.config import Config
 from gui.types import GameAssignment, GameUpdate, GameResult
 from gui.worker import play_game, _init_worker
 from gui.display import Terminal
+from gui.sprt import SPRT
+from gui.telemetry import Telemetry, timing_path
 
 
 class ParallelTournament:
     def __init__(self, config: Config, headless=False):
         self.config = config
         self.headless = headless
-        self.manager = multiprocessing.Manager()
-        self.update_queue = self.manager.Queue()
+        self.update_queue = None
         self.results: list[GameResult] = []
         self.game_states: dict[int, GameUpdate] = {}
         self.display = None if headless else Terminal(config)
         self.start_time = 0.0
+        self.sprt = SPRT(config.elo0, config.elo1, config.alpha, config.beta) if config.sprt else None
+        self.pair_games: dict[int, list[GameResult]] = {}
+        self.cancelled = 0
+        self.telemetry = Telemetry()
 
     def run(self):
         cfg = self.config
         assignments = self._build_assignments()
         self.start_time = time.time()
-
-        print(f'\n  Engine Tournament')
-        print(f'  {cfg.engine_1_name} vs {cfg.engine_2_name}')
-        print(f'  {cfg.total_games} games | {cfg.time_control}+{cfg.increment} | {cfg.workers} workers\n')
+        self._print_header()
 
         ctx = multiprocessing.get_context('spawn')
+        manager = multiprocessing.Manager()
+        self.update_queue = manager.Queue()
 
         try:
             with ProcessPoolExecutor(
@@ -41,6 +45,7 @@ class ParallelTournament:
                 initargs=(self.update_queue,)
             ) as pool:
                 futures = {}
+                stopped = False
                 for a in assignments:
                     f = pool.submit(play_game, a)
                     futures[f] = a
@@ -53,38 +58,60 @@ class ParallelTournament:
                         try:
                             result = f.result()
                         except Exception as e:
-                            a = futures[f]
-                            result = GameResult(
-                                game_id=a.game_id,
-                                white_name=a.engine_1_name if a.white_is_engine_1 else a.engine_2_name,
-                                black_name=a.engine_2_name if a.white_is_engine_1 else a.engine_1_name,
-                                result='*', termination='Worker Crash',
-                                pgn_string='', moves=0,
-                                time_control=f'{a.time_control}+{a.increment}',
-                                error=str(e)
-                            )
-                        self.results.append(result)
-                        self._write_pgn(result)
-
-                        if self.headless:
-                            tag = f'{result.termination}'
-                            if result.error: tag += f' ({result.error})'
-                            print(f'  Game {result.game_id}: {result.white_name} vs {result.black_name} -> {result.result} ({tag}, {result.moves} moves)')
-
+                            result = _crash_result(futures[f], 'Worker Crash', e)
+                        self._handle_result(result)
                         del futures[f]
 
-                    if self.display:
-                        elapsed = time.time() - self.start_time
-                        self.display.refresh(self.game_states, self.results,
-                                             self.config.total_games, elapsed)
+                    if self.sprt and self.sprt.status() and not stopped:
+                        stopped = True
+                        # decided: drop every game that hasn't started; running ones finish into the PGN
+                        for f in [f for f in futures if f.cancel()]:
+                            del futures[f]
+                            self.cancelled += 1
+                        if self.headless:
+                            print(f'  SPRT decided — cancelled {self.cancelled} queued games, '
+                                  f'waiting on {len(futures)} running')
 
+                    self._refresh_display()
                     time.sleep(0.1)
 
         except KeyboardInterrupt:
             print('\n\n  Tournament interrupted.\n')
+        finally:
+            manager.shutdown()
 
         self._print_summary()
 
+    def _print_header(self):
+        cfg = self.config
+        print(f'\n  Engine Tournament')
+        print(f'  {cfg.engine_1_name} vs {cfg.engine_2_name}')
+        print(f'  {cfg.total_games} games | {cfg.time_control}+{cfg.increment} | {cfg.workers} workers')
+        if self.sprt:
+            print(f'  SPRT elo0={cfg.elo0:g} elo1={cfg.elo1:g} alpha={cfg.alpha:g} beta={cfg.beta:g}'
+                  f' (LLR bounds {self.sprt.lower:.2f}, {self.sprt.upper:.2f})')
+        print()
+
+    def _handle_result(self, result: GameResult):
+        self.results.append(result)
+        self.telemetry.add(result)
+        self._write_pgn(result)
+
+        if self.headless:
+            tag = f'{result.termination}'
+            if result.error: tag += f' ({result.error})'
+            if result.engine_starts: tag += f', startup {result.startup_time:.2f}s'
+            print(f'  Game {result.game_id}: {result.white_name} vs {result.black_name} -> {result.result} ({tag}, {result.moves} moves)')
+
+        if self.sprt and self._record_pair(result) and self.headless:
+            print(f'  {self.sprt.summary()}')
+
+    def _refresh_display(self):
+        if self.display:
+            elapsed = time.time() - self.start_time
+            self.display.refresh(self.game_states, self.results,
+                                 self.config.total_games, elapsed, self.sprt)
+
     def _build_assignments(self):
         cfg = self.config
         openings = self._load_openings()
@@ -107,11 +134,31 @@ class ParallelTournament:
                 time_control=cfg.time_control,
                 increment=cfg.increment,
                 white_is_engine_1=white_is_engine_1,
-                starting_fen=fen
+                starting_fen=fen,
+                move_overhead_ms=cfg.move_overhead_ms
             ))
 
         return assignments
 
+    def _record_pair(self, result: GameResult):
+        """feed a finished game to the SPRT; returns True when it completed a scored pair"""
+        pair = (result.game_id - 1) // 2
+        games = self.pair_games.setdefault(pair, [])
+        games.append(result)
+        if len(games) < 2 or self.sprt.status():
+            return False
+        # a crashed or unfinished game voids its pair — half a pair carries the opening bias
+        if any(g.error or g.result == '*' for g in games):
+            return False
+        self.sprt.add_pair(sum(self._engine_1_points(g) for g in games))
+        return True
+
+    def _engine_1_points(self, result: GameResult):
+        if '1/2' in result.result:
+            return 0.5
+        white_won = result.result == '1-0'
+        return 1.0 if white_won == (result.white_name == self.config.engine_1_name) else 0.0
+
     def _load_openings(self):
         path = self.config.openings_file
 
@@ -186,4 +233,38 @@ class ParallelTournament:
         if errors:
             print(f'\n  {errors} game(s) had errors')
 
+        starts = sum(r.engine_starts for r in self.results)
+        startup = sum(r.startup_time for r in self.results)
+        print(f'\n  engine startup: {starts} launch(es), {startup:.1f}s total, '
+              f'{startup / len(self.results):.2f}s/game')
+
+        timing_lines = self.telemetry.summary_lines()
+        if timing_lines:
+            print()
+            for line in timing_lines:
+                print(line)
+            try:
+                path = timing_path(cfg.pgn_path)
+                self.telemetry.write(path)
+                print(f'  timing histograms -> {path}')
+            except OSError:
+                pass
+
+        if self.sprt:
+            print(f'\n  {self.sprt.summary()}')
+            if self.cancelled:
+                print(f'  stopped early: {self.cancelled} queued game(s) cancelled')
+
         print(f'  {"=" * 50}\n')
+
+
+def _crash_result(a: GameAssignment, termination, error):
+    return GameResult(
+        game_id=a.game_id,
+        white_name=a.engine_1_name if a.white_is_engine_1 else a.engine_2_name,
+        black_name=a.engine_2_name if a.white_is_engine_1 else a.engine_1_name,
+        result='*', termination=termination,
+        pgn_string='', moves=0,
+        time_control=f'{a.time_control}+{a.increment}',
+        error=str(error)
+    )
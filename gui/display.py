@@ -23,7 +23,7 @@ class Terminal:
         self.prev_lines = 0
 
     def refresh(self, game_states: dict[int, GameUpdate], results: list[GameResult],
-                total_games: int, elapsed: float):
+                total_games: int, elapsed: float, sprt=None):
         lines = []
 
         completed = len(results)
@@ -119,6 +119,12 @@ class Terminal:
                     f'  {Colours.RED}L:{s["losses"]}{Colours.RESET}'
                 )
 
+        if sprt is not None:
+            status = sprt.status()
+            colour = Colours.GREEN if status == 'H1' else Colours.RED if status == 'H0' else Colours.CYAN
+            lines.append('')
+            lines.append(f'  {colour}{sprt.summary()}{Colours.RESET}')
+
         lines.append('')
 
         # clear previous output and write new
@@ -1,5 +1,5 @@
 from gui.console import log_error, log_info, log_engine, log_gui, Colour
-import os, sys, subprocess, time
+import os, sys, signal, subprocess, time
 
 class Wrapper:
     def __init__(self, path: str, version : str = '', console_colour=Colour.RESET, quiet=False):
@@ -30,7 +30,8 @@ class Wrapper:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
-                bufsize=1
+                bufsize=1,
+                start_new_session=(os.name != 'nt')  # own process group, so kill() reaches the python under engine.sh
             )
 
             if self.process.poll() is not None:
@@ -53,6 +54,15 @@ class Wrapper:
             except:
                 pass
 
+    def kill(self):
+        if not self.process: return
+        try:
+            if os.name != 'nt': os.killpg(self.process.pid, signal.SIGKILL)
+            else: self.process.kill()
+        except OSError:
+            pass
+        self.process.wait()
+
     def _send_cmd(self, cmd):
         if self.process and self.process.poll() is None:
             try:
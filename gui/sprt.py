@@ -0,0 +1,110 @@
+import math
+
+# pair score (engine 1's points over both colours) -> pentanomial bin
+_PAIR_BINS = {0.0: 0, 0.5: 1, 1.0: 2, 1.5: 3, 2.0: 4}
+_SCORES = (0.0, 0.25, 0.5, 0.75, 1.0)  # per-game score of each bin
+
+
+def _expected_score(elo):
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def _elo(score):
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def _mle(probs, s):
+    """
+    pentanomial closest to probs (max likelihood) whose mean is s
+
+    the optimum has the form p_i = probs_i / (1 + lam * (x_i - s)); the mean
+    constraint is monotone in lam, so bisect it
+    """
+    lo, hi = -1.0 / (1.0 - s), 1.0 / s
+    for _ in range(100):
+        lam = (lo + hi) / 2
+        g = sum(p * (x - s) / (1 + lam * (x - s)) for p, x in zip(probs, _SCORES))
+        if g > 0:
+            lo = lam
+        else:
+            hi = lam
+    lam = (lo + hi) / 2
+    p = [q / (1 + lam * (x - s)) for q, x in zip(probs, _SCORES)]
+    total = sum(p)
+    return [q / total for q in p]
+
+
+class SPRT:
+    """
+    sequential probability ratio test over game pairs (pentanomial model)
+
+    each opening is played twice with colours reversed, so a pair's score for
+    engine 1 falls in one of five bins (0, 0.5, 1, 1.5, 2). counting pairs
+    rather than games absorbs the opening bias and gives the LLR its true
+    variance. elo0/elo1 are logistic elo
+    """
+
+    def __init__(self, elo0=0.0, elo1=5.0, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+        self.s0 = _expected_score(elo0)
+        self.s1 = _expected_score(elo1)
+        self.penta = [0] * 5
+
+    @property
+    def pairs(self):
+        return sum(self.penta)
+
+    def add_pair(self, engine_1_points):
+        self.penta[_PAIR_BINS[engine_1_points]] += 1
+
+    def _probs(self):
+        """observed bin frequencies, with a small prior so empty bins stay possible"""
+        counts = [c if c else 1e-3 for c in self.penta]
+        n = sum(counts)
+        return [c / n for c in counts]
+
+    def _stats(self):
+        """(mean per-game score, variance of the mean)"""
+        probs = self._probs()
+        mean = sum(p * x for p, x in zip(probs, _SCORES))
+        var = sum(p * (x - mean) ** 2 for p, x in zip(probs, _SCORES))
+        return mean, var / self.pairs
+
+    def llr(self):
+        # exact GSPRT: log likelihood of the data under the most likely pentanomial
+        # with mean s1 vs the most likely one with mean s0. stays sane on tiny
+        # samples, where the normal approximation blows up on a near-zero variance
+        if self.pairs < 2:
+            return 0.0
+        probs = self._probs()
+        p0 = _mle(probs, self.s0)
+        p1 = _mle(probs, self.s1)
+        return sum(c * math.log(a / b) for c, a, b in zip(self.penta, p1, p0) if c)
+
+    def elo(self):
+        """(elo, 95% error) for engine 1"""
+        if self.pairs < 2:
+            return 0.0, 0.0
+        mean, var_mean = self._stats()
+        margin = 1.96 * math.sqrt(var_mean)
+        return _elo(mean), (_elo(mean + margin) - _elo(mean - margin)) / 2
+
+    def status(self):
+        """'H0' / 'H1' once a bound is crossed, else None"""
+        llr = self.llr()
+        if llr >= self.upper:
+            return 'H1'
+        if llr <= self.lower:
+            return 'H0'
+        return None
+
+    def summary(self):
+        elo, err = self.elo()
+        verdict = {'H1': '  H1 accepted', 'H0': '  H0 accepted'}.get(self.status(), '')
+        return (f'SPRT [{self.elo0:g}, {self.elo1:g}]  LLR {self.llr():.2f} '
+                f'({self.lower:.2f}, {self.upper:.2f})  Elo {elo:+.1f} ± {err:.1f}  '
+                f'pairs {self.pairs} {self.penta}{verdict}')
@@ -0,0 +1,89 @@
+import json
+import os
+
+from bisect import bisect_left
+from collections import defaultdict
+
+from gui.types import GameResult
+
+# histogram bucket upper edges; the last bucket is open-ended
+THINK_MS_EDGES   = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+USAGE_EDGES      = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)   # think time / clock at go
+LATENCY_MS_EDGES = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+def timing_path(pgn_path):
+    return f'{os.path.splitext(pgn_path)[0]}.timing.json'
+
+
+def _histogram(values, edges):
+    counts = [0] * (len(edges) + 1)
+    for v in values:
+        counts[bisect_left(edges, v)] += 1
+    labels = [f'<={e:g}' for e in edges] + [f'>{edges[-1]:g}']
+    return dict(zip(labels, counts))
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Telemetry:
+    """
+    per-engine move timing collected from GameResult.move_times / stop_latencies
+
+    think is wall time from go (or ponderhit) to bestmove; transport is an
+    isready / readyok round trip timed right after bestmove, i.e. the pipe +
+    scheduling latency that think time includes but the engine never saw.
+    moves without a bestmove have no transport figure
+    """
+
+    def __init__(self):
+        self.think = defaultdict(list)
+        self.usage = defaultdict(list)
+        self.transport = defaultdict(list)
+        self.stop = defaultdict(list)
+
+    def add(self, result: GameResult):
+        for name, wall_ms, round_trip_ms, clock_ms in result.move_times:
+            self.think[name].append(wall_ms)
+            if clock_ms > 0:
+                self.usage[name].append(wall_ms / clock_ms)
+            if round_trip_ms is not None:
+                self.transport[name].append(round_trip_ms)
+        for name, latency_ms in result.stop_latencies:
+            self.stop[name].append(latency_ms)
+
+    def report(self):
+        out = {}
+        for name in sorted(set(self.think) | set(self.stop)):
+            out[name] = {
+                'moves': len(self.think[name]),
+                'think_ms': _histogram(self.think[name], THINK_MS_EDGES),
+                'think_vs_clock': _histogram(self.usage[name], USAGE_EDGES),
+                'transport_ms': _histogram(self.transport[name], LATENCY_MS_EDGES),
+                'stop_to_bestmove_ms': _histogram(self.stop[name], LATENCY_MS_EDGES),
+                'p50': {k: _percentile(getattr(self, k)[name], 0.5)
+                        for k in ('think', 'usage', 'transport', 'stop')},
+                'p95': {k: _percentile(getattr(self, k)[name], 0.95)
+                        for k in ('think', 'usage', 'transport', 'stop')},
+            }
+        return out
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def summary_lines(self):
+        lines = []
+        for name, r in self.report().items():
+            fmt = lambda v, unit='ms': '-' if v is None else f'{v:.0f}{unit}' if unit else f'{v:.2f}'
+            lines.append(
+                f'  {name:20s}  think p50 {fmt(r["p50"]["think"])} p95 {fmt(r["p95"]["think"])}'
+                f'  | transport p50 {fmt(r["p50"]["transport"])} p95 {fmt(r["p95"]["transport"])}'
+                f'  | stop p95 {fmt(r["p95"]["stop"])}'
+            )
+        return lines
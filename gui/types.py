@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 @dataclass
 class GameAssignment:
@@ -11,6 +11,7 @@ class GameAssignment:
     increment: int            # seconds
     white_is_engine_1: bool   # alternates per pair
     starting_fen: str | None  # from openings file, or None for startpos
+    move_overhead_ms: int = 0 # per-move allowance not billed to the engine
 
 @dataclass
 class GameUpdate:
@@ -35,3 +36,7 @@ class GameResult:
     moves: int                # total half-moves
     time_control: str         # "60+0" format for PGN header
     error: str | None         # non-None if worker crashed
+    startup_time: float = 0.0 # seconds spent launching engines for this game
+    engine_starts: int = 0    # engines launched (0 when both were reused)
+    move_times: list = field(default_factory=list)      # (engine, wall ms, isready round trip ms | None, clock ms at go)
+    stop_latencies: list = field(default_factory=list)  # (engine, ms from stop to bestmove)
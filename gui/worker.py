@@ -1,6 +1,9 @@
+import atexit
 import chess
 import chess.pgn
 import datetime
+import os
+import threading
 import time
 import io
 
@@ -10,9 +13,43 @@ from gui.types import GameAssignment, GameUpdate, GameResult
 # set by pool initialiser — avoids pickling issues
 _update_queue = None
 
+# long-lived engines owned by this worker process, keyed by tournament slot
+# ('engine_1' / 'engine_2') so both sides stay separate even on the same path
+_engines = {}
+
+HANG_GRACE = 5.0  # seconds past the mover's clock before an engine is treated as hung
+
 def _init_worker(q):
     global _update_queue
     _update_queue = q
+    atexit.register(_stop_engines)
+
+def _stop_engines():
+    for engine in _engines.values():
+        engine.stop()
+    _engines.clear()
+
+def _acquire_engine(slot, path):
+    """engine for this slot, reset with ucinewgame; returns (engine, startup seconds or None if reused)"""
+    engine = _engines.get(slot)
+    if (engine is not None and engine.process is not None and engine.path == os.path.abspath(path)
+            and engine.process.poll() is None):
+        engine._send_cmd('ucinewgame')
+        if _sync_engine(engine, timeout=5.0):
+            return engine, None
+    _release_engine(slot)
+
+    t0 = time.monotonic()
+    engine = Wrapper(path, quiet=True)
+    _engines[slot] = engine  # registered first so a failed handshake is still cleaned up
+    engine.start()
+    engine._send_cmd('ucinewgame')
+    return engine, time.monotonic() - t0
+
+def _release_engine(slot):
+    engine = _engines.pop(slot, None)
+    if engine is not None:
+        engine.kill()
 
 def _position_cmd(board, starting_fen, extra_moves=None):
     """emit a uci position command carrying full game history so the engine can detect repetition"""
@@ -27,31 +64,43 @@ def _position_cmd(board, starting_fen, extra_moves=None):
         cmd += ' moves ' + ' '.join(moves)
     return cmd
 
+def _termination(board):
+    if board.is_checkmate(): return 'Checkmate'
+    if board.is_stalemate(): return 'Stalemate'
+    if board.is_insufficient_material(): return 'Insufficient Material'
+    if board.is_seventyfive_moves(): return '75 Move Rule'
+    if board.is_fivefold_repetition(): return 'Fivefold Repetition'
+    return 'Draw'
+
 def play_game(assignment: GameAssignment) -> GameResult:
     a = assignment
     tc_str = f"{a.time_control}+{a.increment}"
 
     if a.white_is_engine_1:
-        w_path, w_name = a.engine_1_path, a.engine_1_name
-        b_path, b_name = a.engine_2_path, a.engine_2_name
+        w_path, w_name, w_slot = a.engine_1_path, a.engine_1_name, 'engine_1'
+        b_path, b_name, b_slot = a.engine_2_path, a.engine_2_name, 'engine_2'
     else:
-        w_path, w_name = a.engine_2_path, a.engine_2_name
-        b_path, b_name = a.engine_1_path, a.engine_1_name
+        w_path, w_name, w_slot = a.engine_2_path, a.engine_2_name, 'engine_2'
+        b_path, b_name, b_slot = a.engine_1_path, a.engine_1_name, 'engine_1'
 
-    engine_w = None
-    engine_b = None
+    restart = set()  # slots whose engine crashed or hung — relaunched next game
+    startup_time = 0.0
+    engine_starts = 0
+    move_times = []
+    stop_latencies = []
+    overhead = a.move_overhead_ms / 1000
 
     try:
-        engine_w = Wrapper(w_path, quiet=True)
-        engine_b = Wrapper(b_path, quiet=True)
-        engine_w.start()
-        engine_b.start()
-
+        engine_w, w_startup = _acquire_engine(w_slot, w_path)
+        engine_b, b_startup = _acquire_engine(b_slot, b_path)
+        for startup in (w_startup, b_startup):
+            if startup is not None:
+                startup_time += startup
+                engine_starts += 1
+
+        names = {engine_w: w_name, engine_b: b_name}
         board = chess.Board(a.starting_fen) if a.starting_fen else chess.Board()
 
-        engine_w._send_cmd('ucinewgame')
-        engine_b._send_cmd('ucinewgame')
-
         w_time = float(a.time_control)
         b_time = float(a.time_control)
 
@@ -62,25 +111,18 @@ def play_game(assignment: GameAssignment) -> GameResult:
 
         while not result_text:
             if board.is_game_over():
-                result_text = board.result()
-                if board.is_checkmate(): termination = 'Checkmate'
-                elif board.is_stalemate(): termination = 'Stalemate'
-                elif board.is_insufficient_material(): termination = 'Insufficient Material'
-                elif board.is_seventyfive_moves(): termination = '75 Move Rule'
-                elif board.is_fivefold_repetition(): termination = 'Fivefold Repetition'
-                else: termination = 'Draw'
+                result_text, termination = board.result(), _termination(board)
                 break
 
             is_white = board.turn == chess.WHITE
             engine = engine_w if is_white else engine_b
+            slot = w_slot if is_white else b_slot
             opponent = engine_b if is_white else engine_w
 
             w_ms = int(w_time * 1000)
             b_ms = int(b_time * 1000)
             inc_ms = int(a.increment * 1000)
 
-            turn_start = time.time()
-
             ponderhit = False
             ponder_predicted_move = ponder_state.pop(engine, None)
             if ponder_predicted_move is not None:
@@ -89,8 +131,8 @@ def play_game(assignment: GameAssignment) -> GameResult:
                     engine._send_cmd(f'ponderhit')
                     ponderhit = True
                 else:
-                    engine._send_cmd('stop')
-                    _drain_bestmove(engine)
+                    # abandoning a ponder search is harness time, not the engine's
+                    _stop_search(engine, names[engine], stop_latencies)
                     _sync_engine(engine)
                     engine._send_cmd(_position_cmd(board, a.starting_fen))
                     engine._send_cmd(f'go wtime {w_ms} btime {b_ms} winc {inc_ms} binc {inc_ms}')
@@ -98,8 +140,16 @@ def play_game(assignment: GameAssignment) -> GameResult:
                 engine._send_cmd(_position_cmd(board, a.starting_fen))
                 engine._send_cmd(f'go wtime {w_ms} btime {b_ms} winc {inc_ms} binc {inc_ms}')
 
-            if ponderhit:
-                turn_start = time.time()
+            # the clock starts once go / ponderhit is on the pipe
+            turn_start = time.monotonic()
+
+            # a hung engine would block readline forever: kill it once it's well past its clock
+            watchdog = None
+            if a.time_control > 0:
+                clock = (w_time if is_white else b_time) + a.increment
+                watchdog = threading.Timer(clock + HANG_GRACE, engine.kill)
+                watchdog.daemon = True
+                watchdog.start()
 
             best_move_str = None
             ponder_move_str = None
@@ -119,13 +169,24 @@ def play_game(assignment: GameAssignment) -> GameResult:
                         ponder_move_str = parts[3]
                     break
 
-            elapsed = time.time() - turn_start
+            if watchdog is not None:
+                watchdog.cancel()
+
+            elapsed = time.monotonic() - turn_start
+            # pipe latency, measured off the clock while the engine is idle
+            round_trip = _round_trip(engine) if best_move_str else None
+            move_times.append((names[engine], round(elapsed * 1000, 1), round_trip,
+                               w_ms if is_white else b_ms))
+            elapsed = max(0.0, elapsed - overhead)
 
             if is_white:
                 w_time = max(0, w_time - elapsed + a.increment)
             else:
                 b_time = max(0, b_time - elapsed + a.increment)
 
+            if engine.process.poll() is not None:
+                restart.add(slot)
+
             time_left = w_time if is_white else b_time
             if time_left <= 0 and a.time_control > 0:
                 result_text = '0-1' if is_white else '1-0'
@@ -167,8 +228,7 @@ def play_game(assignment: GameAssignment) -> GameResult:
         # clean up any active ponder
         for pondering_engine in list(ponder_state):
             try:
-                pondering_engine._send_cmd('stop')
-                _drain_bestmove(pondering_engine)
+                _stop_search(pondering_engine, names[pondering_engine], stop_latencies)
                 _sync_engine(pondering_engine)
             except Exception:
                 pass
@@ -182,43 +242,63 @@ def play_game(assignment: GameAssignment) -> GameResult:
         return GameResult(
             game_id=a.game_id, white_name=w_name, black_name=b_name,
             result=result_text, termination=termination, pgn_string=pgn_string,
-            moves=len(board.move_stack), time_control=tc_str, error=None
+            moves=len(board.move_stack), time_control=tc_str, error=None,
+            startup_time=startup_time, engine_starts=engine_starts,
+            move_times=move_times, stop_latencies=stop_latencies
         )
 
     except Exception as e:
+        restart.update((w_slot, b_slot))  # state unknown — don't hand either engine to the next game
         _send_update(a.game_id, 0, '', 0, 0, w_name, b_name, 'completed', '*')
         return GameResult(
             game_id=a.game_id, white_name=w_name, black_name=b_name,
             result='*', termination='Engine Crash', pgn_string='',
-            moves=0, time_control=tc_str, error=str(e)
+            moves=0, time_control=tc_str, error=str(e),
+            startup_time=startup_time, engine_starts=engine_starts
         )
 
     finally:
-        if engine_w: engine_w.stop()
-        if engine_b: engine_b.stop()
+        for slot in restart:
+            _release_engine(slot)
 
 
 def _drain_bestmove(engine, timeout=3.0):
+    """read up to the next bestmove; True if one arrived in time"""
     import select
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
         try:
-            ready = select.select([engine.process.stdout], [], [], max(0, deadline - time.time()))
+            ready = select.select([engine.process.stdout], [], [], max(0, deadline - time.monotonic()))
             if not ready[0]: break
             line = engine.process.stdout.readline()
             if not line: break
-            if line.strip().startswith('bestmove'): break
+            if line.strip().startswith('bestmove'): return True
         except OSError:
             break
+    return False
+
+
+def _stop_search(engine, name, stop_latencies):
+    t0 = time.monotonic()
+    engine._send_cmd('stop')
+    if _drain_bestmove(engine):
+        stop_latencies.append((name, round((time.monotonic() - t0) * 1000, 1)))
+
+
+def _round_trip(engine, timeout=1.0):
+    """ms for an isready / readyok exchange with an idle engine; None if it doesn't answer"""
+    t0 = time.monotonic()
+    if not _sync_engine(engine, timeout): return None
+    return round((time.monotonic() - t0) * 1000, 1)
 
 
 def _sync_engine(engine, timeout=1.0):
     import select
     engine._send_cmd('isready')
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
         try:
-            ready = select.select([engine.process.stdout], [], [], max(0, deadline - time.time()))
+            ready = select.select([engine.process.stdout], [], [], max(0, deadline - time.monotonic()))
             if not ready[0]: break
             line = engine.process.stdout.readline()
             if not line: break
@@ -1,17 +1,80 @@
+import hashlib
+import json
+import math
+import mmap
+import os
 import re
-from collections import defaultdict, Counter
-
-def parse_games(pgn_text):
-    raw_games = re.split(r'(?=\[Event\s)', pgn_text.strip())
-    games = []
-    header_regex = re.compile(r'^\[([A-Za-z0-9_]+)\s+"([^"]*)"\]\s*$', re.MULTILINE)
-
-    for raw in raw_games:
-        if not raw.strip(): continue
-        headers = dict(header_regex.findall(raw))
-        if headers:
-            games.append(headers)
-    return games
+import sys
+
+HEADER_RE = re.compile(rb'^\[([A-Za-z0-9_]+)\s+"([^"]*)"\]\s*$')
+GAME_START = b'[Event '
+RESULT_TOKENS = (b'1-0', b'0-1', b'1/2-1/2', b'*')
+STATE_VERSION = 1
+HEAD_BYTES = 4096  # fingerprint of the file start, so a replaced pgn isn't mistaken for an appended one
+
+def state_path(pgn_path):
+    return f'{os.path.splitext(pgn_path)[0]}.results.json'
+
+def _parse_header_block(mm, pos):
+    """headers of the block at pos, line by line until the first non-tag line"""
+    headers = {}
+    while True:
+        end = mm.find(b'\n', pos)
+        if end == -1: end = len(mm)
+        line = mm[pos:end].strip()
+        if not line.startswith(b'['): return headers
+        m = HEADER_RE.match(line)
+        if m: headers[m.group(1).decode()] = m.group(2).decode('utf-8', errors='replace')
+        if end >= len(mm): return headers
+        pos = end + 1
+
+def iter_games(path, offset=0):
+    """
+    (headers, end offset) for each complete game at or after byte offset
+
+    the file is memory-mapped and only header blocks are parsed — movetext is
+    skipped with a find for the next game, so memory stays flat however large
+    the archive. a final game whose movetext doesn't end in a result token is
+    still being written and is left for the next run
+    """
+    size = os.path.getsize(path)
+    if size <= offset: return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = mm.find(GAME_START, offset)
+        while pos != -1:
+            headers = _parse_header_block(mm, pos)
+            nxt = mm.find(b'\n' + GAME_START, pos + 1)
+            if nxt == -1:
+                if not mm[pos:size].rstrip().endswith(RESULT_TOKENS): return
+                yield headers, size
+                return
+            yield headers, nxt + 1
+            pos = nxt + 1
+
+def _file_head(path, n):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(n)).hexdigest()
+
+def load_state(path):
+    """(offset, stats) from the state file, or (0, {}) when missing, stale or for a different pgn"""
+    try:
+        with open(state_path(path)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return 0, {}
+    offset = state.get('offset', 0)
+    if (state.get('version') != STATE_VERSION or offset > os.path.getsize(path)
+            or state.get('head') != _file_head(path, min(HEAD_BYTES, offset))):
+        return 0, {}
+    return offset, state.get('stats', {})
+
+def save_state(path, offset, stats):
+    state = {'version': STATE_VERSION, 'offset': offset,
+             'head': _file_head(path, min(HEAD_BYTES, offset)), 'stats': stats}
+    tmp = state_path(path) + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, state_path(path))
 
 def get_points(result):
     result = result.strip()
@@ -20,54 +83,87 @@ def get_points(result):
     if result in ('1/2-1/2', '½-½', '1/2–1/2'): return 0.5, 0.5, 'draw'
     return 0.0, 0.0, 'unknown'
 
-def analyse_tournament(games):
-    stats = defaultdict(lambda: {
-        'games': 0,
-        'players': defaultdict(lambda: {
-            'score': 0.0, 'wins': 0, 'draws': 0, 'losses': 0,
-            'reasons': defaultdict(Counter) 
-        })
+def _player(s, name):
+    return s['players'].setdefault(name, {
+        'score': 0.0, 'wins': 0, 'draws': 0, 'losses': 0,
+        'reasons': {'win': {}, 'draw': {}, 'loss': {}}
     })
 
-    for g in games:
-        tc = g.get('TimeControl', 'Unknown TC')
-        white = g.get('White', 'White')
-        black = g.get('Black', 'Black')
-        result = g.get('Result', '*')
-        termination = g.get('Termination', 'normal')
-
-        for category in [tc, "Overall"]:
-            s = stats[category]
-            s['games'] += 1
-            
-            w_pts, b_pts, res_type = get_points(result)
-
-            p_white = s['players'][white]
-            p_white['score'] += w_pts
-
-            p_black = s['players'][black]
-            p_black['score'] += b_pts
-
-            if w_pts == 1.0:
-                p_white['wins'] += 1
-                p_white['reasons']['win'][termination] += 1
-                p_black['losses'] += 1
-                p_black['reasons']['loss'][termination] += 1
-            
-            elif b_pts == 1.0:
-                p_black['wins'] += 1
-                p_black['reasons']['win'][termination] += 1
-                p_white['losses'] += 1
-                p_white['reasons']['loss'][termination] += 1
-            
-            elif w_pts == 0.5:
-                p_white['draws'] += 1
-                p_white['reasons']['draw'][termination] += 1
-                p_black['draws'] += 1
-                p_black['reasons']['draw'][termination] += 1
+def _count(player, outcome, termination):
+    reasons = player['reasons'][outcome]
+    reasons[termination] = reasons.get(termination, 0) + 1
+
+def add_game(stats, g):
+    """fold one game's headers into stats (plain dicts, so they round-trip through the state file)"""
+    tc = g.get('TimeControl', 'Unknown TC')
+    white = g.get('White', 'White')
+    black = g.get('Black', 'Black')
+    result = g.get('Result', '*')
+    termination = g.get('Termination', 'normal')
+
+    for category in [tc, "Overall"]:
+        s = stats.setdefault(category, {'games': 0, 'players': {}})
+        s['games'] += 1
+
+        w_pts, b_pts, res_type = get_points(result)
+
+        p_white = _player(s, white)
+        p_white['score'] += w_pts
+
+        p_black = _player(s, black)
+        p_black['score'] += b_pts
+
+        if w_pts == 1.0:
+            p_white['wins'] += 1
+            _count(p_white, 'win', termination)
+            p_black['losses'] += 1
+            _count(p_black, 'loss', termination)
 
+        elif b_pts == 1.0:
+            p_black['wins'] += 1
+            _count(p_black, 'win', termination)
+            p_white['losses'] += 1
+            _count(p_white, 'loss', termination)
+
+        elif w_pts == 0.5:
+            p_white['draws'] += 1
+            _count(p_white, 'draw', termination)
+            p_black['draws'] += 1
+            _count(p_black, 'draw', termination)
+
+def analyse_tournament(games):
+    stats = {}
+    for g in games:
+        add_game(stats, g)
     return stats
 
+def update_stats(path, rebuild=False):
+    """stats for the whole pgn, reading only the games appended since the last run"""
+    offset, stats = (0, {}) if rebuild else load_state(path)
+    new_games = 0
+    for headers, end in iter_games(path, offset):
+        add_game(stats, headers)
+        offset = end
+        new_games += 1
+    if new_games: save_state(path, offset, stats)
+    return stats, new_games
+
+def _elo(score):
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+def elo_summary(p):
+    """(elo, 95% error, LOS, draw ratio) of a player against its opponents; None before any game"""
+    n = p['wins'] + p['draws'] + p['losses']
+    if n == 0: return None
+    mu = (p['wins'] + 0.5 * p['draws']) / n
+    var = (p['wins'] * (1.0 - mu) ** 2 + p['draws'] * (0.5 - mu) ** 2 + p['losses'] * mu ** 2) / n
+    margin = 1.96 * math.sqrt(var / n)
+    err = (_elo(mu + margin) - _elo(mu - margin)) / 2
+    decisive = p['wins'] + p['losses']
+    los = 0.5 * (1.0 + math.erf((p['wins'] - p['losses']) / math.sqrt(2.0 * decisive))) if decisive else 0.5
+    return _elo(mu) + 0.0, err, los, p['draws'] / n  # + 0.0: no "-0" for an even score
+
 def format_reasons(reason_dict):
     if not reason_dict: return ""
     items = [f"{k}:{v}" for k, v in reason_dict.items()]
@@ -89,6 +185,11 @@ def print_results(stats):
         for name, p_data in ranking:
             print(f"{name:12s} : {p_data['score']:5.1f} pts  (W:{p_data['wins']} D:{p_data['draws']} L:{p_data['losses']})")
 
+            summary = elo_summary(p_data)
+            if summary:
+                elo, err, los, draw_ratio = summary
+                print(f"    Elo    : {elo:+.0f} ± {err:.0f}  LOS: {los:.1%}  Draws: {draw_ratio:.1%}")
+
             if p_data['wins'] > 0:
                 print(f"    Wins   : {format_reasons(p_data['reasons']['win'])}")
             if p_data['draws'] > 0:
@@ -107,30 +208,33 @@ def print_results(stats):
         print("\n")
 
 if __name__ == '__main__':
-    path = 'games.pgn'
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            pgn_content = f.read()
-        
-        games_list = parse_games(pgn_content)
-        if not games_list:
-            print("No games found in file")
-        else:
-            tournament_stats = analyse_tournament(games_list)
-            print_results(tournament_stats)
-            
-    except FileNotFoundError:
+    # usage: python results.py [games.pgn] [--rebuild]
+    args = [a for a in sys.argv[1:] if a != '--rebuild']
+    path = args[0] if args else 'games.pgn'
+    if not os.path.exists(path):
         print(f"Error: File '{path}' not found")
+        sys.exit(1)
+
+    tournament_stats, new_games = update_stats(path, rebuild='--rebuild' in sys.argv)
+    if not tournament_stats:
+        print("No games found in file")
+    else:
+        print(f"{new_games} new games read (state: {state_path(path)})\n")
+        print_results(tournament_stats)
 
 """
+67 new games read (state: games.results.json)
+
 ------------------------------------------------------------
 TimeControl: 120+1 (Games: 15)
 ------------------------------------------------------------
 fixed        :   9.0 pts  (W:9 D:0 L:6)
+    Elo    : +70 ± 202  LOS: 78.1%  Draws: 0.0%
     Wins   : [Checkmate:9]
     Losses : [Illegal Move (0000):2, Checkmate:4]
 
 sophia       :   6.0 pts  (W:6 D:0 L:9)
+    Elo    : -70 ± 202  LOS: 21.9%  Draws: 0.0%
     Wins   : [Illegal Move (0000):2, Checkmate:4]
     Losses : [Checkmate:9]
 
@@ -141,11 +245,13 @@ sophia       :   6.0 pts  (W:6 D:0 L:9)
 TimeControl: 180+0 (Games: 27)
 ------------------------------------------------------------
 fixed        :  23.5 pts  (W:23 D:1 L:3)
+    Elo    : +331 ± 321  LOS: 100.0%  Draws: 3.7%
     Wins   : [Checkmate:22, Illegal Move (0000):1]
     Draws  : [Fivefold Repetition:1]
     Losses : [Checkmate:2, Time Forfeit:1]
 
 sophia       :   3.5 pts  (W:3 D:1 L:23)
+    Elo    : -331 ± 321  LOS: 0.0%  Draws: 3.7%
     Wins   : [Checkmate:2, Time Forfeit:1]
     Draws  : [Fivefold Repetition:1]
     Losses : [Checkmate:22, Illegal Move (0000):1]
@@ -157,10 +263,12 @@ sophia       :   3.5 pts  (W:3 D:1 L:23)
 TimeControl: 300+5 (Games: 10)
 ------------------------------------------------------------
 fixed        :   7.0 pts  (W:7 D:0 L:3)
+    Elo    : +147 ± 387  LOS: 89.7%  Draws: 0.0%
     Wins   : [Illegal Move (0000):1, Checkmate:6]
     Losses : [Illegal Move (0000):2, Checkmate:1]
 
 sophia       :   3.0 pts  (W:3 D:0 L:7)
+    Elo    : -147 ± 387  LOS: 10.3%  Draws: 0.0%
     Wins   : [Illegal Move (0000):2, Checkmate:1]
     Losses : [Illegal Move (0000):1, Checkmate:6]
 
@@ -171,11 +279,13 @@ sophia       :   3.0 pts  (W:3 D:0 L:7)
 TimeControl: 60+0 (Games: 15)
 ------------------------------------------------------------
 fixed        :  11.0 pts  (W:10 D:2 L:3)
+    Elo    : +176 ± 224  LOS: 97.4%  Draws: 13.3%
     Wins   : [Checkmate:10]
     Draws  : [Fivefold Repetition:2]
     Losses : [Checkmate:3]
 
 sophia       :   4.0 pts  (W:3 D:2 L:10)
+    Elo    : -176 ± 224  LOS: 2.6%  Draws: 13.3%
     Wins   : [Checkmate:3]
     Draws  : [Fivefold Repetition:2]
     Losses : [Checkmate:10]
@@ -187,11 +297,13 @@ sophia       :   4.0 pts  (W:3 D:2 L:10)
 TimeControl: Overall (Games: 67)
 ------------------------------------------------------------
 fixed        :  50.5 pts  (W:49 D:3 L:15)
+    Elo    : +194 ± 98  LOS: 100.0%  Draws: 4.5%
     Wins   : [Checkmate:47, Illegal Move (0000):2]
     Draws  : [Fivefold Repetition:3]
     Losses : [Checkmate:10, Time Forfeit:1, Illegal Move (0000):4]
 
 sophia       :  16.5 pts  (W:15 D:3 L:49)
+    Elo    : -194 ± 98  LOS: 0.0%  Draws: 4.5%
     Wins   : [Checkmate:10, Time Forfeit:1, Illegal Move (0000):4]
     Draws  : [Fivefold Repetition:3]
     Losses : [Checkmate:47, Illegal Move (0000):2]
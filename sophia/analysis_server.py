@@ -0,0 +1,291 @@
+"""
+local analysis service: a pool of SearchEngine processes behind localhost http
+or a unix socket, so analysis clients don't spawn engine.sh per request
+
+usage:
+    python analysis_server.py [--port 8765 | --socket /tmp/sophia.sock] [--workers 4]
+                              [--hash 16] [--cache analysis_cache.sqlite]
+
+POST /analyse takes one job or {"jobs": [...]}, a job being
+    {"fen": ..., "depth": n | "nodes": n | "movetime": ms, "multipv": k}
+and replies with a json list of results in job order:
+    {"fen", "limits", "lines": [{"move", "score", "depth", "pv"}], "nodes", "time_ms", "worker", "cached"}
+GET /stats reports jobs, nps and latency percentiles (queue + search) per worker
+
+results are memoised in an sqlite file keyed by zobrist hash and search limits.
+every job starts from a cleared TT, so a cached result is what a fresh search
+would return. multipv k runs k searches, each excluding the moves found so far
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import signal
+import sqlite3
+import threading
+import time
+
+from collections import deque
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+from engine.board.fen_parser import load_from_fen
+from engine.core.constants import INFINITE_TIME, MAX_DEPTH
+from engine.core.move import move_to_uci
+from engine.moves.generator import get_legal_moves
+from engine.search.search import SearchEngine
+from engine.search.utils import _get_cp_score
+
+LIMIT_KINDS = ('depth', 'nodes', 'movetime')
+MAX_MULTIPV = 16
+LATENCY_WINDOW = 10_000  # per-worker latency samples kept for percentiles
+
+_engine = None
+
+
+def _init_worker(hash_mb):
+    global _engine
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # ctrl-c is the server's to handle
+    # info lines have nowhere to go; the result carries the last iteration's numbers
+    import engine.search.search as _search
+    _search.send_command = lambda *a, **k: None
+    _search.send_info = lambda *a, **k: None
+    _search.send_info_string = lambda *a, **k: None
+    _engine = SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=hash_mb)
+
+
+def _analyse(job):
+    """(result, worker pid, search seconds) for one normalised job"""
+    t0 = time.perf_counter()
+    kind, value = job['limit']
+    state = load_from_fen(job['fen'])
+    legal = get_legal_moves(state)
+    _engine.tt.clear()
+    _engine.ordering.clear()
+    _engine.time_limit = value if kind == 'movetime' else INFINITE_TIME
+
+    lines = []
+    nodes = 0
+    found = []
+    for _ in range(min(job['multipv'], len(legal))):
+        move = _engine.get_best_move(state.clone(), INFINITE_TIME,
+                                     value if kind == 'depth' else None,
+                                     value if kind == 'nodes' else None,
+                                     kind == 'movetime',
+                                     [m for m in legal if m not in found])
+        if move is None: break
+        nodes += _engine.nodes_searched
+        score_kind, score_value = _get_cp_score(_engine.best_score).split()
+        lines.append({'move': move_to_uci(move), 'score': {score_kind: int(score_value)},
+                      'depth': _engine.depth_reached, 'pv': _engine.pv_line.split()})
+        found.append(move)
+
+    elapsed = time.perf_counter() - t0
+    result = {'fen': job['fen'], 'limits': {kind: value}, 'lines': lines,
+              'nodes': nodes, 'time_ms': round(elapsed * 1000, 1)}
+    return result, os.getpid(), elapsed
+
+
+def normalise(job):
+    """{'fen', 'limit': (kind, value), 'multipv'} from a request job; ValueError if malformed"""
+    if not isinstance(job, dict) or not isinstance(job.get('fen'), str):
+        raise ValueError('each job needs a fen')
+    limits = [(kind, int(job[kind])) for kind in LIMIT_KINDS if job.get(kind) is not None]
+    if len(limits) != 1 or limits[0][1] <= 0:
+        raise ValueError('each job needs exactly one positive depth, nodes or movetime')
+    kind, value = limits[0]
+    if kind == 'depth': value = min(value, MAX_DEPTH)
+    multipv = max(1, min(int(job.get('multipv', 1)), MAX_MULTIPV))
+    return {'fen': job['fen'].strip(), 'limit': (kind, value), 'multipv': multipv}
+
+
+def cache_key(job):
+    """zobrist hash of the position + limits; raises ValueError on a fen the parser rejects"""
+    try:
+        position_hash = load_from_fen(job['fen']).hash
+    except Exception as e:
+        raise ValueError(f"bad fen {job['fen']!r}: {e}")
+    kind, value = job['limit']
+    return f"{position_hash:016x}/{kind}={value}/multipv={job['multipv']}"
+
+
+class ResultCache:
+    """json results in sqlite, shared by the request threads"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)')
+        self.db.commit()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            row = self.db.execute('SELECT result FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key, result):
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?)', (key, json.dumps(result)))
+            self.db.commit()
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class WorkerStats:
+    def __init__(self):
+        self.jobs = 0
+        self.nodes = 0
+        self.busy = 0.0
+        self.latency_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def report(self, uptime):
+        return {
+            'jobs': self.jobs,
+            'jobs_per_s': round(self.jobs / uptime, 2) if uptime > 0 else 0.0,
+            'nps': int(self.nodes / self.busy) if self.busy > 0 else 0,
+            'utilisation': round(self.busy / uptime, 3) if uptime > 0 else 0.0,
+            'latency_ms': {f'p{int(q * 100)}': _percentile(self.latency_ms, q) for q in (0.5, 0.9, 0.99)},
+        }
+
+
+class AnalysisService:
+    def __init__(self, workers, hash_mb, cache_path):
+        self.pool = mp.Pool(workers, initializer=_init_worker, initargs=(hash_mb,))
+        self.cache = ResultCache(cache_path)
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.start_time = time.monotonic()
+
+    def analyse(self, jobs):
+        """results for a batch, in order; cache misses are searched in parallel across the pool"""
+        jobs = [normalise(job) for job in jobs]
+        keys = [cache_key(job) for job in jobs]
+
+        results = [None] * len(jobs)
+        pending = []
+        for i, (job, key) in enumerate(zip(jobs, keys)):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = dict(cached, cached=True)
+            else:
+                # latency is stamped by the pool's result thread as each job lands
+                pending.append((i, self.pool.apply_async(_analyse, (job,),
+                                                         callback=partial(self._record, time.monotonic()))))
+
+        for i, handle in pending:
+            result, pid, _ = handle.get()
+            self.cache.put(keys[i], dict(result, worker=pid))
+            results[i] = dict(result, worker=pid, cached=False)
+        return results
+
+    def _record(self, submitted, outcome):
+        result, pid, busy = outcome
+        latency = time.monotonic() - submitted
+        with self.lock:
+            stats = self.stats.setdefault(pid, WorkerStats())
+            stats.jobs += 1
+            stats.nodes += result['nodes']
+            stats.busy += busy
+            stats.latency_ms.append(latency * 1000)
+
+    def report(self):
+        uptime = time.monotonic() - self.start_time
+        with self.lock:
+            workers = {str(pid): s.report(uptime) for pid, s in sorted(self.stats.items())}
+        return {'uptime_s': round(uptime, 1), 'workers': workers,
+                'cache': {'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'sophia-analysis'
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/stats':
+            return self._reply(404, {'error': f'unknown path {self.path}'})
+        self._reply(200, self.server.service.report())
+
+    def do_POST(self):
+        if self.path != '/analyse':
+            return self._reply(404, {'error': f'unknown path {self.path}'})
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+            jobs = body['jobs'] if isinstance(body, dict) and 'jobs' in body else [body]
+            if not isinstance(jobs, list):
+                raise ValueError('jobs must be a list')
+            results = self.server.service.analyse(jobs)
+        except (ValueError, TypeError) as e:
+            return self._reply(400, {'error': str(e)})
+        except Exception as e:
+            # a job that failed in a worker, or the cache: the client gets a reply, the server keeps going
+            return self._reply(500, {'error': str(e)})
+        self._reply(200, results)
+
+    def log_message(self, format, *args):
+        pass  # one line per request drowns the terminal under batch clients
+
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', help='serve on this unix socket instead of localhost tcp')
+    parser.add_argument('--workers', type=int, default=max(1, mp.cpu_count() - 1))
+    parser.add_argument('--hash', type=int, default=16, help='TT size per worker, MB')
+    parser.add_argument('--cache', default='analysis_cache.sqlite')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    service = AnalysisService(args.workers, args.hash, args.cache)
+
+    if args.socket:
+        if os.path.exists(args.socket): os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, Handler)
+        where = args.socket
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', args.port), Handler)
+        where = f'http://127.0.0.1:{args.port}'
+    server.service = service
+
+    print(f'analysis server on {where}: {args.workers} workers, {args.hash} MB hash each, cache {args.cache}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket): os.remove(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -60,6 +60,8 @@ CASTLE_BQ = 0b1000
 # sentinel scores
 INFINITY = 100_000
 MATE = 100_000
+# exact endgame results (bitbases) without a distance to mate: above any eval, below mates
+KNOWN_WIN = 10_000
 
 # file masks
 FILE_A = 0x0101010101010101
@@ -122,3 +124,6 @@ FIFTY_MOVE_LIMIT = 100
 
 # tablebase coverage in search/syzygy/
 SYZYGY_PIECE_THRESHOLD = 5
+
+# share of the move's time root tablebase ranking may spend probing
+SYZYGY_ROOT_TIME_FRACTION = 0.1
@@ -0,0 +1,52 @@
+"""
+zobrist keys, written out as a C header
+
+run by setup.py before cythonize (or by hand: python -m engine.core.gen_zobrist).
+the keys are the same random.seed(ZOBRIST_SEED) draws as always, in the same
+order, so hashes, saved transposition tables and position caches carry over
+"""
+
+import os
+import random
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zobrist_keys.h')
+
+# saved transposition tables record this (as zobrist.ZOBRIST_SEED), so keys from another seed are rejected
+ZOBRIST_SEED = 42
+
+
+def generate():
+    """(pieces[16][64], castling[16], en_passant[9], black_to_move)"""
+    rng = random.Random(ZOBRIST_SEED)
+    pieces = [[rng.getrandbits(64) for _ in range(64)] for _ in range(16)]
+    castling = [rng.getrandbits(64) for _ in range(16)]
+    ep = [rng.getrandbits(64) for _ in range(9)]
+    black_to_move = rng.getrandbits(64)
+    return pieces, castling, ep, black_to_move
+
+
+def _values(values):
+    return ', '.join(f'0x{v:016X}ULL' for v in values)
+
+
+def write(path=OUTPUT):
+    pieces, castling, ep, black_to_move = generate()
+    rows = ',\n'.join('    {' + _values(row) + '}' for row in pieces)
+    with open(path, 'w') as f:
+        f.write('/* generated by engine/core/gen_zobrist.py -- do not edit */\n\n')
+        f.write('#ifndef SOPHIA_ZOBRIST_KEYS_H\n#define SOPHIA_ZOBRIST_KEYS_H\n\n')
+        f.write(f'#define ZOBRIST_SEED_VALUE {ZOBRIST_SEED}\n\n')
+        f.write(f'static const unsigned long long ZOBRIST_PIECES_INIT[16][64] = {{\n{rows}\n}};\n\n')
+        f.write(f'static const unsigned long long ZOBRIST_CASTLING_INIT[16] = {{{_values(castling)}}};\n\n')
+        f.write(f'static const unsigned long long ZOBRIST_EN_PASSANT_INIT[9] = {{{_values(ep)}}};\n\n')
+        f.write(f'static const unsigned long long ZOBRIST_BLACK_TO_MOVE_INIT = 0x{black_to_move:016X}ULL;\n\n')
+        f.write('#endif\n')
+
+
+def main():
+    write()
+    print(f'wrote {OUTPUT}')
+
+
+if __name__ == '__main__':
+    main()
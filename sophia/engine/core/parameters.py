@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 
@@ -398,10 +399,14 @@ def _set_tune_value(name, value):
         globals()[name] = value
 
 
+_TUNE_SECTIONS = ["params", "scalars", "phase_thresholds", "floats"]
+_TUNE_SKIP_KEYS = {"params", "scalars", "phase_thresholds", "floats", "psqt", "mse", "K", "scale", "score_fraction"}
+
+
 def _apply_tune_params(data):
     if not isinstance(data, dict): return
 
-    for section in ["params", "scalars", "phase_thresholds", "floats"]:
+    for section in _TUNE_SECTIONS:
         values = data.get(section)
         if isinstance(values, dict): _apply_tune_params(values)
 
@@ -416,7 +421,7 @@ def _apply_tune_params(data):
         PASSED_PAWN_BONUS[:] = [0] + [data[name] for name in _PASSED_PAWN_PARAM_NAMES] + [0]
 
     for name, value in data.items():
-        if name in {"params", "scalars", "phase_thresholds", "floats", "psqt", "mse", "K", "scale", "score_fraction"}:
+        if name in _TUNE_SKIP_KEYS:
             continue
         if name in _MATERIAL_PARAM_TARGETS:
             target, piece = _MATERIAL_PARAM_TARGETS[name]
@@ -433,4 +438,52 @@ def _load_tune_params_from_env():
         _apply_tune_params(json.load(f))
 
 
+# built-in values, taken before any SOPHIA_TUNE_PARAMS override
+_DEFAULTS = {name: copy.deepcopy(value) for name, value in globals().items()
+             if name.isupper() and not name.startswith("_")}
+
+
+def _unknown_tune_names(data):
+    """names in a tune dict that no parameter answers to"""
+    unknown = []
+    for section in _TUNE_SECTIONS:
+        values = data.get(section)
+        if isinstance(values, dict): unknown += _unknown_tune_names(values)
+
+    psqt = data.get("psqt")
+    if isinstance(psqt, dict):
+        unknown += [name for name in psqt if not isinstance(_DEFAULTS.get(name.upper()), list)]
+
+    for name in data:
+        if name in _TUNE_SKIP_KEYS or name in _PASSED_PAWN_PARAM_NAMES or name in _MATERIAL_PARAM_TARGETS:
+            continue
+        if _TUNE_PARAM_ALIASES.get(name, name) not in _DEFAULTS: unknown.append(name)
+    return unknown
+
+
+def load_params(data=None):
+    """
+    reset every parameter to its built-in value, then apply data (a tune json
+    dict, same format as SOPHIA_TUNE_PARAMS) on top. lists and dicts are
+    updated in place; the search modules' own copies are refreshed by
+    engine.search.params.load_params, which is what callers normally want.
+    raises KeyError, before changing anything, for a name that isn't a
+    parameter, so a typo can't quietly leave the defaults in place
+    """
+    unknown = _unknown_tune_names(data) if data else []
+    if unknown: raise KeyError(f"unknown parameters: {', '.join(unknown)}")
+
+    for name, value in _DEFAULTS.items():
+        _set_tune_value(name, copy.deepcopy(value))
+    if data:
+        _apply_tune_params(data)
+
+
+def rebind(namespace):
+    """point a module's `from engine.core.parameters import X` names at the current values"""
+    for name in namespace:
+        if name in _DEFAULTS:
+            namespace[name] = globals()[name]
+
+
 _load_tune_params_from_env()
@@ -1,9 +1,19 @@
-import random
 from typing import List
 from dataclasses import dataclass
 
 from engine.core.constants import NULL as _NULL
 
+# the keys are generated at build time (engine/core/gen_zobrist.py) and compiled in
+cdef extern from "zobrist_keys.h":
+    int ZOBRIST_SEED_VALUE
+    const unsigned long long ZOBRIST_PIECES_INIT[16][64]
+    const unsigned long long ZOBRIST_CASTLING_INIT[16]
+    const unsigned long long ZOBRIST_EN_PASSANT_INIT[9]
+    const unsigned long long ZOBRIST_BLACK_TO_MOVE_INIT
+
+# saved transposition tables record this, so keys from another seed are rejected
+ZOBRIST_SEED = ZOBRIST_SEED_VALUE
+
 @dataclass(slots=True)
 class ZobristKeys:
     pieces: List[List[int]]
@@ -11,23 +21,10 @@ class ZobristKeys:
     en_passant: List[int]
     black_to_move: int
 
-def init_zobrist():
-    random.seed(42)
-
-    pieces = [[random.getrandbits(64) for _ in range(64)] for _ in range(16)]
-    castling = [random.getrandbits(64) for _ in range(16)]
-    ep = [random.getrandbits(64) for _ in range(9)]
-    black_to_move = random.getrandbits(64)
-
-    return pieces, castling, ep, black_to_move
-
-
-ZOBRIST_KEYS = ZobristKeys(*init_zobrist())
-
 cdef unsigned long long ZOBRIST_PIECES[16][64]
 cdef unsigned long long ZOBRIST_CASTLING[16]
 cdef unsigned long long ZOBRIST_EN_PASSANT[9]
-cdef unsigned long long ZOBRIST_BLACK_TO_MOVE = <unsigned long long>ZOBRIST_KEYS.black_to_move
+cdef unsigned long long ZOBRIST_BLACK_TO_MOVE = ZOBRIST_BLACK_TO_MOVE_INIT
 
 
 cdef void init_zobrist_c_tables():
@@ -35,17 +32,24 @@ cdef void init_zobrist_c_tables():
 
     for piece in range(16):
         for sq in range(64):
-            ZOBRIST_PIECES[piece][sq] = <unsigned long long>ZOBRIST_KEYS.pieces[piece][sq]
+            ZOBRIST_PIECES[piece][sq] = ZOBRIST_PIECES_INIT[piece][sq]
 
     for idx in range(16):
-        ZOBRIST_CASTLING[idx] = <unsigned long long>ZOBRIST_KEYS.castling[idx]
+        ZOBRIST_CASTLING[idx] = ZOBRIST_CASTLING_INIT[idx]
 
     for idx in range(9):
-        ZOBRIST_EN_PASSANT[idx] = <unsigned long long>ZOBRIST_KEYS.en_passant[idx]
+        ZOBRIST_EN_PASSANT[idx] = ZOBRIST_EN_PASSANT_INIT[idx]
 
 
 init_zobrist_c_tables()
 
+ZOBRIST_KEYS = ZobristKeys(
+    [[ZOBRIST_PIECES[piece][sq] for sq in range(64)] for piece in range(16)],
+    [ZOBRIST_CASTLING[idx] for idx in range(16)],
+    [ZOBRIST_EN_PASSANT[idx] for idx in range(9)],
+    ZOBRIST_BLACK_TO_MOVE,
+)
+
 
 def compute_hash(state) -> int:
     h = 0
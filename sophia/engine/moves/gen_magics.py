@@ -0,0 +1,158 @@
+"""
+magic bitboard slider tables, written out as a C header
+
+run by setup.py before cythonize (or by hand: python -m engine.moves.gen_magics).
+precomputed.pyx includes the header, so the masks, magics and attack tables
+are static data in the extension and nothing is built at import
+"""
+
+import os
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'magic_tables.h')
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+BISHOP_DELTAS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+ROOK_DELTAS   = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+BISHOP_MAGIC_VALUES = [
+    0x1410020244040010, 0x0090100640862800, 0x8848848106000000, 0x10020A0604910000,
+    0xC00410448C040000, 0x6400821040880000, 0x000C410860902002, 0x4029041084010800,
+    0x8504103421084202, 0x2100082868204040, 0x00180810C5020008, 0x9100080A10240008,
+    0x880808584028E000, 0x0088450452403405, 0x2800610101202000, 0x0000042402080420,
+    0x4040811011420090, 0x0420040802340065, 0x0210048200260023, 0x0048000892004009,
+    0x0002022422010800, 0x9005000020A01001, 0x0004720104022000, 0x2004204242280401,
+    0x0283A00140041420, 0x4204100004011800, 0x0080480110008010, 0x0501004084040002,
+    0x0000840022020200, 0x1808042106048400, 0x0A41140082020100, 0x0206008844CA4800,
+    0x2901080800433000, 0x0911016000108447, 0x2004908880100400, 0x8020040401080210,
+    0x02020A0400120082, 0x5A50011044020040, 0x8108408100108811, 0x8001013320D10400,
+    0x0048021124005000, 0x0080411821000820, 0x0401040601009204, 0x00000C6124080800,
+    0xA000403009030080, 0xD040100400200040, 0x4010040800800060, 0x51A9020481024208,
+    0x4001080A02E02008, 0x0421190082200800, 0x8000090400920000, 0x2150168104090080,
+    0x0000400550440803, 0x50C0400811011142, 0x0A08082128060E08, 0x0088080080A60110,
+    0x0884802101304004, 0x0208010501092020, 0x4040028452080410, 0x2400400003048800,
+    0x0100800090820201, 0x4800006034108282, 0x2200208810010048, 0x1002C20808008080,
+]
+
+BISHOP_BITS_VALUES = [
+    6, 5, 5, 5, 5, 5, 5, 6, 5, 5, 5, 5, 5, 5, 5, 5,
+    5, 5, 7, 7, 7, 7, 5, 5, 5, 5, 7, 9, 9, 7, 5, 5,
+    5, 5, 7, 9, 9, 7, 5, 5, 5, 5, 7, 7, 7, 7, 5, 5,
+    5, 5, 5, 5, 5, 5, 5, 5, 6, 5, 5, 5, 5, 5, 5, 6,
+]
+
+ROOK_MAGIC_VALUES = [
+    0x0080005481214000, 0x8100102108804002, 0x088008600180D001, 0x0200082040100600,
+    0x1200100804020021, 0x0200020004489B10, 0x1480408002003100, 0x0200010042003084,
+    0x00468008400080E0, 0x0881002040010080, 0x4803002000410114, 0x1001002009001000,
+    0x102A000A00041060, 0x2004800400800200, 0x0022000200040801, 0x0812001200411084,
+    0x0080004020004000, 0x005000C040012000, 0x080484801000A000, 0x0508008008100080,
+    0x4008808004000800, 0x0004004040020100, 0x0020440010410802, 0x0480260000812844,
+    0x0000400080008020, 0x1040002100410088, 0x0020080040401000, 0x4020100080800800,
+    0x2802010A00041020, 0x00AC000480020080, 0x2000080400029041, 0x08402C4200040481,
+    0x4012401620800084, 0x8010002008400040, 0x002000208080100C, 0x0000800800801000,
+    0x4022810010022040, 0x0000800400800200, 0x0A01480144004250, 0x020400488A000104,
+    0xA2C2008100420020, 0x0080A01000C0C000, 0x4050002804002000, 0x006020100101000C,
+    0x0104080004008080, 0x0014000201004040, 0x4010330610440008, 0x1100004100820004,
+    0x4000400080002880, 0xB000200080400080, 0x0022001088244200, 0x4000500180080180,
+    0x08A0800400080080, 0x4340800200040080, 0x0090110802508400, 0x4029002200408100,
+    0x0080002440801101, 0x0001004880201202, 0x2080814021100A02, 0x00B41000A0090005,
+    0x2433000800100205, 0x2102001004010802, 0x04802810070200C4, 0x00000100CC008026,
+]
+
+ROOK_BITS_VALUES = [
+    12, 11, 11, 11, 11, 11, 11, 12, 11, 10, 10, 10, 10, 10, 10, 11,
+    11, 10, 10, 10, 10, 10, 10, 11, 11, 10, 10, 10, 10, 10, 10, 11,
+    11, 10, 10, 10, 10, 10, 10, 11, 11, 10, 10, 10, 10, 10, 10, 11,
+    11, 10, 10, 10, 10, 10, 10, 11, 12, 11, 11, 11, 11, 11, 11, 12,
+]
+
+
+def _sliding_masks(deltas):
+    """relevant occupancy per square: the rays without their edge squares"""
+    masks = []
+    for square in range(64):
+        mask = 0
+        rank, file_ = square // 8, square % 8
+        for d_rank, d_file in deltas:
+            r, f = rank + d_rank, file_ + d_file
+            while 0 <= r + d_rank <= 7 and 0 <= f + d_file <= 7:
+                mask |= 1 << (r * 8 + f)
+                r, f = r + d_rank, f + d_file
+        masks.append(mask)
+    return masks
+
+
+def _sliding_attacks(square, block, deltas):
+    attacks = 0
+    rank, file_ = square // 8, square % 8
+    for d_rank, d_file in deltas:
+        r, f = rank + d_rank, file_ + d_file
+        while 0 <= r <= 7 and 0 <= f <= 7:
+            bit = 1 << (r * 8 + f)
+            attacks |= bit
+            if bit & block:
+                break
+            r += d_rank
+            f += d_file
+    return attacks
+
+
+def slider_table(deltas, magic_values, bit_values):
+    """(masks, offsets, flat attack table) for one slider, checking every magic as it goes"""
+    masks = _sliding_masks(deltas)
+    offsets = []
+    table = []
+    for square in range(64):
+        mask = masks[square]
+        bit_indices = [i for i in range(64) if (mask >> i) & 1]
+        if bit_values[square] != len(bit_indices):
+            raise RuntimeError(f"magic bit count mismatch on square {square}")
+
+        num_patterns = 1 << len(bit_indices)
+        sq_table = [None] * num_patterns
+        shift = 64 - bit_values[square]
+        for i in range(num_patterns):
+            blocker = 0
+            for bit_index, pos in enumerate(bit_indices):
+                if (i >> bit_index) & 1:
+                    blocker |= 1 << pos
+            idx = ((blocker * magic_values[square]) & MASK_64) >> shift
+            attacks = _sliding_attacks(square, blocker, deltas)
+            if sq_table[idx] is not None and sq_table[idx] != attacks:
+                raise RuntimeError(f"magic collision on square {square}")
+            sq_table[idx] = attacks
+
+        offsets.append(len(table))
+        table.extend(attacks or 0 for attacks in sq_table)
+    return masks, offsets, table
+
+
+def _c_array(ctype, name, values, per_line=4, fmt='0x{:016X}ULL'):
+    rows = [', '.join(fmt.format(v) for v in values[i:i + per_line]) for i in range(0, len(values), per_line)]
+    return f'static const {ctype} {name}[{len(values)}] = {{\n    ' + ',\n    '.join(rows) + '\n};\n'
+
+
+def write(path=OUTPUT):
+    parts = ['/* generated by engine/moves/gen_magics.py -- do not edit */\n',
+             '#ifndef SOPHIA_MAGIC_TABLES_H\n#define SOPHIA_MAGIC_TABLES_H\n']
+    for name, deltas, magics, bits in (('BISHOP', BISHOP_DELTAS, BISHOP_MAGIC_VALUES, BISHOP_BITS_VALUES),
+                                       ('ROOK', ROOK_DELTAS, ROOK_MAGIC_VALUES, ROOK_BITS_VALUES)):
+        masks, offsets, table = slider_table(deltas, magics, bits)
+        parts.append(_c_array('unsigned long long', f'{name}_MASKS_INIT', masks))
+        parts.append(_c_array('unsigned long long', f'{name}_MAGICS_INIT', magics))
+        parts.append(_c_array('unsigned char', f'{name}_SHIFTS_INIT', [64 - b for b in bits], 16, '{}'))
+        parts.append(_c_array('int', f'{name}_OFFSETS_INIT', offsets, 8, '{}'))
+        parts.append(_c_array('unsigned long long', f'{name}_ATTACK_TABLE', table))
+    parts.append('#endif\n')
+    with open(path, 'w') as f:
+        f.write('\n'.join(parts))
+
+
+def main():
+    write()
+    print(f'wrote {OUTPUT}')
+
+
+if __name__ == '__main__':
+    main()
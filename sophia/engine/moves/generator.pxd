@@ -8,4 +8,5 @@ cdef void generate_pseudo_legal_move_list(State state, MoveList* moves, bint cap
 cdef void generate_check_evasion_move_list(State state, MoveList* moves) noexcept
 cdef bint is_pseudo_legal_move(State state, unsigned int move) noexcept
 cpdef list generate_pseudo_legal_moves(State state, bint captures_only=*)
+cpdef unsigned int parse_uci_move(State state, str uci)
 cdef void generate_legal_move_list(State state, MoveList* moves, bint captures_only) noexcept
\ No newline at end of file
@@ -13,7 +13,7 @@ from engine.core.constants import (
     WHITE, BLACK, NORTH, SOUTH
 )
 from engine.core.move cimport (
-    _pack, move_source, move_target, move_flag,
+    _pack, move_source, move_target, move_flag, move_promotion_index,
     is_capture, is_promotion, is_en_passant, is_castling
 )
 from engine.core.move import (
@@ -24,7 +24,7 @@ from engine.core.move import (
     DOUBLE_PUSH,
 )
 from engine.board.state cimport State
-from engine.moves.legality cimport is_legal, is_square_attacked, is_in_check, attackers_to_square
+from engine.moves.legality cimport is_legal, is_square_attacked, king_in_check, attackers_to_square
 
 from engine.moves.precomputed cimport KNIGHT_ATTACKS, KING_ATTACKS, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS, bishop_attacks, rook_attacks, SQUARE_TO_BB
 from engine.core.bits cimport lsb, pop_lsb, popcount
@@ -666,7 +666,7 @@ def get_legal_moves(State state, bint captures_only=False):
     cdef int i
     cdef unsigned int move
 
-    if not captures_only and is_in_check(state, state.is_white):
+    if not captures_only and king_in_check(state, state.is_white):
         generate_check_evasion_move_list(state, &pseudo)
     else:
         generate_pseudo_legal_move_list(state, &pseudo, captures_only)
@@ -678,13 +678,42 @@ def get_legal_moves(State state, bint captures_only=False):
 
     return legal
 
+cpdef unsigned int parse_uci_move(State state, str uci):
+    """move int for a uci string (e2e4, e7e8q) in this position, 0 if it isn't legal here"""
+    cdef MoveList pseudo
+    cdef int i, from_sq, to_sq, promo
+    cdef int from_file, from_rank, to_file, to_rank
+    cdef unsigned int move
+
+    if len(uci) != 4 and len(uci) != 5: return 0
+    uci = uci.lower()
+    from_file, from_rank = ord(uci[0]) - 97, ord(uci[1]) - 49
+    to_file, to_rank     = ord(uci[2]) - 97, ord(uci[3]) - 49
+    if not (0 <= from_file < 8 and 0 <= from_rank < 8 and 0 <= to_file < 8 and 0 <= to_rank < 8): return 0
+    from_sq = from_rank * 8 + from_file
+    to_sq   = to_rank * 8 + to_file
+    # promotion index order matches move_promotion_index: n, b, r, q
+    promo = 'nbrq'.find(uci[4]) if len(uci) == 5 else -1
+    if len(uci) == 5 and promo < 0: return 0
+
+    # squares and promotion pick out at most one pseudo-legal move
+    generate_pseudo_legal_move_list(state, &pseudo, False)
+    for i in range(pseudo.count):
+        move = pseudo.moves[i]
+        if move_source(move) != from_sq or move_target(move) != to_sq: continue
+        if is_promotion(move) != (promo >= 0): continue
+        if promo >= 0 and move_promotion_index(move) != promo: continue
+        return move if is_legal(state, move) else 0
+    return 0
+
+
 cdef void generate_legal_move_list(State state, MoveList* out, bint captures_only) noexcept:
     """fill out with fully legal moves (pin/check filtered), no Python list"""
     cdef MoveList pseudo
     cdef int i
     cdef unsigned int move
 
-    if not captures_only and is_in_check(state, state.is_white):
+    if not captures_only and king_in_check(state, state.is_white):
         generate_check_evasion_move_list(state, &pseudo)
     else:
         generate_pseudo_legal_move_list(state, &pseudo, captures_only)
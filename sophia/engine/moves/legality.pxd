@@ -1,8 +1,56 @@
 # declaration header for legality.pyx
 
 from engine.board.state cimport State
+from engine.moves.precomputed cimport KNIGHT_ATTACKS, KING_ATTACKS, WHITE_PAWN_ATTACKS, BLACK_PAWN_ATTACKS, bishop_attacks, rook_attacks
+from engine.core.bits cimport lsb
+
+# piece indices from engine.core.constants, as compile-time values for the inline checks
+cdef enum:
+    _ATK_BLACK = 0
+    _ATK_WHITE = 1
+    _ATK_BP = 2
+    _ATK_WP = 3
+    _ATK_BN = 4
+    _ATK_WN = 5
+    _ATK_BB = 6
+    _ATK_WB = 7
+    _ATK_BR = 8
+    _ATK_WR = 9
+    _ATK_BQ = 10
+    _ATK_WQ = 11
+    _ATK_BK = 14
+    _ATK_WK = 15
+
+
+# the attack test runs at every node (check detection, king moves in is_legal),
+# so like the slider lookups it is inline here and compiled into each module
+# that cimports it; is_in_check stays cpdef for python callers
+cdef inline bint is_square_attacked(State state, int sq, bint by_white) noexcept:
+    cdef unsigned long long all_pieces = state.bitboards[_ATK_WHITE] | state.bitboards[_ATK_BLACK]
+
+    if by_white:
+        if BLACK_PAWN_ATTACKS[sq] & state.bitboards[_ATK_WP]: return True
+        if KNIGHT_ATTACKS[sq]     & state.bitboards[_ATK_WN]: return True
+        if KING_ATTACKS[sq]       & state.bitboards[_ATK_WK]: return True
+        if bishop_attacks(sq, all_pieces) & (state.bitboards[_ATK_WB] | state.bitboards[_ATK_WQ]): return True
+        if rook_attacks(sq, all_pieces)   & (state.bitboards[_ATK_WR] | state.bitboards[_ATK_WQ]): return True
+    else:
+        if WHITE_PAWN_ATTACKS[sq] & state.bitboards[_ATK_BP]: return True
+        if KNIGHT_ATTACKS[sq]     & state.bitboards[_ATK_BN]: return True
+        if KING_ATTACKS[sq]       & state.bitboards[_ATK_BK]: return True
+        if bishop_attacks(sq, all_pieces) & (state.bitboards[_ATK_BB] | state.bitboards[_ATK_BQ]): return True
+        if rook_attacks(sq, all_pieces)   & (state.bitboards[_ATK_BR] | state.bitboards[_ATK_BQ]): return True
+
+    return False
+
+
+cdef inline bint king_in_check(State state, bint colour) noexcept:
+    cdef unsigned long long king_bb = state.bitboards[_ATK_WK if colour else _ATK_BK]
+    if not king_bb:
+        return False
+    return is_square_attacked(state, lsb(king_bb), not colour)
+
 
-cdef bint is_square_attacked(State state, int sq, bint by_white) noexcept
 cdef unsigned long long attackers_to_square(State state, int sq, bint colour) noexcept
 cpdef bint is_in_check(State state, bint colour) noexcept
 cpdef bint is_legal(State state, unsigned int move)
@@ -21,34 +21,6 @@ cdef int _BP = BP, _BN = BN, _BB = BB, _BR = BR, _BQ = BQ, _BK = BK
 cdef int _WHITE = WHITE, _BLACK = BLACK
 
 
-cdef bint is_square_attacked(State state, int sq, bint by_white) noexcept:
-    cdef unsigned long long all_pieces, queens, bb
-    cdef unsigned long long[16] *bbs = &state.bitboards
-
-    if by_white:
-        if BLACK_PAWN_ATTACKS[sq] & bbs[0][_WP]: return True
-        if KNIGHT_ATTACKS[sq]     & bbs[0][_WN]: return True
-        if KING_ATTACKS[sq]       & bbs[0][_WK]: return True
-
-        all_pieces = bbs[0][_WHITE] | bbs[0][_BLACK]
-        queens     = bbs[0][_WQ]
-
-        if bishop_attacks(sq, all_pieces) & (bbs[0][_WB] | queens): return True
-        if rook_attacks(sq, all_pieces)   & (bbs[0][_WR] | queens): return True
-    else:
-        if WHITE_PAWN_ATTACKS[sq] & bbs[0][_BP]: return True
-        if KNIGHT_ATTACKS[sq]     & bbs[0][_BN]: return True
-        if KING_ATTACKS[sq]       & bbs[0][_BK]: return True
-
-        all_pieces = bbs[0][_WHITE] | bbs[0][_BLACK]
-        queens     = bbs[0][_BQ]
-
-        if bishop_attacks(sq, all_pieces) & (bbs[0][_BB] | queens): return True
-        if rook_attacks(sq, all_pieces)   & (bbs[0][_BR] | queens): return True
-
-    return False
-
-
 cdef unsigned long long attackers_to_square(State state, int sq, bint colour) noexcept:
     cdef unsigned long long attackers = 0
     cdef unsigned long long all_pieces = state.bitboards[_WHITE] | state.bitboards[_BLACK]
@@ -77,18 +49,7 @@ cdef unsigned long long attackers_to_square(State state, int sq, bint colour) no
 
 
 cpdef bint is_in_check(State state, bint colour) noexcept:
-    cdef int king_idx, king_sq
-    cdef unsigned long long king_bb
-
-    king_idx = _WK if colour else _BK
-    king_bb  = state.bitboards[king_idx]
-    if not king_bb:
-        return False
-
-    # lsb via bit-length (king bitboard always has exactly one bit)
-    king_sq = lsb(king_bb)
-
-    return is_square_attacked(state, king_sq, not colour)
+    return king_in_check(state, colour)
 
 
 cpdef bint is_legal(State state, unsigned int move):
@@ -118,7 +79,7 @@ cpdef bint is_legal(State state, unsigned int move):
 
     # non-king move — full make/unmake + in-check test
     make_move(state, move)
-    in_check = is_in_check(state, not state.is_white)
+    in_check = king_in_check(state, not state.is_white)
     unmake_move(state, move)
     return not in_check
 
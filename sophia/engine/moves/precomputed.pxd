@@ -4,7 +4,23 @@ cdef unsigned long long WHITE_PAWN_ATTACKS[64]
 cdef unsigned long long BLACK_PAWN_ATTACKS[64]
 cdef unsigned long long BISHOP_MASKS[64]
 cdef unsigned long long ROOK_MASKS[64]
+cdef unsigned long long BISHOP_MAGICS[64]
+cdef unsigned long long ROOK_MAGICS[64]
 cdef unsigned long long SQUARE_TO_BB[64]
+cdef unsigned long long* BISHOP_ATTACKS
+cdef unsigned long long* ROOK_ATTACKS
+cdef int BISHOP_OFFSETS[64]
+cdef int ROOK_OFFSETS[64]
+cdef unsigned char BISHOP_SHIFTS[64]
+cdef unsigned char ROOK_SHIFTS[64]
 
-cdef unsigned long long bishop_attacks(int sq, unsigned long long all_pieces) noexcept
-cdef unsigned long long rook_attacks(int sq, unsigned long long all_pieces) noexcept
+
+# slider lookups live here rather than in precomputed.pyx, like the bits and
+# move primitives, so every module that cimports them gets them inlined instead
+# of calling through cython's cross-module function pointers
+cdef inline unsigned long long bishop_attacks(int sq, unsigned long long all_pieces) noexcept nogil:
+    return BISHOP_ATTACKS[BISHOP_OFFSETS[sq] + <unsigned int>(((all_pieces & BISHOP_MASKS[sq]) * BISHOP_MAGICS[sq]) >> BISHOP_SHIFTS[sq])]
+
+
+cdef inline unsigned long long rook_attacks(int sq, unsigned long long all_pieces) noexcept nogil:
+    return ROOK_ATTACKS[ROOK_OFFSETS[sq] + <unsigned int>(((all_pieces & ROOK_MASKS[sq]) * ROOK_MAGICS[sq]) >> ROOK_SHIFTS[sq])]
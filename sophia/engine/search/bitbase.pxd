@@ -0,0 +1,7 @@
+# declaration header for bitbase.pyx
+
+from engine.board.state cimport State
+
+cdef bint is_kpk(State state) noexcept
+cdef bint kpk_probe(State state) noexcept
+cpdef int kpk_evaluate(State state) noexcept
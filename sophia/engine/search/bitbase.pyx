@@ -0,0 +1,75 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+
+from engine.board.state cimport State
+from engine.core.bits cimport lsb, popcount
+from engine.core.constants import WHITE, BLACK, WP, WK, BP, BK, KNOWN_WIN
+
+# KPK_BITBASE, generated at build time by gen_kpk.py
+include "kpk_bitbase.pxi"
+
+cdef int _WHITE = WHITE
+cdef int _BLACK = BLACK
+cdef int _WP = WP, _WK = WK, _BP = BP, _BK = BK
+cdef int _KNOWN_WIN = KNOWN_WIN
+cdef int _RANK_STEP = 10  # a won KPK scores higher the further the pawn has run
+
+cdef unsigned char _KPK[24576]
+
+
+cdef void _init_kpk():
+    cdef int i
+    assert len(KPK_BITBASE) == 24576, "kpk_bitbase.pxi is stale: rerun engine/search/gen_kpk.py"
+    for i in range(24576):
+        _KPK[i] = KPK_BITBASE[i]
+
+
+_init_kpk()
+
+
+cdef bint is_kpk(State state) noexcept:
+    """king and pawn against king (the kings are always there, so any 3 men with a pawn)"""
+    return (popcount(state.bitboards[_WHITE] | state.bitboards[_BLACK]) == 3
+            and (state.bitboards[_WP] | state.bitboards[_BP]) != 0)
+
+
+cdef bint kpk_probe(State state) noexcept:
+    """True if the side with the pawn wins; only meaningful when is_kpk"""
+    cdef int psq, strong_k, weak_k, stm, idx
+
+    # normalise to the pawn's side moving up the board (stm 0) on files a-d
+    if state.bitboards[_WP]:
+        psq = lsb(state.bitboards[_WP])
+        strong_k = lsb(state.bitboards[_WK])
+        weak_k = lsb(state.bitboards[_BK])
+        stm = 0 if state.is_white else 1
+    else:
+        psq = lsb(state.bitboards[_BP]) ^ 56
+        strong_k = lsb(state.bitboards[_BK]) ^ 56
+        weak_k = lsb(state.bitboards[_WK]) ^ 56
+        stm = 1 if state.is_white else 0
+
+    if (psq & 7) >= 4:
+        psq ^= 7
+        strong_k ^= 7
+        weak_k ^= 7
+
+    idx = strong_k | (weak_k << 6) | (stm << 12) | ((psq & 7) << 13) | ((6 - (psq >> 3)) << 15)
+    return (_KPK[idx >> 3] >> (idx & 7)) & 1
+
+
+cpdef int kpk_evaluate(State state) noexcept:
+    """exact KPK score for the side to move: 0 if drawn, else a known win/loss"""
+    cdef int score, rank
+    if not kpk_probe(state): return 0
+
+    if state.bitboards[_WP]:
+        rank = lsb(state.bitboards[_WP]) >> 3
+        score = _KNOWN_WIN + rank * _RANK_STEP
+        return score if state.is_white else -score
+
+    rank = 7 - (lsb(state.bitboards[_BP]) >> 3)
+    score = _KNOWN_WIN + rank * _RANK_STEP
+    return -score if state.is_white else score
@@ -2,10 +2,8 @@ import os
 import glob
 import random
 import time
-import chess
-import chess.polyglot
 
-from engine.search.utils import state_to_board
+from engine.search.polyglot import BookIndex
 from engine.uci.utils import send_info_string
 
 class OpeningBook:
@@ -16,55 +14,31 @@ class OpeningBook:
         
         # find all .bin files in that directory
         self.books = glob.glob(os.path.join(book_path, '*.bin'))
+
+        # every book merged into one sorted in-memory index, read once here
+        self.index = BookIndex()
         
         if self.books:
             names = [f"'{os.path.basename(f).split('.')[0]}'" for f in self.books]
-            send_info_string(f"found {len(self.books)} opening books in '{directory}': {', '.join(names)}")
+            try:
+                entries = self.index.load(self.books)
+                send_info_string(f"found {len(self.books)} opening books in '{directory}': {', '.join(names)} ({entries} entries)")
+            except (OSError, MemoryError) as e:
+                send_info_string(f"book error: {e}")
         else:
             send_info_string(f"no opening books found in '{book_path}'")
 
     def get_move(self, state):
         """Retrieves a weighted random move using normalised weights from all books"""
-        if not self.books:
+        if not self.index.size:
             return None
 
         try:
             t0 = time.perf_counter()
-            board = state_to_board(state)
-            
-            # e.g. {'e2e4': 250.5, 'd2d4': 200.0}
-            move_weights = {}
-
-            # iterate through every book file found
-            for book in self.books:
-                
-                # dictionary for the current book only
-                _book_move_weights = {}
-                _book_total_weight = 0
-                
-                try:
-                    with chess.polyglot.open_reader(book) as reader:
-                        for entry in reader.find_all(board):
-                            move_uci = entry.move.uci()
-                            weight = entry.weight
-                            
-                            _book_move_weights[move_uci] = weight
-                            _book_total_weight += weight
-                except Exception:
-                    continue
-
-                if _book_total_weight == 0: continue
-
-                # normalisation as books have different scales
-                scale_factor = 10 / _book_total_weight
 
-                for move_uci, raw_weight in _book_move_weights.items():
-                    normalised_weight = raw_weight * scale_factor
-                    
-                    if move_uci in move_weights:
-                        move_weights[move_uci] += normalised_weight
-                    else:
-                        move_weights[move_uci] = normalised_weight
+            # e.g. {'e2e4': 2.5, 'd2d4': 2.0}; each book's weights are scaled
+            # to sum to 10 per position, as books have different scales
+            move_weights = self.index.lookup(state)
 
             if not move_weights:
                 return None
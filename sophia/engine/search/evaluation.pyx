@@ -26,14 +26,16 @@ from engine.core.parameters import (
 )
 from libc.stdlib cimport calloc, free
 from engine.moves.precomputed cimport KNIGHT_ATTACKS, KING_ATTACKS, bishop_attacks, rook_attacks
+import engine.core.parameters as _parameters
 from engine.core.parameters import PSQTs
 from engine.core.zobrist cimport ZOBRIST_PIECES
 import engine.core.constants as _const
 from engine.uci.utils import send_info_string
 from engine.board.state cimport State
 from engine.core.bits cimport lsb, popcount, pop_lsb
+from engine.search.bitbase cimport is_kpk, kpk_evaluate
 
-MAX_PHASE = 4 * PHASE_INC[KNIGHT] + 4 * PHASE_INC[BISHOP] + 4 * PHASE_INC[ROOK] + 2 * PHASE_INC[QUEEN]
+MAX_PHASE = 0  # set by reload_params()
 
 # board geometry (0-indexed rank/file): the two central indices and the last index
 cdef int CENTRE_LOW  = 3   # 4th rank/file (d-file, rank 4)
@@ -44,15 +46,11 @@ cdef int BOARD_MAX   = 7   # last rank/file index
 cdef int RANK_SHIFT = 3    # log2(8): shift past the file bits to get the rank
 cdef int FILE_MASK  = 7    # 0b111: low 3 bits of the square index = file
 
-# king pawn-shield scan parameters
-cdef int _KING_SHIELD_HOME_MAX  = KING_SHIELD_HOME_RANK_MAX
-cdef int _KING_SHIELD_FAR_MIN   = KING_SHIELD_FAR_RANK_MIN
-cdef int _KING_SHIELD_SCAN      = KING_SHIELD_SCAN_RANKS
+# king pawn-shield scan parameters (set by reload_params)
+cdef int _KING_SHIELD_HOME_MAX, _KING_SHIELD_FAR_MIN, _KING_SHIELD_SCAN
 
-cdef int _KNIGHT_OUTPOST_W_MIN = KNIGHT_OUTPOST_RANKS_W[0]
-cdef int _KNIGHT_OUTPOST_W_MAX = KNIGHT_OUTPOST_RANKS_W[1]
-cdef int _KNIGHT_OUTPOST_B_MIN = KNIGHT_OUTPOST_RANKS_B[0]
-cdef int _KNIGHT_OUTPOST_B_MAX = KNIGHT_OUTPOST_RANKS_B[1]
+cdef int _KNIGHT_OUTPOST_W_MIN, _KNIGHT_OUTPOST_W_MAX
+cdef int _KNIGHT_OUTPOST_B_MIN, _KNIGHT_OUTPOST_B_MAX
 
 MG_TABLE = [[0] * 64 for _ in range(16)]
 EG_TABLE = [[0] * 64 for _ in range(16)]
@@ -176,12 +174,39 @@ def init_eval_tables():
         # knight outpost masks
         if _KNIGHT_OUTPOST_W_MIN <= rank <= _KNIGHT_OUTPOST_W_MAX:
             KNIGHT_OUTPOST_MASKS_W[sq] = PASSED_PAWN_MASKS[WHITE][sq]
-            KNIGHT_OUTPOST_MASKS_W_C[sq] = PASSED_PAWN_MASKS_C[WHITE][sq]
+        else:
+            KNIGHT_OUTPOST_MASKS_W[sq] = 0
+        KNIGHT_OUTPOST_MASKS_W_C[sq] = KNIGHT_OUTPOST_MASKS_W[sq]
         if _KNIGHT_OUTPOST_B_MIN <= rank <= _KNIGHT_OUTPOST_B_MAX:
             KNIGHT_OUTPOST_MASKS_B[sq] = PASSED_PAWN_MASKS[BLACK][sq]
-            KNIGHT_OUTPOST_MASKS_B_C[sq] = PASSED_PAWN_MASKS_C[BLACK][sq]
+        else:
+            KNIGHT_OUTPOST_MASKS_B[sq] = 0
+        KNIGHT_OUTPOST_MASKS_B_C[sq] = KNIGHT_OUTPOST_MASKS_B[sq]
 
-init_eval_tables()
+
+def reload_params():
+    """
+    re-read the eval parameters and rebuild the tables; runs at import and from
+    engine.search.params.load_params. incremental mg/eg scores on existing
+    States were summed from the old tables (see calculate_initial_score)
+    """
+    global MAX_PHASE, _KING_SHIELD_HOME_MAX, _KING_SHIELD_FAR_MIN, _KING_SHIELD_SCAN, \
+        _KNIGHT_OUTPOST_W_MIN, _KNIGHT_OUTPOST_W_MAX, _KNIGHT_OUTPOST_B_MIN, _KNIGHT_OUTPOST_B_MAX
+    _parameters.rebind(globals())
+    MAX_PHASE = 4 * PHASE_INC[KNIGHT] + 4 * PHASE_INC[BISHOP] + 4 * PHASE_INC[ROOK] + 2 * PHASE_INC[QUEEN]
+
+    _KING_SHIELD_HOME_MAX = KING_SHIELD_HOME_RANK_MAX
+    _KING_SHIELD_FAR_MIN  = KING_SHIELD_FAR_RANK_MIN
+    _KING_SHIELD_SCAN     = KING_SHIELD_SCAN_RANKS
+
+    _KNIGHT_OUTPOST_W_MIN = KNIGHT_OUTPOST_RANKS_W[0]
+    _KNIGHT_OUTPOST_W_MAX = KNIGHT_OUTPOST_RANKS_W[1]
+    _KNIGHT_OUTPOST_B_MIN = KNIGHT_OUTPOST_RANKS_B[0]
+    _KNIGHT_OUTPOST_B_MAX = KNIGHT_OUTPOST_RANKS_B[1]
+
+    init_eval_tables()
+
+reload_params()
 
 def calculate_initial_score(state):
     cdef int mg
@@ -451,6 +476,9 @@ cpdef int evaluate(State state, object pawn_hash_table=None):
     cdef unsigned long long wk_bb, bk_bb, rooks_bb, queen_bb
     cdef unsigned long long file_mask, passed_file_mask
 
+    # K+P v K is known exactly, heuristics would only blur it
+    if is_kpk(state): return kpk_evaluate(state)
+
     mg_phase = min(state.phase, MAX_PHASE)
     eg_phase = MAX_PHASE - mg_phase
 
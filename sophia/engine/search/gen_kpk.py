@@ -0,0 +1,142 @@
+"""
+KPK bitbase by retrograde analysis, written out as a cython include
+
+run by setup.py before cythonize (or by hand: python -m engine.search.gen_kpk).
+positions are normalised to a white pawn on files a-d, so the table is
+64 (white king) * 64 (black king) * 2 (side to move) * 24 (pawn) bits = 24 KB,
+a set bit meaning white wins. the index layout is the one bitbase.pyx probes with
+"""
+
+import os
+
+MAX_INDEX = 2 * 24 * 64 * 64
+
+INVALID, UNKNOWN, DRAW, WIN = 0, 1, 2, 4
+WHITE, BLACK = 0, 1
+NORTH = 8
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kpk_bitbase.pxi')
+
+
+def index(stm, bksq, wksq, psq):
+    return wksq | (bksq << 6) | (stm << 12) | ((psq & 7) << 13) | ((6 - (psq >> 3)) << 15)
+
+
+def _king_attacks():
+    attacks = []
+    for sq in range(64):
+        r, f = sq >> 3, sq & 7
+        bb = 0
+        for dr in (-1, 0, 1):
+            for df in (-1, 0, 1):
+                if (dr or df) and 0 <= r + dr < 8 and 0 <= f + df < 8:
+                    bb |= 1 << ((r + dr) * 8 + f + df)
+        attacks.append(bb)
+    return attacks
+
+
+KING_ATTACKS = _king_attacks()
+
+
+def _pawn_attacks(psq):
+    f = psq & 7
+    bb = 0
+    if f > 0: bb |= 1 << (psq + 7)
+    if f < 7: bb |= 1 << (psq + 9)
+    return bb
+
+
+def _distance(a, b):
+    return max(abs((a >> 3) - (b >> 3)), abs((a & 7) - (b & 7)))
+
+
+def _initial(idx):
+    wksq = idx & 63
+    bksq = (idx >> 6) & 63
+    stm = (idx >> 12) & 1
+    psq = ((6 - ((idx >> 15) & 7)) << 3) | ((idx >> 13) & 3)
+
+    if (_distance(wksq, bksq) <= 1 or wksq == psq or bksq == psq
+            or (stm == WHITE and _pawn_attacks(psq) & (1 << bksq))):
+        return INVALID
+
+    # white promotes and the queen can't be taken
+    if (stm == WHITE and psq >> 3 == 6 and wksq != psq + NORTH
+            and (_distance(bksq, psq + NORTH) > 1 or KING_ATTACKS[wksq] & (1 << (psq + NORTH)))):
+        return WIN
+
+    # black is stalemated, or takes an undefended pawn
+    if stm == BLACK:
+        defended = KING_ATTACKS[wksq] | _pawn_attacks(psq)
+        if (not (KING_ATTACKS[bksq] & ~defended)
+                or KING_ATTACKS[bksq] & (1 << psq) & ~KING_ATTACKS[wksq]):
+            return DRAW
+
+    return UNKNOWN
+
+
+def _classify(db, idx):
+    wksq = idx & 63
+    bksq = (idx >> 6) & 63
+    stm = (idx >> 12) & 1
+    psq = ((6 - ((idx >> 15) & 7)) << 3) | ((idx >> 13) & 3)
+
+    r = INVALID
+    if stm == WHITE:
+        b = KING_ATTACKS[wksq]
+        while b:
+            s = (b & -b).bit_length() - 1
+            r |= db[index(BLACK, bksq, s, psq)]
+            b &= b - 1
+        if psq >> 3 < 6:
+            r |= db[index(BLACK, bksq, wksq, psq + NORTH)]
+        if psq >> 3 == 1 and psq + NORTH not in (wksq, bksq):
+            r |= db[index(BLACK, bksq, wksq, psq + 2 * NORTH)]
+        good, bad = WIN, DRAW
+    else:
+        b = KING_ATTACKS[bksq]
+        while b:
+            s = (b & -b).bit_length() - 1
+            r |= db[index(WHITE, s, wksq, psq)]
+            b &= b - 1
+        good, bad = DRAW, WIN
+
+    if r & good: return good
+    if r & UNKNOWN: return UNKNOWN
+    return bad
+
+
+def generate():
+    """the packed table: bit idx set if white (with the pawn) wins"""
+    db = bytearray(_initial(idx) for idx in range(MAX_INDEX))
+    unknown = [idx for idx in range(MAX_INDEX) if db[idx] == UNKNOWN]
+
+    while unknown:
+        still = []
+        for idx in unknown:
+            db[idx] = _classify(db, idx)
+            if db[idx] == UNKNOWN: still.append(idx)
+        if len(still) == len(unknown): break
+        unknown = still
+
+    packed = bytearray(MAX_INDEX // 8)
+    for idx in range(MAX_INDEX):
+        if db[idx] == WIN: packed[idx >> 3] |= 1 << (idx & 7)
+    return bytes(packed)
+
+
+def write(path=OUTPUT):
+    packed = generate()
+    lines = [f"    '{packed[i:i + 48].hex()}'" for i in range(0, len(packed), 48)]
+    with open(path, 'w') as f:
+        f.write('# generated by engine/search/gen_kpk.py -- do not edit\n\n')
+        f.write('KPK_BITBASE = bytes.fromhex(\n' + '\n'.join(lines) + '\n)\n')
+
+
+def main():
+    write()
+    print(f'wrote {OUTPUT}')
+
+
+if __name__ == '__main__':
+    main()
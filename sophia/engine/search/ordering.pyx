@@ -9,6 +9,7 @@ from engine.core.constants import (
     MAX_DEPTH,
     HISTORY_MAX, HISTORY_GRAVITY,
 )
+import engine.core.parameters as _parameters
 from engine.core.parameters import (
     PIECE_VALUES,
     SCORE_TT_MOVE, SCORE_GOOD_CAP, SCORE_COUNTER_MOVE,
@@ -37,22 +38,34 @@ cdef int _QUEEN           = QUEEN
 cdef int _KING            = KING
 cdef int _WHITE           = WHITE
 
-cdef int _SCORE_TT_MOVE      = SCORE_TT_MOVE
-cdef int _SCORE_GOOD_CAP     = SCORE_GOOD_CAP
-cdef int _SCORE_COUNTER_MOVE = SCORE_COUNTER_MOVE
-cdef int _SCORE_KILLER_1     = SCORE_KILLER_1
-cdef int _SCORE_KILLER_2     = SCORE_KILLER_2
-cdef int _SCORE_BAD_CAP      = SCORE_BAD_CAP
-cdef int _REPETITION_PENALTY = MOVE_REPETITION_PENALTY
-cdef int _MVV_LVA_MULT       = MVV_LVA_MULTIPLIER
-
+cdef int _SCORE_TT_MOVE, _SCORE_GOOD_CAP, _SCORE_COUNTER_MOVE
+cdef int _SCORE_KILLER_1, _SCORE_KILLER_2, _SCORE_BAD_CAP
+cdef int _REPETITION_PENALTY, _MVV_LVA_MULT
 cdef int[16] _PIECE_VALUES
-_PIECE_VALUES[_PAWN]   = PIECE_VALUES[PAWN]
-_PIECE_VALUES[_KNIGHT] = PIECE_VALUES[KNIGHT]
-_PIECE_VALUES[_BISHOP] = PIECE_VALUES[BISHOP]
-_PIECE_VALUES[_ROOK]   = PIECE_VALUES[ROOK]
-_PIECE_VALUES[_QUEEN]  = PIECE_VALUES[QUEEN]
-_PIECE_VALUES[_KING]   = PIECE_VALUES[KING]
+
+
+def reload_params():
+    """copy the ordering parameters into module globals; runs at import and from engine.search.params.load_params"""
+    global _SCORE_TT_MOVE, _SCORE_GOOD_CAP, _SCORE_COUNTER_MOVE, _SCORE_KILLER_1, _SCORE_KILLER_2, \
+        _SCORE_BAD_CAP, _REPETITION_PENALTY, _MVV_LVA_MULT
+    _parameters.rebind(globals())
+    _SCORE_TT_MOVE      = SCORE_TT_MOVE
+    _SCORE_GOOD_CAP     = SCORE_GOOD_CAP
+    _SCORE_COUNTER_MOVE = SCORE_COUNTER_MOVE
+    _SCORE_KILLER_1     = SCORE_KILLER_1
+    _SCORE_KILLER_2     = SCORE_KILLER_2
+    _SCORE_BAD_CAP      = SCORE_BAD_CAP
+    _REPETITION_PENALTY = MOVE_REPETITION_PENALTY
+    _MVV_LVA_MULT       = MVV_LVA_MULTIPLIER
+
+    _PIECE_VALUES[_PAWN]   = PIECE_VALUES[PAWN]
+    _PIECE_VALUES[_KNIGHT] = PIECE_VALUES[KNIGHT]
+    _PIECE_VALUES[_BISHOP] = PIECE_VALUES[BISHOP]
+    _PIECE_VALUES[_ROOK]   = PIECE_VALUES[ROOK]
+    _PIECE_VALUES[_QUEEN]  = PIECE_VALUES[QUEEN]
+    _PIECE_VALUES[_KING]   = PIECE_VALUES[KING]
+
+reload_params()
 
 
 cdef inline int _promoted_piece_value(unsigned int move) noexcept:
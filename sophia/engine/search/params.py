@@ -0,0 +1,23 @@
+"""
+runtime parameter loading
+
+the search modules copy parameters into C globals at import, so patching
+engine.core.parameters alone changes nothing mid-process. load_params swaps the
+whole set and refreshes every copy, letting one process play several parameter
+sets (see tune/inprocess_match.py) instead of one engine process per set
+"""
+
+import engine.core.parameters as _parameters
+from engine.search import evaluation, see, ordering, search
+
+
+def load_params(data=None):
+    """
+    switch to the built-in parameters plus data (a tune json dict, or None for
+    the defaults). hashed results — TT entries, pawn hash scores and the mg/eg
+    sums on a State — were computed under the old set: keep one SearchEngine
+    per parameter set and rescore States with calculate_initial_score
+    """
+    _parameters.load_params(data)
+    for module in (evaluation, see, ordering, search):
+        module.reload_params()
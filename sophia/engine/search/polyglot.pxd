@@ -0,0 +1,14 @@
+# declaration header for polyglot.pyx
+
+from engine.board.state cimport State
+
+cdef packed struct BookEntry:
+    unsigned long long key
+    unsigned short     move    # polyglot encoding: to file/row, from file/row, promotion
+    double             weight  # normalised within its book and position
+
+cdef class BookIndex:
+    cdef BookEntry*       entries
+    cdef public long long size
+
+cpdef unsigned long long polyglot_key(State state)
@@ -0,0 +1,157 @@
+import mmap
+import os
+import struct
+
+from engine.uci.utils import send_info_string
+
+MAGIC = b'SOPHPC01'
+HEADER = struct.Struct('<8sQQ')       # magic, slot count, store clock
+HEADER_SIZE = 64
+# check (key xor data), nodes, move, score, last-used stamp, depth
+SLOT = struct.Struct('<QQIiIh2x')
+PROBE_WINDOW = 4                       # slots probed from the home index
+DEFAULT_MIN_DEPTH = 8
+MASK_64 = (1 << 64) - 1
+
+
+def _check(key, move, score, depth, nodes):
+    # lockless-tt trick: a slot torn by two processes writing at once fails this
+    return (key ^ nodes ^ (move << 32) ^ (score & 0xFFFFFFFF) ^ depth) & MASK_64
+
+
+class PositionCache:
+    """
+    persistent root results (best move, score, depth, nodes) keyed by zobrist
+    hash, in a fixed-size memory-mapped file with open addressing
+
+    a lookup probes PROBE_WINDOW slots from the home index; a store takes an
+    empty or matching slot, otherwise evicts the least recently used one in the
+    window (shallowest on ties). the file never grows past size_mb, and reopening
+    it at a different size rehashes the most recently used entries across
+    """
+
+    def __init__(self, path='position_cache.bin', size_mb=64, min_depth=DEFAULT_MIN_DEPTH):
+        self.path = os.path.abspath(path)
+        self.min_depth = min_depth
+        self.slots = max(PROBE_WINDOW, size_mb * 1024 * 1024 // SLOT.size)
+        self.hits = 0
+        self.misses = 0
+
+        old = self._read_entries() if os.path.exists(self.path) else []
+        if old is not None:
+            # new file, or one sized differently: rebuild it, keeping what fits
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, self.slots, 0).ljust(HEADER_SIZE, b'\0'))
+                f.truncate(HEADER_SIZE + self.slots * SLOT.size)
+
+        self._file = open(self.path, 'r+b')
+        self.map = mmap.mmap(self._file.fileno(), 0)
+        self.clock = HEADER.unpack_from(self.map, 0)[2]
+
+        if old:
+            old.sort(key=lambda entry: entry[4])
+            for key, move, score, depth, stamp, nodes in old[-self.slots:]:
+                self.store(key, move, score, depth, nodes)
+            send_info_string(f"position cache resized: kept {min(len(old), self.slots)} of {len(old)} entries")
+
+        send_info_string(f"position cache '{path}': {self.slots} slots")
+
+    def _read_entries(self):
+        """
+        None if the file already matches this size, else the entries it holds.
+        raises ValueError for a file that isn't a position cache, rather than
+        overwriting whatever it is
+        """
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if not header: return []
+            if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"'{self.path}' is not a position cache file")
+            _, slots, _ = HEADER.unpack(header)
+            if slots == self.slots: return None
+            f.seek(HEADER_SIZE)
+            data = f.read(slots * SLOT.size)
+
+        entries = []
+        for check, nodes, move, score, stamp, depth in SLOT.iter_unpack(data[:len(data) - len(data) % SLOT.size]):
+            if check == 0 and move == 0: continue
+            key = check ^ _check(0, move, score, depth, nodes)
+            entries.append((key, move, score, depth, stamp, nodes))
+        return entries
+
+    def _offset(self, index):
+        return HEADER_SIZE + (index % self.slots) * SLOT.size
+
+    @staticmethod
+    def usable(state):
+        """
+        whether a result for this root can stand in for a fresh search: history
+        only reaches the search through repetitions since the last irreversible
+        move, and the fifty-move clock, so neither may be in play
+        """
+        return min(state.halfmove_clock, state.history_len) == 0 and state.halfmove_clock < 50
+
+    def probe(self, key, depth_limit=None, nodes_limit=None):
+        """
+        (move, score, depth, nodes) if a stored search for key is at least as
+        deep as this one would be, else None. only a depth or node limited search
+        can be answered: a timed, infinite or ponder search has to run (and use
+        its time) however deep the stored one went
+        """
+        if depth_limit is None and nodes_limit is None: return None
+
+        home = key % self.slots
+        for i in range(PROBE_WINDOW):
+            offset = self._offset(home + i)
+            check, nodes, move, score, _, depth = SLOT.unpack_from(self.map, offset)
+            if move == 0 or check != _check(key, move, score, depth, nodes): continue
+
+            if depth_limit is not None: enough = depth >= depth_limit
+            else: enough = nodes >= nodes_limit
+            if not enough: break
+
+            self.hits += 1
+            self._touch(offset)
+            return move, score, depth, nodes
+
+        self.misses += 1
+        return None
+
+    def store(self, key, move, score, depth, nodes):
+        # shallower results are cheaper to search again than to keep a slot for
+        if depth < self.min_depth: return
+        nodes = min(nodes, MASK_64)
+        home = key % self.slots
+        victim = None
+        victim_rank = None
+
+        for i in range(PROBE_WINDOW):
+            offset = self._offset(home + i)
+            check, old_nodes, old_move, old_score, stamp, old_depth = SLOT.unpack_from(self.map, offset)
+            if old_move == 0:
+                victim = offset
+                break
+            if check == _check(key, old_move, old_score, old_depth, old_nodes):
+                if old_depth > depth or (old_depth == depth and old_nodes > nodes):
+                    self._touch(offset)  # the stored search is the better one
+                    return
+                victim = offset
+                break
+            rank = ((self.clock - stamp) & 0xFFFFFFFF, -old_depth)
+            if victim_rank is None or rank > victim_rank:
+                victim, victim_rank = offset, rank
+
+        self.clock = (self.clock + 1) & 0xFFFFFFFF
+        SLOT.pack_into(self.map, victim, _check(key, move, score, depth, nodes),
+                       nodes, move, score, self.clock, depth)
+        HEADER.pack_into(self.map, 0, MAGIC, self.slots, self.clock)
+
+    def _touch(self, offset):
+        self.clock = (self.clock + 1) & 0xFFFFFFFF
+        struct.pack_into('<I', self.map, offset + 24, self.clock)
+
+    def close(self):
+        if self.map.closed: return
+        self.map.flush()
+        self.map.close()
+        self._file.close()
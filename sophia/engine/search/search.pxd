@@ -3,6 +3,7 @@
 from engine.board.state cimport State
 from engine.search.transposition cimport TranspositionTable
 from engine.search.ordering cimport MoveOrdering
+from engine.search.tbprobe cimport TablebaseProber
 
 cdef class SearchEngine:
     cdef public int   nodes_searched
@@ -25,7 +26,10 @@ cdef class SearchEngine:
     cdef public object ponder_move
     cdef public object nodes_limit
     cdef public object opponent_time_ms
-    cdef public object syzygy_cache
+    cdef public TablebaseProber tb_prober
+    cdef public object position_cache
+    cdef public int   best_score
+    cdef public object pv_line
 
     # debug counters
     cdef public int dbg_nmp_attempts
@@ -72,3 +76,4 @@ cdef class SearchEngine:
     cdef int _alpha_beta(self, State state, int depth, int alpha, int beta, int ply,
                          unsigned int previous_move, bint allow_null, bint is_pv) except? -32768
     cdef int _quiescence(self, State state, int alpha, int beta, int ply) except? -32768
+    cdef int _quiescence_pv(self, State state, int alpha, int beta, int ply, list pv) except? -32768
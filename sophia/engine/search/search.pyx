@@ -6,13 +6,14 @@
 import time
 import threading
 import engine.core.constants as _const
+import engine.core.parameters as _parameters
 from engine.core.constants import (
     WHITE, BLACK, INFINITY,
     MAX_DEPTH, TIME_CHECK_NODES, INFINITE_TIME,
     PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
     MASK_SOURCE, NULL as _NULL,
     HISTORY_MAX, HISTORY_GRAVITY,
-    FIFTY_MOVE_LIMIT, SYZYGY_PIECE_THRESHOLD,
+    FIFTY_MOVE_LIMIT, SYZYGY_ROOT_TIME_FRACTION,
 )
 from engine.core.parameters import (
     PIECE_VALUES,
@@ -54,7 +55,7 @@ from engine.board.move_exec cimport (
     make_null_move, unmake_null_move,
     has_insufficient_material, repetition_count
 )
-from engine.moves.legality cimport is_in_check
+from engine.moves.legality cimport king_in_check
 from engine.search.transposition import (
     FLAG_EXACT, FLAG_LOWERBOUND, FLAG_UPPERBOUND
 )
@@ -63,71 +64,98 @@ from engine.search.evaluation cimport evaluate
 from engine.search.evaluation import evaluate, PawnHashTable
 from engine.search.ordering import MoveOrdering
 from engine.search.ordering cimport MoveOrdering, pick_next_move, pick_next_move_list, score_move_list
-from engine.uci.utils import send_command, send_info_string
+from engine.uci.utils import send_command, send_info, send_info_string, flush_info
 from engine.search.syzygy import SyzygyHandler
+from engine.search.tbprobe cimport TablebaseProber
+from engine.search.bitbase cimport is_kpk, kpk_probe
 from engine.search.utils import _get_cp_score
 from engine.board.state cimport State
 
 cdef int _INFINITY       = INFINITY
 cdef int _WHITE          = WHITE
 cdef int _BLACK          = BLACK
-cdef int _CHECK_EXT      = CHECK_EXTENSION
-cdef int _LMR_BASE       = LMR_BASE_REDUCTION
-cdef int _LMR_THRESH     = LMR_MOVE_THRESHOLD
-cdef int _LMP_BASE       = LMP_BASE
-cdef int _NMP_BASE       = NMP_BASE_REDUCTION
-cdef int _NMP_DEPTH      = NMP_DEPTH_REDUCTION
-cdef int _NMP_MIN_DEPTH  = NMP_MIN_DEPTH
-cdef int _NMP_DEEP_DEPTH = NMP_DEEP_DEPTH
-cdef int _NMP_EVAL_MARGIN = NMP_EVAL_MARGIN
-cdef int _NMP_EVAL_EXTRA_RED = NMP_EVAL_EXTRA_REDUCTION
-cdef int _LMR_MIN_DEPTH  = LMR_MIN_DEPTH
-cdef int _LMR_NON_PV_RED = LMR_NON_PV_REDUCTION
-cdef int _PHASE_EXT      = PHASE_TRANSITION_EXTENSION
-cdef int _STATIC_NULL    = STATIC_NULL_MARGIN
-cdef int _CONTEMPT       = CONTEMPT
-cdef double _LOSING_CONTEMPT_SCALE = LOSING_CONTEMPT_SCALE
-cdef int _REP_WIN        = REPETITION_PENALTY_WINNING
-cdef int _REP_EQUAL      = REPETITION_PENALTY_EQUAL
-cdef int _REP_SLIGHT     = REPETITION_PENALTY_SLIGHT
-cdef int _SLIGHTLY_BETTER = SLIGHTLY_BETTER_THRESHOLD
-cdef int _CLEARLY_WIN    = CLEARLY_WINNING_THRESHOLD
-cdef int _CLEARLY_LOSE   = CLEARLY_LOSING_THRESHOLD
-cdef int _50MV_BASE      = FIFTY_MOVE_CONTEMPT_BASE
-cdef int _50MV_START     = FIFTY_MOVE_SCALE_START
 cdef int _MAX_DEPTH      = MAX_DEPTH
 cdef int _TIME_CHECK     = TIME_CHECK_NODES
-cdef int _LMP_MULT       = LMP_MULTIPLIER
-cdef int _QUEEN_VAL      = PIECE_VALUES[QUEEN]
-cdef int _PAWN_VAL       = PIECE_VALUES[PAWN]
 cdef int _FLAG_EXACT     = FLAG_EXACT
 cdef int _FLAG_LB        = FLAG_LOWERBOUND
 cdef int _FLAG_UB        = FLAG_UPPERBOUND
-cdef int _RFP_MARGIN     = REVERSE_FUTILITY_MARGIN
-cdef int _SYZYGY_THRESH  = SYZYGY_PIECE_THRESHOLD
-cdef int _TB_WIN_MARGIN  = TB_WIN_SCORE_MARGIN
-cdef int _IID_MIN_DEPTH  = IID_MIN_DEPTH
-cdef int _IID_DEPTH_RED  = IID_DEPTH_REDUCTION
-cdef int _LMR_HEAVY_THRESH = LMR_HEAVY_THRESHOLD
-cdef int _LMR_HEAVY_RED  = LMR_HEAVY_REDUCTION
-cdef int _RAZOR_CAP      = RAZORING_DEPTH_CAP
-cdef int _RFP_CAP        = RFP_DEPTH_CAP
-cdef int _SNMP_CAP       = SNMP_DEPTH_CAP
-cdef int _FUTILITY_CAP   = FUTILITY_DEPTH_CAP
-cdef int _LMP_CAP        = LMP_DEPTH_CAP
-cdef int _SEE_CAP        = SEE_PRUNING_DEPTH_CAP
 cdef int _50MV_LIMIT     = FIFTY_MOVE_LIMIT
-cdef int _TIME_PRESS_THRESH = TIME_PRESSURE_THRESHOLD
-cdef int _TIME_CHK_SWITCH   = TIME_CHECK_SWITCH
-cdef int _TIME_CHK_TIGHT    = TIME_CHECK_TIGHT
-cdef int _MATE_MARGIN       = MATE_SCORE_MARGIN
-cdef int _ASP_MIN_DEPTH     = ASPIRATION_MIN_DEPTH
-cdef int _ASP_DELTA         = ASPIRATION_DELTA
-cdef int _ASP_WIDEN         = ASPIRATION_WIDEN_FACTOR
-cdef int _TT_SCORE_BOUND    = INFINITY - 2 * MATE_SCORE_MARGIN
 
-_RAZOR_MARGIN_LIST   = list(RAZOR_MARGIN)
-_FUTILITY_MARGIN_LIST = list(FUTILITY_MARGIN)
+# search parameters: C copies of engine.core.parameters, filled by reload_params()
+cdef int _CHECK_EXT, _LMR_BASE, _LMR_THRESH, _LMP_BASE, _NMP_BASE, _NMP_DEPTH, _NMP_MIN_DEPTH
+cdef int _NMP_DEEP_DEPTH, _NMP_EVAL_MARGIN, _NMP_EVAL_EXTRA_RED, _LMR_MIN_DEPTH, _LMR_NON_PV_RED
+cdef int _PHASE_EXT, _STATIC_NULL, _CONTEMPT, _REP_WIN, _REP_EQUAL, _REP_SLIGHT, _SLIGHTLY_BETTER
+cdef int _CLEARLY_WIN, _CLEARLY_LOSE, _50MV_BASE, _50MV_START, _LMP_MULT, _QUEEN_VAL, _PAWN_VAL
+cdef int _RFP_MARGIN, _TB_WIN_MARGIN, _IID_MIN_DEPTH, _IID_DEPTH_RED, _LMR_HEAVY_THRESH, _LMR_HEAVY_RED
+cdef int _RAZOR_CAP, _RFP_CAP, _SNMP_CAP, _FUTILITY_CAP, _LMP_CAP, _SEE_CAP, _TIME_PRESS_THRESH
+cdef int _TIME_CHK_SWITCH, _TIME_CHK_TIGHT, _MATE_MARGIN, _ASP_MIN_DEPTH, _ASP_DELTA, _ASP_WIDEN
+cdef int _TT_SCORE_BOUND
+cdef double _LOSING_CONTEMPT_SCALE
+
+
+def reload_params():
+    """copy the search parameters into module globals; runs at import and from engine.search.params.load_params"""
+    global _CHECK_EXT, _LMR_BASE, _LMR_THRESH, _LMP_BASE, _NMP_BASE, _NMP_DEPTH, _NMP_MIN_DEPTH, \
+        _NMP_DEEP_DEPTH, _NMP_EVAL_MARGIN, _NMP_EVAL_EXTRA_RED, _LMR_MIN_DEPTH, _LMR_NON_PV_RED, \
+        _PHASE_EXT, _STATIC_NULL, _CONTEMPT, _LOSING_CONTEMPT_SCALE, _REP_WIN, _REP_EQUAL, \
+        _REP_SLIGHT, _SLIGHTLY_BETTER, _CLEARLY_WIN, _CLEARLY_LOSE, _50MV_BASE, _50MV_START, \
+        _LMP_MULT, _QUEEN_VAL, _PAWN_VAL, _RFP_MARGIN, _TB_WIN_MARGIN, _IID_MIN_DEPTH, \
+        _IID_DEPTH_RED, _LMR_HEAVY_THRESH, _LMR_HEAVY_RED, _RAZOR_CAP, _RFP_CAP, _SNMP_CAP, \
+        _FUTILITY_CAP, _LMP_CAP, _SEE_CAP, _TIME_PRESS_THRESH, _TIME_CHK_SWITCH, _TIME_CHK_TIGHT, \
+        _MATE_MARGIN, _ASP_MIN_DEPTH, _ASP_DELTA, _ASP_WIDEN, _TT_SCORE_BOUND, _RAZOR_MARGIN_LIST, \
+        _FUTILITY_MARGIN_LIST
+    _parameters.rebind(globals())
+    _CHECK_EXT             = CHECK_EXTENSION
+    _LMR_BASE              = LMR_BASE_REDUCTION
+    _LMR_THRESH            = LMR_MOVE_THRESHOLD
+    _LMP_BASE              = LMP_BASE
+    _NMP_BASE              = NMP_BASE_REDUCTION
+    _NMP_DEPTH             = NMP_DEPTH_REDUCTION
+    _NMP_MIN_DEPTH         = NMP_MIN_DEPTH
+    _NMP_DEEP_DEPTH        = NMP_DEEP_DEPTH
+    _NMP_EVAL_MARGIN       = NMP_EVAL_MARGIN
+    _NMP_EVAL_EXTRA_RED    = NMP_EVAL_EXTRA_REDUCTION
+    _LMR_MIN_DEPTH         = LMR_MIN_DEPTH
+    _LMR_NON_PV_RED        = LMR_NON_PV_REDUCTION
+    _PHASE_EXT             = PHASE_TRANSITION_EXTENSION
+    _STATIC_NULL           = STATIC_NULL_MARGIN
+    _CONTEMPT              = CONTEMPT
+    _LOSING_CONTEMPT_SCALE = LOSING_CONTEMPT_SCALE
+    _REP_WIN               = REPETITION_PENALTY_WINNING
+    _REP_EQUAL             = REPETITION_PENALTY_EQUAL
+    _REP_SLIGHT            = REPETITION_PENALTY_SLIGHT
+    _SLIGHTLY_BETTER       = SLIGHTLY_BETTER_THRESHOLD
+    _CLEARLY_WIN           = CLEARLY_WINNING_THRESHOLD
+    _CLEARLY_LOSE          = CLEARLY_LOSING_THRESHOLD
+    _50MV_BASE             = FIFTY_MOVE_CONTEMPT_BASE
+    _50MV_START            = FIFTY_MOVE_SCALE_START
+    _LMP_MULT              = LMP_MULTIPLIER
+    _QUEEN_VAL             = PIECE_VALUES[QUEEN]
+    _PAWN_VAL              = PIECE_VALUES[PAWN]
+    _RFP_MARGIN            = REVERSE_FUTILITY_MARGIN
+    _TB_WIN_MARGIN         = TB_WIN_SCORE_MARGIN
+    _IID_MIN_DEPTH         = IID_MIN_DEPTH
+    _IID_DEPTH_RED         = IID_DEPTH_REDUCTION
+    _LMR_HEAVY_THRESH      = LMR_HEAVY_THRESHOLD
+    _LMR_HEAVY_RED         = LMR_HEAVY_REDUCTION
+    _RAZOR_CAP             = RAZORING_DEPTH_CAP
+    _RFP_CAP               = RFP_DEPTH_CAP
+    _SNMP_CAP              = SNMP_DEPTH_CAP
+    _FUTILITY_CAP          = FUTILITY_DEPTH_CAP
+    _LMP_CAP               = LMP_DEPTH_CAP
+    _SEE_CAP               = SEE_PRUNING_DEPTH_CAP
+    _TIME_PRESS_THRESH     = TIME_PRESSURE_THRESHOLD
+    _TIME_CHK_SWITCH       = TIME_CHECK_SWITCH
+    _TIME_CHK_TIGHT        = TIME_CHECK_TIGHT
+    _MATE_MARGIN           = MATE_SCORE_MARGIN
+    _ASP_MIN_DEPTH         = ASPIRATION_MIN_DEPTH
+    _ASP_DELTA             = ASPIRATION_DELTA
+    _ASP_WIDEN             = ASPIRATION_WIDEN_FACTOR
+    _TT_SCORE_BOUND        = INFINITY - 2 * MATE_SCORE_MARGIN
+    _RAZOR_MARGIN_LIST     = list(RAZOR_MARGIN)
+    _FUTILITY_MARGIN_LIST  = list(FUTILITY_MARGIN)
+
+reload_params()
 
 
 cdef inline int _score_to_tt(int score, int ply) noexcept:
@@ -174,13 +202,16 @@ class TimeoutError(Exception):
 
 
 cdef class SearchEngine:
-    def __init__(self, time_limit=DEFAULT_TIME_LIMIT, tt_size_mb=64):
+    def __init__(self, time_limit=DEFAULT_TIME_LIMIT, tt_size_mb=64, load_tablebases=True):
         self.time_limit = time_limit
         self.tt = TranspositionTable(tt_size_mb)
         self.pawn_hash = PawnHashTable(32)
-        self.syzygy = SyzygyHandler()
-        self.syzygy_cache = {}
+        # no tables until load_tablebases; the uci handler defers it past uciok
+        self.syzygy = None
+        self.tb_prober = TablebaseProber(None)
+        if load_tablebases: self.load_tablebases()
         self.ordering = MoveOrdering()
+        self.position_cache = None  # PositionCache, when the uci option turns it on
         self.nodes_searched = 0
         self.depth_reached = 0
         self.seldepth = 0
@@ -192,6 +223,10 @@ cdef class SearchEngine:
         self.opponent_time_ms = INFINITE_TIME
         self.nodes_limit = None
 
+        # score and pv of the last completed iteration
+        self.best_score = 0
+        self.pv_line = ''
+
         # hard and soft time limitss
         self.hard_time_limit = 0.0
         self.soft_time_limit = 0.0
@@ -242,6 +277,11 @@ cdef class SearchEngine:
         self.dbg_syzygy_probes    = 0
         self.dbg_syzygy_hits      = 0
 
+    def load_tablebases(self, path='syzygy'):
+        """open the syzygy tables and point the in-search prober at them, keeping its probe depth"""
+        self.syzygy = SyzygyHandler(path)
+        self.tb_prober = TablebaseProber(self.syzygy.tables, probe_depth=self.tb_prober.probe_depth)
+
     def _check_time(self):
         if self.stop_flag.is_set():
             raise TimeoutError("stop")
@@ -254,6 +294,8 @@ cdef class SearchEngine:
         if elapsed >= self.hard_time_limit:
             raise TimeoutError("hard time limit exceeded")
 
+        flush_info()
+
     def _update_check_interval(self):
         self.check_interval = TIME_CHECK_NODES if self.time_limit > _TIME_CHK_SWITCH else _TIME_CHK_TIGHT
 
@@ -281,8 +323,22 @@ cdef class SearchEngine:
 
         return ' '.join(move_to_uci(m) for m in pv_moves)
 
-    def get_best_move(self, state, opp_time_ms=INFINITE_TIME, depth_limit=None, nodes_limit=None, is_movetime=False):
-        syzygy_result = self.syzygy.get_best_move(state)
+    def quiescence(self, State state):
+        """full-window qsearch score (side to move) for offline tools — no time/node limit"""
+        self.seldepth = 0
+        return self._quiescence(state, -_INFINITY, _INFINITY, 0)
+
+    def quiescence_pv(self, State state):
+        """(score, pv) — same qsearch without the TT, pv ends at the quiet leaf whose static eval is the score"""
+        cdef list pv = []
+        self.seldepth = 0
+        score = self._quiescence_pv(state, -_INFINITY, _INFINITY, 0, pv)
+        return score, pv
+
+    def get_best_move(self, state, opp_time_ms=INFINITE_TIME, depth_limit=None, nodes_limit=None, is_movetime=False, root_moves=None):
+        # root_moves restricts the root search to those moves (uci searchmoves), so skips the tablebase shortcut
+        syzygy_result = (self.syzygy.get_best_move(state, self.time_limit / 1000.0 * SYZYGY_ROOT_TIME_FRACTION)
+                         if root_moves is None and self.syzygy is not None else None)
         if syzygy_result:
             syzygy_move, wdl, dtz = syzygy_result
 
@@ -301,13 +357,30 @@ cdef class SearchEngine:
 
             return syzygy_move
 
+        # searchmoves results say nothing about the unrestricted position
+        cache = self.position_cache
+        if cache is not None and (root_moves is not None or not cache.usable(state)): cache = None
+        root_hash = state.hash
+        # only a depth or node limit can be answered from the cache; timed,
+        # infinite and ponder searches must run to their stop or bestmove is early
+        if cache is not None and (depth_limit is not None or nodes_limit is not None):
+            cached = cache.probe(root_hash, depth_limit, nodes_limit)
+            if cached is not None and self._is_root_legal(state, cached[0]):
+                cached_move, score, depth, nodes = cached
+                self.nodes_searched = 0
+                self.depth_reached = depth
+                self.best_score = score
+                self.pv_line = move_to_uci(cached_move)
+                self.ponder_move = None
+                send_command(f"info depth {depth} score {_get_cp_score(score)} nodes {nodes} pv {self.pv_line} string position cache hit")
+                return cached_move
+
         self.opponent_time_ms = opp_time_ms
         self.nodes_limit = nodes_limit
 
         self.nodes_searched = 0
         self.seldepth = 0
         self.tbhits = 0
-        self.syzygy_cache = {}
         self.ponder_move = None
         self.start_time = time.time()
         self.limit_start_time = self.start_time
@@ -364,12 +437,15 @@ cdef class SearchEngine:
         self._update_check_interval()
 
         self.depth_reached = 0
+        self.best_score = 0
+        self.pv_line = ''
 
         moves = generate_pseudo_legal_moves(state)
         legal_moves = []
         for move in moves:
+            if root_moves is not None and move not in root_moves: continue
             make_move(state, move)
-            if not is_in_check(state, not state.is_white):
+            if not king_in_check(state, not state.is_white):
                 legal_moves.append(move)
             unmake_move(state, move)
 
@@ -437,11 +513,13 @@ cdef class SearchEngine:
 
                 hashfull = self.tt.get_hashfull()
                 pv_string = self._get_pv_line(state, current_depth)
+                self.best_score = score
+                self.pv_line = pv_string
 
                 pv_parts = pv_string.split()
                 self.ponder_move = pv_parts[1] if len(pv_parts) >= 2 else None
 
-                send_command(f"info depth {current_depth} seldepth {self.seldepth} score {score_str} nodes {self.nodes_searched} nps {nps} time {int(elapsed * 1000)} hashfull {hashfull} tbhits {self.tbhits} pv {pv_string}")
+                send_info(f"info depth {current_depth} seldepth {self.seldepth} score {score_str} nodes {self.nodes_searched} nps {nps} time {int(elapsed * 1000)} hashfull {hashfull} tbhits {self.tbhits} pv {pv_string}")
 
                 if _const.DEBUG:
                     def _pct(n, d):
@@ -540,8 +618,20 @@ cdef class SearchEngine:
         except TimeoutError:
             pass
 
+        # keyed on the hash taken before searching: an abort can leave state mid-line
+        if cache is not None and self.depth_reached > 0:
+            cache.store(root_hash, best_move_so_far, self.best_score, self.depth_reached, self.nodes_searched)
+
         return best_move_so_far
 
+    def _is_root_legal(self, State state, unsigned int move):
+        cdef bint legal
+        if not _is_pseudo_search_move(state, move): return False
+        make_move(state, move)
+        legal = not king_in_check(state, not state.is_white)
+        unmake_move(state, move)
+        return legal
+
     def _search_root(self, State state, int depth, list moves, int alpha, int beta):
         cdef int best_value
         cdef int ply
@@ -637,6 +727,7 @@ cdef class SearchEngine:
         cdef unsigned int  _tt_move_raw
         cdef bint          _tt_hit, _iid_hit
         cdef unsigned long long all_pieces
+        cdef int tb_wdl, tb_dtz
 
         if ply > self.seldepth: self.seldepth = ply
 
@@ -736,24 +827,19 @@ cdef class SearchEngine:
 
         if depth <= 0: return self._quiescence(state, alpha, beta, ply)
 
+        # drawn K+P v K needs no search to prove it
+        if is_kpk(state) and not kpk_probe(state): return 0
+
         all_pieces = state.bitboards[_WHITE] | state.bitboards[_BLACK]
-        if popcount(all_pieces) <= _SYZYGY_THRESH:
+        if depth >= self.tb_prober.probe_depth and popcount(all_pieces) <= self.tb_prober.max_pieces:
             if _const.DEBUG: self.dbg_syzygy_probes += 1
-            cached = self.syzygy_cache.get(state.hash)
-            if cached is None:
-                wdl = self.syzygy.probe_wdl(state)
-                if wdl is not None:
-                    dtz = self.syzygy.probe_dtz(state)
-                    self.syzygy_cache[state.hash] = (wdl, dtz)
-                    cached = (wdl, dtz)
-            if cached is not None:
+            if self.tb_prober.probe(state, &tb_wdl, &tb_dtz):
                 if _const.DEBUG: self.dbg_syzygy_hits += 1
                 self.tbhits += 1
-                wdl, dtz = cached
                 TB_WIN_SCORE = _INFINITY - _TB_WIN_MARGIN
 
-                if wdl > 0: score = TB_WIN_SCORE - ply - abs(dtz)
-                elif wdl < 0: score = -TB_WIN_SCORE + ply + abs(dtz)
+                if tb_wdl > 0: score = TB_WIN_SCORE - ply - abs(tb_dtz)
+                elif tb_wdl < 0: score = -TB_WIN_SCORE + ply + abs(tb_dtz)
                 else: score = 0
 
                 self.tt.store(<unsigned long long>state.hash, <short>depth,
@@ -761,7 +847,7 @@ cdef class SearchEngine:
                               <unsigned char>_FLAG_EXACT, 0)
                 return score
 
-        in_check = is_in_check(state, state.is_white)
+        in_check = king_in_check(state, state.is_white)
 
         # check extension
         if in_check:
@@ -914,13 +1000,13 @@ cdef class SearchEngine:
                 old_phase = state.phase
                 make_move(state, move)
 
-                if is_in_check(state, not state.is_white):
+                if king_in_check(state, not state.is_white):
                     unmake_move(state, move)
                     continue
 
                 legal_moves_count += 1
 
-                gives_check = is_in_check(state, state.is_white)
+                gives_check = king_in_check(state, state.is_white)
 
                 is_interesting = is_capture(move) or is_en_passant(move) or is_promotion(move)
 
@@ -1073,7 +1159,7 @@ cdef class SearchEngine:
             elif _tt_flag == _FLAG_UB:
                 if _tt_score <= alpha: return _tt_score
 
-        in_check = is_in_check(state, state.is_white)
+        in_check = king_in_check(state, state.is_white)
 
         if not in_check:
             evaluation = evaluate(state, self.pawn_hash)
@@ -1118,7 +1204,7 @@ cdef class SearchEngine:
 
             make_move(state, move)
 
-            if is_in_check(state, not state.is_white):
+            if king_in_check(state, not state.is_white):
                 unmake_move(state, move)
                 continue
 
@@ -1136,3 +1222,66 @@ cdef class SearchEngine:
             return -_INFINITY + ply
 
         return alpha
+
+    cdef int _quiescence_pv(self, State state, int alpha, int beta, int ply, list pv) except? -32768:
+        # mirror of _quiescence (stand pat, delta, SEE) that skips the TT so every
+        # exact score is backed by a line; pv is filled in place on alpha raises
+        cdef int evaluation, i, score
+        cdef unsigned int move
+        cdef bint in_check, legal_moves_found
+        cdef MoveList moves
+        cdef int scores[256]
+        cdef signed char see_cache[256]
+        cdef list child
+
+        self.nodes_searched += 1
+        if ply > self.seldepth: self.seldepth = ply
+
+        in_check = king_in_check(state, state.is_white)
+
+        if not in_check:
+            evaluation = evaluate(state, self.pawn_hash)
+            if evaluation >= beta: return beta
+            if evaluation < alpha - (_QUEEN_VAL + _PAWN_VAL): return alpha
+            if evaluation > alpha: alpha = evaluation
+
+        if in_check:
+            generate_check_evasion_move_list(state, &moves)
+        else:
+            generate_pseudo_legal_move_list(state, &moves, True)
+
+        if moves.count == 0:
+            if in_check:
+                return -_INFINITY + ply
+            return alpha
+
+        legal_moves_found = False
+        score_move_list(&moves, scores, see_cache, state, self.ordering, 0, 0, 0, 0, 0)
+
+        for i in range(moves.count):
+            pick_next_move_list(&moves, scores, see_cache, i)
+            move = moves.moves[i]
+
+            if not in_check and is_capture(move) and see_cache[i] != 1:
+                continue
+
+            make_move(state, move)
+            if king_in_check(state, not state.is_white):
+                unmake_move(state, move)
+                continue
+
+            legal_moves_found = True
+            child = []
+            score = -self._quiescence_pv(state, -beta, -alpha, ply + 1, child)
+            unmake_move(state, move)
+
+            if score >= beta:
+                return beta
+            if score > alpha:
+                alpha = score
+                pv[:] = [move] + child
+
+        if in_check and not legal_moves_found:
+            return -_INFINITY + ply
+
+        return alpha
@@ -4,6 +4,7 @@ from engine.core.constants import (
     WP, WN, WB, WR, WQ, WK,
     BP, BN, BB, BR, BQ, BK,
 )
+import engine.core.parameters as _parameters
 from engine.core.parameters import PIECE_VALUES
 from engine.core.move import (
     EN_PASSANT,
@@ -31,12 +32,20 @@ cdef int _SP1 = SPECIAL_1
 cdef int _SP0 = SPECIAL_0
 
 cdef int[16] _PIECE_VALUES
-_PIECE_VALUES[_PAWN]   = PIECE_VALUES[PAWN]
-_PIECE_VALUES[_KNIGHT] = PIECE_VALUES[KNIGHT]
-_PIECE_VALUES[_BISHOP] = PIECE_VALUES[BISHOP]
-_PIECE_VALUES[_ROOK]   = PIECE_VALUES[ROOK]
-_PIECE_VALUES[_QUEEN]  = PIECE_VALUES[QUEEN]
-_PIECE_VALUES[_KING]   = PIECE_VALUES[KING]
+
+
+def reload_params():
+    """copy the piece values into the C table; runs at import and from engine.search.params.load_params"""
+    _parameters.rebind(globals())
+    _PIECE_VALUES[_PAWN]   = PIECE_VALUES[PAWN]
+    _PIECE_VALUES[_KNIGHT] = PIECE_VALUES[KNIGHT]
+    _PIECE_VALUES[_BISHOP] = PIECE_VALUES[BISHOP]
+    _PIECE_VALUES[_ROOK]   = PIECE_VALUES[ROOK]
+    _PIECE_VALUES[_QUEEN]  = PIECE_VALUES[QUEEN]
+    _PIECE_VALUES[_KING]   = PIECE_VALUES[KING]
+
+reload_params()
+
 
 cdef inline int _lsb_sq(unsigned long long bb) noexcept:
     return lsb(bb)
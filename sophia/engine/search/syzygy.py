@@ -1,122 +1,118 @@
-import chess
-import chess.syzygy
 import os
 import random
-from engine.search.utils import state_to_board
-from engine.core.constants import WHITE, BLACK, SYZYGY_PIECE_THRESHOLD
+import time
+from collections import OrderedDict
+from engine.board.move_exec import make_move, unmake_move
+from engine.moves.generator import get_legal_moves
+from engine.moves.legality import is_in_check
+from engine.core.move import move_to_uci
+from engine.search.tbcore import SyzygyTables
+from engine.core.constants import WHITE, BLACK, SYZYGY_PIECE_THRESHOLD
 from engine.uci.utils import send_info_string
 
+ROOT_CACHE_SIZE = 4096  # ranked root positions kept, least recently used dropped first
+
+
+def _is_checkmate(state):
+    return is_in_check(state, state.is_white) and not get_legal_moves(state)
+
+
 class SyzygyHandler:
     def __init__(self, file_path="syzygy"):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.path = os.path.join(current_dir, file_path)
 
-        self.tablebase = None
-        
-        if os.path.exists(self.path):
-            try:
-                self.tablebase = chess.syzygy.open_tablebase(self.path)
-                send_info_string(f"found syzygy tablebase in '{file_path}'")
-            except Exception as e: send_info_string(f"syzygy error: {e}")
+        # files are only registered here; each is mapped on its first probe
+        self.tables = SyzygyTables(self.path)
+        if self.tables.max_pieces:
+            send_info_string(f"found syzygy tablebase in '{file_path}'")
         else:
             send_info_string(f"syzygy tablebase NOT found in '{file_path}'")
 
-    def get_best_move(self, state):
-        if not self.tablebase: return None
+        self.max_pieces = min(SYZYGY_PIECE_THRESHOLD, self.tables.max_pieces)
+        self.root_cache = OrderedDict()
 
-        all_pieces = state.bitboards[WHITE] | state.bitboards[BLACK]
-        if all_pieces.bit_count() > SYZYGY_PIECE_THRESHOLD: return None
+    def get_best_move(self, state, time_budget=None):
+        """
+        (uci move, wdl, dtz) for a position the tables cover, else None. rankings
+        are cached per position, so each position in an endgame is ranked once per
+        game. time_budget (seconds) bounds the probing; a ranking cut short still
+        returns a move that keeps the result, but isn't cached
+        """
+        if not self.max_pieces or state.castling_rights: return None
 
-        try: board = state_to_board(state)
-        except Exception: return None
+        all_pieces = state.bitboards[WHITE] | state.bitboards[BLACK]
+        if all_pieces.bit_count() > self.max_pieces: return None
 
-        try: current_wdl = self.tablebase.probe_wdl(board)
-        except chess.syzygy.MissingTableError: return None
+        cached = self.root_cache.get(state.hash)
+        if cached is not None:
+            self.root_cache.move_to_end(state.hash)
+            return cached
 
-        if current_wdl is None: return None
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
 
-        try: root_dtz = self.tablebase.probe_dtz(board)
-        except: root_dtz = 0
+        root_wdl = self.tables.wdl(state)
+        if root_wdl is None: return None
 
-        best_move = None
-        best_dtz = float('inf')
-        
-        moves = list(board.legal_moves)
-        random.shuffle(moves)
+        moves = get_legal_moves(state)
+        if not moves: return None
+        random.shuffle(moves)  # ties go to a random move
+        complete = True
 
+        # wdl for every move first: only the moves that keep the result need a dtz
+        keep = []
         for move in moves:
-            # if winning, avoid repeating positions 
-            if current_wdl > 0 and board.is_repetition(3): continue
-
-            board.push(move)
-            
-            if board.is_checkmate():
-                board.pop()
-                return (move.uci(), 2, 0) 
-
-            if board.is_game_over():
-                result_wdl = 0 
-                result_dtz = 0
-            else:
-                try:
-                    result_wdl = self.tablebase.probe_wdl(board)
-                    result_dtz = self.tablebase.probe_dtz(board)
-                except:
-                    board.pop()
-                    continue
-            
-            board.pop()
-
-            if result_wdl is None or result_dtz is None: continue
-
-            # winning (WDL > 0)
-            if current_wdl > 0:
-                if result_wdl < 0:
-                    is_zeroing = board.is_capture(move) or board.piece_at(move.from_square).piece_type == chess.PAWN
-
-                    move_dtz = abs(result_dtz)
-                    
-                    if is_zeroing: move_dtz = 0 
-
-                    if move_dtz < best_dtz:
-                        best_dtz = move_dtz
-                        best_move = move
-
-            # draw (WDL = 0)
-            elif current_wdl == 0:
-                if result_wdl == 0:
-                    best_move = move
-                    break 
-
-            # losing (WDL < 0)
-            elif current_wdl < 0:
-                # if we must lose, make it take as long as possible: maximise DTZ
-                if result_wdl > 0:
-                    move_dtz = abs(result_dtz)
-
-                    if best_dtz == float('inf'): best_dtz = -1
-                    
-                    if move_dtz > best_dtz:
-                        best_dtz = move_dtz
-                        best_move = move
-
-        if best_move: return (best_move.uci(), current_wdl, root_dtz)
-            
-        return None
-
-    def probe_wdl(self, state):
-        if not self.tablebase: return None
-        try:
-            board = state_to_board(state)
-            return self.tablebase.probe_wdl(board)
-        except: return None
-
-    def probe_dtz(self, state):
-        if not self.tablebase: return None
-        try:
-            board = state_to_board(state)
-            return self.tablebase.probe_dtz(board)
-        except: return None
+            if deadline is not None and time.perf_counter() > deadline:
+                complete = False
+                break
+            make_move(state, move)
+            move_wdl = self.tables.wdl(state)
+            unmake_move(state, move)
+            if move_wdl is not None and -move_wdl == root_wdl: keep.append(move)
+
+        if not keep: return None
+
+        best_move = keep[0]
+        if root_wdl > 0:
+            # winning: mate now, else the shortest way to the next zeroing move
+            best_dtz = float('inf')
+            for move in keep:
+                if deadline is not None and time.perf_counter() > deadline:
+                    complete = False
+                    break
+                make_move(state, move)
+                if _is_checkmate(state):
+                    unmake_move(state, move)
+                    best_move, best_dtz = move, -1
+                    break
+                if state.halfmove_clock == 0: move_dtz = 0
+                else:
+                    move_dtz = self.tables.dtz(state)
+                    if move_dtz is not None: move_dtz = abs(move_dtz)
+                unmake_move(state, move)
+                if move_dtz is not None and move_dtz < best_dtz:
+                    best_move, best_dtz = move, move_dtz
+        elif root_wdl < 0:
+            # losing: make it take as long as possible
+            best_dtz = -1
+            for move in keep:
+                if deadline is not None and time.perf_counter() > deadline:
+                    complete = False
+                    break
+                make_move(state, move)
+                move_dtz = self.tables.dtz(state)
+                unmake_move(state, move)
+                if move_dtz is not None and abs(move_dtz) > best_dtz:
+                    best_move, best_dtz = move, abs(move_dtz)
+
+        root_dtz = self.tables.dtz(state) if root_wdl != 0 else 0
+        if root_dtz is None: root_dtz = 0
+
+        result = (move_to_uci(best_move), root_wdl, root_dtz)
+        if complete:
+            self.root_cache[state.hash] = result
+            if len(self.root_cache) > ROOT_CACHE_SIZE: self.root_cache.popitem(last=False)
+        return result
 
     def close(self):
-        if self.tablebase: self.tablebase.close()
+        self.tables.close()
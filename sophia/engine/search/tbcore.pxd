@@ -0,0 +1,68 @@
+# declaration header for tbcore.pyx
+
+from engine.board.state cimport State
+from engine.moves.generator cimport MoveList
+
+cdef enum:
+    TB_PIECES = 7
+    TB_FAIL   = 0x7fffffff  # what a probe returns when a table it needs is missing or unreadable
+
+cdef struct PairsData:
+    long long indextable      # byte offsets into the table's mapping
+    long long sizetable
+    long long data
+    long long offset
+    long long sympat
+    int       blocksize
+    int       idxbits
+    int       min_len
+    int*      symlen
+    unsigned long long* base
+
+cdef struct TBTable:
+    const unsigned char* data
+    size_t               size
+    int                  state        # 0 = not mapped yet, 1 = ready, -1 = unusable
+    bint                 is_dtz
+    unsigned long long   key          # material key of the side the file calls white
+    unsigned long long   mirrored_key
+    int                  num
+    bint                 has_pawns
+    bint                 symmetric
+    int                  enc_type
+    int                  pawns[2]
+    int                  files        # 4 for pawn tables (one per leading pawn file), else 1
+    int                  sides        # wdl: 2 when both sides to move are stored
+    PairsData            precomp[4][2]
+    unsigned char        pieces[4][2][TB_PIECES]
+    unsigned char        norm[4][2][TB_PIECES]
+    unsigned long long   factor[4][2][TB_PIECES]
+    int                  flags[4]     # dtz only: stored side to move and value map per file
+    int                  map_idx[4][4]
+    long long            p_map
+
+cdef struct TBSlot:
+    unsigned long long key
+    int                table
+
+cdef class SyzygyTables:
+    cdef TBTable*           tables
+    cdef TBSlot*            wdl_slots
+    cdef TBSlot*            dtz_slots
+    cdef unsigned long long slot_mask
+    cdef list               paths
+    cdef public int         count
+    cdef public int         max_pieces
+    cdef public str         path
+
+    cdef void _insert(self, TBSlot* slots, unsigned long long key, int table)
+    cdef TBTable* _find(self, TBSlot* slots, unsigned long long key) noexcept
+    cdef int _side(self, TBTable* t, State state, unsigned long long key, int* cmirror, int* mirror) noexcept
+    cdef int _wdl_table(self, State state) noexcept
+    cdef int _dtz_table(self, State state, int wdl, int* success) noexcept
+    cdef int _probe_ab(self, State state, int alpha, int beta, int* success) noexcept
+    cdef int _best_en_passant(self, State state, MoveList* moves) noexcept
+    cdef int _probe_dtz_no_ep(self, State state) noexcept
+    cdef bint _is_mate(self, State state) noexcept
+    cdef int probe_wdl(self, State state) noexcept
+    cdef int probe_dtz(self, State state) noexcept
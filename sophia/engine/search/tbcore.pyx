@@ -0,0 +1,1170 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+
+import os
+import re
+
+from libc.stdlib cimport calloc, free
+from posix.fcntl cimport open as c_open, O_RDONLY
+from posix.unistd cimport close as c_close
+from posix.stat cimport struct_stat, fstat
+from posix.mman cimport mmap, munmap, posix_madvise, PROT_READ, MAP_SHARED, MAP_FAILED, POSIX_MADV_RANDOM
+
+from engine.board.state cimport State
+from engine.board.move_exec cimport make_move, unmake_move
+from engine.moves.generator cimport MoveList, generate_legal_move_list
+from engine.moves.legality cimport king_in_check
+from engine.core.bits cimport lsb, pop_lsb, popcount
+from engine.core.move cimport move_source, is_capture, is_en_passant
+from engine.core.constants import WHITE, BLACK, NULL as _NULL
+
+cdef int _WHITE = WHITE
+cdef int _BLACK = BLACK
+cdef int _NULL_SQ = _NULL
+
+# syzygy piece codes are 1..6 for pawn..king, + 8 for black; engine pieces are
+# type << 1 | white, with the king's type at 7
+cdef int _ENGINE_TYPE[7]
+_ENGINE_TYPE[:] = [0, 1, 2, 3, 4, 5, 7]
+
+cdef unsigned char _WDL_MAGIC[4]
+_WDL_MAGIC[:] = [0x71, 0xe8, 0x23, 0x5d]
+cdef unsigned char _DTZ_MAGIC[4]
+_DTZ_MAGIC[:] = [0xd7, 0x66, 0x0c, 0xa5]
+
+cdef int _WDL_TO_MAP[5]
+_WDL_TO_MAP[:] = [1, 3, 0, 2, 0]
+cdef int _PA_FLAGS[5]
+_PA_FLAGS[:] = [8, 0, 0, 0, 4]
+cdef int _WDL_TO_DTZ[5]
+_WDL_TO_DTZ[:] = [-1, -101, 0, 101, 1]
+
+# pivot counts for the leading group: three unique pieces, (unused), two kings
+cdef unsigned long long _PIVFAC[3]
+_PIVFAC[:] = [31332, 28056, 462]
+
+_TABLE_NAME = re.compile(r'^K[QRBNP]*vK[QRBNP]*$')
+_NAME_TYPES = {'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5}
+
+# the published syzygy index tables: the a1-d1-d4 triangle a leading piece is
+# mirrored into, squares below / on the a1-h8 diagonal, pawn squares by file
+# group, and the 462 legal king pairs
+TRIANGLE = (
+    6, 0, 1, 2, 2, 1, 0, 6,
+    0, 7, 3, 4, 4, 3, 7, 0,
+    1, 3, 8, 5, 5, 8, 3, 1,
+    2, 4, 5, 9, 9, 5, 4, 2,
+    2, 4, 5, 9, 9, 5, 4, 2,
+    1, 3, 8, 5, 5, 8, 3, 1,
+    0, 7, 3, 4, 4, 3, 7, 0,
+    6, 0, 1, 2, 2, 1, 0, 6,
+)
+
+LOWER = (
+    28,  0,  1,  2,  3,  4,  5,  6,
+     0, 29,  7,  8,  9, 10, 11, 12,
+     1,  7, 30, 13, 14, 15, 16, 17,
+     2,  8, 13, 31, 18, 19, 20, 21,
+     3,  9, 14, 18, 32, 22, 23, 24,
+     4, 10, 15, 19, 22, 33, 25, 26,
+     5, 11, 16, 20, 23, 25, 34, 27,
+     6, 12, 17, 21, 24, 26, 27, 35,
+)
+
+DIAG = (
+     0,  0,  0,  0,  0,  0,  0,  8,
+     0,  1,  0,  0,  0,  0,  9,  0,
+     0,  0,  2,  0,  0, 10,  0,  0,
+     0,  0,  0,  3, 11,  0,  0,  0,
+     0,  0,  0, 12,  4,  0,  0,  0,
+     0,  0, 13,  0,  0,  5,  0,  0,
+     0, 14,  0,  0,  0,  0,  6,  0,
+    15,  0,  0,  0,  0,  0,  0,  7,
+)
+
+FLAP = (
+     0,  0,  0,  0,  0,  0,  0,  0,
+     0,  6, 12, 18, 18, 12,  6,  0,
+     1,  7, 13, 19, 19, 13,  7,  1,
+     2,  8, 14, 20, 20, 14,  8,  2,
+     3,  9, 15, 21, 21, 15,  9,  3,
+     4, 10, 16, 22, 22, 16, 10,  4,
+     5, 11, 17, 23, 23, 17, 11,  5,
+     0,  0,  0,  0,  0,  0,  0,  0,
+)
+
+PTWIST = (
+     0,  0,  0,  0,  0,  0,  0,  0,
+    47, 35, 23, 11, 10, 22, 34, 46,
+    45, 33, 21,  9,  8, 20, 32, 44,
+    43, 31, 19,  7,  6, 18, 30, 42,
+    41, 29, 17,  5,  4, 16, 28, 40,
+    39, 27, 15,  3,  2, 14, 26, 38,
+    37, 25, 13,  1,  0, 12, 24, 36,
+     0,  0,  0,  0,  0,  0,  0,  0,
+)
+
+INVFLAP = (
+     8, 16, 24, 32, 40, 48,
+     9, 17, 25, 33, 41, 49,
+    10, 18, 26, 34, 42, 50,
+    11, 19, 27, 35, 43, 51,
+)
+
+KK_IDX = (
+    # 0
+     -1,  -1,  -1,   0,   1,   2,   3,   4,
+     -1,  -1,  -1,   5,   6,   7,   8,   9,
+     10,  11,  12,  13,  14,  15,  16,  17,
+     18,  19,  20,  21,  22,  23,  24,  25,
+     26,  27,  28,  29,  30,  31,  32,  33,
+     34,  35,  36,  37,  38,  39,  40,  41,
+     42,  43,  44,  45,  46,  47,  48,  49,
+     50,  51,  52,  53,  54,  55,  56,  57,
+    # 1
+     58,  -1,  -1,  -1,  59,  60,  61,  62,
+     63,  -1,  -1,  -1,  64,  65,  66,  67,
+     68,  69,  70,  71,  72,  73,  74,  75,
+     76,  77,  78,  79,  80,  81,  82,  83,
+     84,  85,  86,  87,  88,  89,  90,  91,
+     92,  93,  94,  95,  96,  97,  98,  99,
+    100, 101, 102, 103, 104, 105, 106, 107,
+    108, 109, 110, 111, 112, 113, 114, 115,
+    # 2
+    116, 117,  -1,  -1,  -1, 118, 119, 120,
+    121, 122,  -1,  -1,  -1, 123, 124, 125,
+    126, 127, 128, 129, 130, 131, 132, 133,
+    134, 135, 136, 137, 138, 139, 140, 141,
+    142, 143, 144, 145, 146, 147, 148, 149,
+    150, 151, 152, 153, 154, 155, 156, 157,
+    158, 159, 160, 161, 162, 163, 164, 165,
+    166, 167, 168, 169, 170, 171, 172, 173,
+    # 3
+    174,  -1,  -1,  -1, 175, 176, 177, 178,
+    179,  -1,  -1,  -1, 180, 181, 182, 183,
+    184,  -1,  -1,  -1, 185, 186, 187, 188,
+    189, 190, 191, 192, 193, 194, 195, 196,
+    197, 198, 199, 200, 201, 202, 203, 204,
+    205, 206, 207, 208, 209, 210, 211, 212,
+    213, 214, 215, 216, 217, 218, 219, 220,
+    221, 222, 223, 224, 225, 226, 227, 228,
+    # 4
+    229, 230,  -1,  -1,  -1, 231, 232, 233,
+    234, 235,  -1,  -1,  -1, 236, 237, 238,
+    239, 240,  -1,  -1,  -1, 241, 242, 243,
+    244, 245, 246, 247, 248, 249, 250, 251,
+    252, 253, 254, 255, 256, 257, 258, 259,
+    260, 261, 262, 263, 264, 265, 266, 267,
+    268, 269, 270, 271, 272, 273, 274, 275,
+    276, 277, 278, 279, 280, 281, 282, 283,
+    # 5
+    284, 285, 286, 287, 288, 289, 290, 291,
+    292, 293,  -1,  -1,  -1, 294, 295, 296,
+    297, 298,  -1,  -1,  -1, 299, 300, 301,
+    302, 303,  -1,  -1,  -1, 304, 305, 306,
+    307, 308, 309, 310, 311, 312, 313, 314,
+    315, 316, 317, 318, 319, 320, 321, 322,
+    323, 324, 325, 326, 327, 328, 329, 330,
+    331, 332, 333, 334, 335, 336, 337, 338,
+    # 6
+     -1,  -1, 339, 340, 341, 342, 343, 344,
+     -1,  -1, 345, 346, 347, 348, 349, 350,
+     -1,  -1, 441, 351, 352, 353, 354, 355,
+     -1,  -1,  -1, 442, 356, 357, 358, 359,
+     -1,  -1,  -1,  -1, 443, 360, 361, 362,
+     -1,  -1,  -1,  -1,  -1, 444, 363, 364,
+     -1,  -1,  -1,  -1,  -1,  -1, 445, 365,
+     -1,  -1,  -1,  -1,  -1,  -1,  -1, 446,
+    # 7
+     -1,  -1,  -1, 366, 367, 368, 369, 370,
+     -1,  -1,  -1, 371, 372, 373, 374, 375,
+     -1,  -1,  -1, 376, 377, 378, 379, 380,
+     -1,  -1,  -1, 447, 381, 382, 383, 384,
+     -1,  -1,  -1,  -1, 448, 385, 386, 387,
+     -1,  -1,  -1,  -1,  -1, 449, 388, 389,
+     -1,  -1,  -1,  -1,  -1,  -1, 450, 390,
+     -1,  -1,  -1,  -1,  -1,  -1,  -1, 451,
+    # 8
+    452, 391, 392, 393, 394, 395, 396, 397,
+     -1,  -1,  -1,  -1, 398, 399, 400, 401,
+     -1,  -1,  -1,  -1, 402, 403, 404, 405,
+     -1,  -1,  -1,  -1, 406, 407, 408, 409,
+     -1,  -1,  -1,  -1, 453, 410, 411, 412,
+     -1,  -1,  -1,  -1,  -1, 454, 413, 414,
+     -1,  -1,  -1,  -1,  -1,  -1, 455, 415,
+     -1,  -1,  -1,  -1,  -1,  -1,  -1, 456,
+    # 9
+    457, 416, 417, 418, 419, 420, 421, 422,
+     -1, 458, 423, 424, 425, 426, 427, 428,
+     -1,  -1,  -1,  -1,  -1, 429, 430, 431,
+     -1,  -1,  -1,  -1,  -1, 432, 433, 434,
+     -1,  -1,  -1,  -1,  -1, 435, 436, 437,
+     -1,  -1,  -1,  -1,  -1, 459, 438, 439,
+     -1,  -1,  -1,  -1,  -1,  -1, 460, 440,
+     -1,  -1,  -1,  -1,  -1,  -1,  -1, 461,
+)
+
+cdef int _TRIANGLE[64]
+cdef int _LOWER[64]
+cdef int _DIAG[64]
+cdef int _FLAP[64]
+cdef int _PTWIST[64]
+cdef int _INVFLAP[24]
+cdef int _KK_IDX[10][64]
+cdef unsigned long long _BINOM[TB_PIECES][64]
+cdef unsigned long long _PAWNIDX[5][24]
+cdef unsigned long long _PFACTOR[5][4]
+cdef int _FILE_TO_FILE[8]
+
+
+cdef void _init_tables():
+    cdef int i, j, k, f
+    cdef unsigned long long s
+    for i in range(64):
+        _TRIANGLE[i] = TRIANGLE[i]
+        _LOWER[i] = LOWER[i]
+        _DIAG[i] = DIAG[i]
+        _FLAP[i] = FLAP[i]
+        _PTWIST[i] = PTWIST[i]
+    for i in range(24):
+        _INVFLAP[i] = INVFLAP[i]
+    for i in range(10):
+        for j in range(64):
+            _KK_IDX[i][j] = KK_IDX[64 * i + j]
+    for i in range(8):
+        _FILE_TO_FILE[i] = i if i < 4 else 7 - i
+
+    # _BINOM[k][n] = n choose k, 0 when k > n
+    for k in range(TB_PIECES):
+        for j in range(64):
+            s = 1 if k == 0 else 0
+            if k > 0 and j >= k:
+                s = 1
+                for i in range(k):
+                    s = s * (j - i) // (i + 1)
+            _BINOM[k][j] = s
+
+    # leading pawns: index offset of each flap square within its file group
+    for i in range(5):
+        j = 0
+        for f in range(4):
+            s = 0
+            for k in range(6):
+                _PAWNIDX[i][j] = s
+                s += 1 if i == 0 else _BINOM[i][_PTWIST[_INVFLAP[j]]]
+                j += 1
+            _PFACTOR[i][f] = s
+
+
+_init_tables()
+
+
+cdef inline unsigned int _u16(const unsigned char* p) noexcept nogil:
+    return p[0] | (<unsigned int>p[1] << 8)
+
+
+cdef inline unsigned int _u32(const unsigned char* p) noexcept nogil:
+    return p[0] | (<unsigned int>p[1] << 8) | (<unsigned int>p[2] << 16) | (<unsigned int>p[3] << 24)
+
+
+cdef inline unsigned int _u32_be(const unsigned char* p) noexcept nogil:
+    return (<unsigned int>p[0] << 24) | (<unsigned int>p[1] << 16) | (<unsigned int>p[2] << 8) | p[3]
+
+
+cdef inline unsigned long long _u64_be(const unsigned char* p) noexcept nogil:
+    return (<unsigned long long>_u32_be(p) << 32) | _u32_be(p + 4)
+
+
+cdef inline int _offdiag(int sq) noexcept nogil:
+    return (sq >> 3) - (sq & 7)
+
+
+cdef inline int _flipdiag(int sq) noexcept nogil:
+    return ((sq >> 3) | (sq << 3)) & 63
+
+
+cdef inline unsigned long long _subfactor(int k, int n) noexcept nogil:
+    return _BINOM[k][n]
+
+
+cdef inline unsigned long long _name_key(str white, str black):
+    """material key of a table name's two sides, kings left out"""
+    cdef unsigned long long key = 0
+    cdef int piece_type
+    for c, piece_type in _NAME_TYPES.items():
+        key += <unsigned long long>white.count(c) << (4 * ((piece_type << 1 | 1) - 2))
+        key += <unsigned long long>black.count(c) << (4 * ((piece_type << 1) - 2))
+    return key
+
+
+cdef inline unsigned long long _pieces_key(const unsigned char* pieces, int num, bint mirror) noexcept:
+    """material key from a table header's piece codes"""
+    cdef unsigned long long key = 0
+    cdef int i, piece_type, white
+    for i in range(num):
+        piece_type = pieces[i] & 7
+        if piece_type == 6: continue
+        white = (pieces[i] >> 3) == mirror
+        key += 1ULL << (4 * ((_ENGINE_TYPE[piece_type] << 1 | white) - 2))
+    return key
+
+
+cdef inline unsigned long long _position_key(State state) noexcept:
+    """material key of the position, 4 bits per piece kind, pawns to queens of both colours"""
+    cdef unsigned long long key = 0
+    cdef int piece
+    for piece in range(2, 12):
+        key += <unsigned long long>popcount(state.bitboards[piece]) << (4 * (piece - 2))
+    return key
+
+
+# --- table setup: a port of the reference layout (Ronald de Man's tbcore) ---
+
+cdef void _calc_symlen(const unsigned char* data, PairsData* d, int s, unsigned char* done) noexcept:
+    cdef long long w = d.sympat + 3 * s
+    cdef int s1, s2 = (data[w + 2] << 4) | (data[w + 1] >> 4)
+    if s2 == 0x0fff:
+        d.symlen[s] = 0
+    else:
+        s1 = ((data[w + 1] & 0xf) << 8) | data[w]
+        if not done[s1]: _calc_symlen(data, d, s1, done)
+        if not done[s2]: _calc_symlen(data, d, s2, done)
+        d.symlen[s] = d.symlen[s1] + d.symlen[s2] + 1
+    done[s] = 1
+
+
+cdef long long _setup_pairs(TBTable* t, PairsData* d, long long ptr, unsigned long long tb_size,
+                            long long* sizes, int* flags, bint wdl) noexcept:
+    """read one pairs header at ptr; fills sizes with the index, size and data
+    table lengths and returns the offset after the header, or -1 on failure"""
+    cdef const unsigned char* data = t.data
+    cdef int i, h, num_syms, max_len, min_len
+    cdef long long real_num_blocks, num_blocks, num_indices
+    cdef unsigned char* done
+
+    flags[0] = data[ptr]
+    if data[ptr] & 0x80:
+        d.idxbits = 0
+        d.min_len = data[ptr + 1] if wdl else 0
+        sizes[0] = sizes[1] = sizes[2] = 0
+        return ptr + 2
+
+    d.blocksize = data[ptr + 1]
+    d.idxbits = data[ptr + 2]
+    real_num_blocks = _u32(data + ptr + 4)
+    num_blocks = real_num_blocks + data[ptr + 3]
+    max_len = data[ptr + 8]
+    min_len = data[ptr + 9]
+    h = max_len - min_len + 1
+    num_syms = _u16(data + ptr + 10 + 2 * h)
+
+    d.offset = ptr + 10
+    d.sympat = ptr + 12 + 2 * h
+    d.min_len = min_len
+
+    num_indices = (tb_size + (1ULL << d.idxbits) - 1) >> d.idxbits
+    sizes[0] = 6 * num_indices
+    sizes[1] = 2 * num_blocks
+    sizes[2] = (1LL << d.blocksize) * real_num_blocks
+
+    d.symlen = <int*>calloc(num_syms, sizeof(int))
+    d.base = <unsigned long long*>calloc(h, sizeof(unsigned long long))
+    done = <unsigned char*>calloc(num_syms, 1)
+    if not d.symlen or not d.base or not done:
+        free(done)
+        return -1
+    for i in range(num_syms):
+        if not done[i]: _calc_symlen(data, d, i, done)
+    free(done)
+
+    d.base[h - 1] = 0
+    for i in range(h - 2, -1, -1):
+        d.base[i] = (d.base[i + 1] + _u16(data + d.offset + 2 * i) - _u16(data + d.offset + 2 * i + 2)) // 2
+    for i in range(h):
+        d.base[i] <<= 64 - (min_len + i)
+    d.offset -= 2 * d.min_len
+
+    return ptr + 12 + 2 * h + 3 * num_syms + (num_syms & 1)
+
+
+cdef void _set_norm_piece(TBTable* t, unsigned char* norm, const unsigned char* pieces) noexcept:
+    cdef int i, j
+    norm[0] = 3 if t.enc_type == 0 else 2
+    i = norm[0]
+    while i < t.num:
+        j = i
+        while j < t.num and pieces[j] == pieces[i]:
+            norm[i] += 1
+            j += 1
+        i += norm[i]
+
+
+cdef void _set_norm_pawn(TBTable* t, unsigned char* norm, const unsigned char* pieces) noexcept:
+    cdef int i, j
+    norm[0] = t.pawns[0]
+    if t.pawns[1]: norm[t.pawns[0]] = t.pawns[1]
+    i = t.pawns[0] + t.pawns[1]
+    while i < t.num:
+        j = i
+        while j < t.num and pieces[j] == pieces[i]:
+            norm[i] += 1
+            j += 1
+        i += norm[i]
+
+
+cdef unsigned long long _calc_factors_piece(TBTable* t, unsigned long long* factor, int order,
+                                             const unsigned char* norm) noexcept:
+    cdef unsigned long long f = 1
+    cdef int n = 64 - norm[0], i = norm[0], k = 0
+    while i < t.num or k == order:
+        if k == order:
+            factor[0] = f
+            f *= _PIVFAC[t.enc_type]
+        else:
+            factor[i] = f
+            f *= _subfactor(norm[i], n)
+            n -= norm[i]
+            i += norm[i]
+        k += 1
+    return f
+
+
+cdef unsigned long long _calc_factors_pawn(TBTable* t, unsigned long long* factor, int order, int order2,
+                                            const unsigned char* norm, int file) noexcept:
+    cdef unsigned long long f = 1
+    cdef int i = norm[0], n, k = 0
+    if order2 < 0x0f: i += norm[i]
+    n = 64 - i
+    while i < t.num or k == order or k == order2:
+        if k == order:
+            factor[0] = f
+            f *= _PFACTOR[norm[0] - 1][file]
+        elif k == order2:
+            factor[norm[0]] = f
+            f *= _subfactor(norm[norm[0]], 48 - norm[0])
+        else:
+            factor[i] = f
+            f *= _subfactor(norm[i], n)
+            n -= norm[i]
+            i += norm[i]
+        k += 1
+    return f
+
+
+cdef unsigned long long _setup_side_piece(TBTable* t, long long ptr, int side) noexcept:
+    cdef int i, shift = 4 * side
+    for i in range(t.num):
+        t.pieces[0][side][i] = (t.data[ptr + i + 1] >> shift) & 0x0f
+    _set_norm_piece(t, t.norm[0][side], t.pieces[0][side])
+    return _calc_factors_piece(t, t.factor[0][side], (t.data[ptr] >> shift) & 0x0f, t.norm[0][side])
+
+
+cdef unsigned long long _setup_side_pawn(TBTable* t, long long ptr, int file, int side) noexcept:
+    cdef int i, shift = 4 * side
+    cdef int j = 1 + (t.pawns[1] > 0)
+    cdef int order = (t.data[ptr] >> shift) & 0x0f
+    cdef int order2 = (t.data[ptr + 1] >> shift) & 0x0f if t.pawns[1] else 0x0f
+    for i in range(t.num):
+        t.pieces[file][side][i] = (t.data[ptr + i + j] >> shift) & 0x0f
+    _set_norm_pawn(t, t.norm[file][side], t.pieces[file][side])
+    return _calc_factors_pawn(t, t.factor[file][side], order, order2, t.norm[file][side], file)
+
+
+cdef bint _init_wdl(TBTable* t) noexcept:
+    cdef const unsigned char* data = t.data
+    cdef unsigned long long tb_size[8]
+    cdef long long size[24]
+    cdef long long ptr = 5
+    cdef int f, s, flags
+    cdef bint split = data[4] & 0x01
+
+    t.files = 4 if data[4] & 0x02 else 1
+    t.sides = 2 if split else 1
+    if t.has_pawns and t.files != 4: return False
+
+    if not t.has_pawns:
+        for s in range(t.sides):
+            tb_size[s] = _setup_side_piece(t, ptr, s)
+        ptr += t.num + 1
+        ptr += ptr & 0x01
+        for s in range(t.sides):
+            ptr = _setup_pairs(t, &t.precomp[0][s], ptr, tb_size[s], &size[3 * s], &flags, True)
+            if ptr < 0: return False
+        for s in range(t.sides):
+            t.precomp[0][s].indextable = ptr
+            ptr += size[3 * s]
+        for s in range(t.sides):
+            t.precomp[0][s].sizetable = ptr
+            ptr += size[3 * s + 1]
+        for s in range(t.sides):
+            ptr = (ptr + 0x3f) & ~0x3f
+            t.precomp[0][s].data = ptr
+            ptr += size[3 * s + 2]
+
+        # some files are stored under a different key than their name says
+        t.key = _pieces_key(t.pieces[0][0], t.num, False)
+        t.mirrored_key = _pieces_key(t.pieces[0][0], t.num, True)
+    else:
+        for f in range(4):
+            for s in range(2):
+                tb_size[2 * f + s] = _setup_side_pawn(t, ptr, f, s)
+            ptr += t.num + 1 + (t.pawns[1] > 0)
+        ptr += ptr & 0x01
+        for f in range(4):
+            for s in range(t.sides):
+                ptr = _setup_pairs(t, &t.precomp[f][s], ptr, tb_size[2 * f + s], &size[6 * f + 3 * s], &flags, True)
+                if ptr < 0: return False
+        for f in range(4):
+            for s in range(t.sides):
+                t.precomp[f][s].indextable = ptr
+                ptr += size[6 * f + 3 * s]
+        for f in range(4):
+            for s in range(t.sides):
+                t.precomp[f][s].sizetable = ptr
+                ptr += size[6 * f + 3 * s + 1]
+        for f in range(4):
+            for s in range(t.sides):
+                ptr = (ptr + 0x3f) & ~0x3f
+                t.precomp[f][s].data = ptr
+                ptr += size[6 * f + 3 * s + 2]
+    return True
+
+
+cdef bint _init_dtz(TBTable* t) noexcept:
+    cdef const unsigned char* data = t.data
+    cdef unsigned long long tb_size[4]
+    cdef long long size[12]
+    cdef long long ptr = 5
+    cdef int f, i
+
+    t.files = 4 if data[4] & 0x02 else 1
+    t.sides = 1
+    if t.has_pawns and t.files != 4: return False
+
+    if not t.has_pawns:
+        tb_size[0] = _setup_side_piece(t, ptr, 0)
+        ptr += t.num + 1
+        ptr += ptr & 0x01
+    else:
+        for f in range(4):
+            tb_size[f] = _setup_side_pawn(t, ptr, f, 0)
+            ptr += t.num + 1 + (t.pawns[1] > 0)
+        ptr += ptr & 0x01
+
+    for f in range(t.files):
+        ptr = _setup_pairs(t, &t.precomp[f][0], ptr, tb_size[f], &size[3 * f], &t.flags[f], False)
+        if ptr < 0: return False
+
+    t.p_map = ptr
+    for f in range(t.files):
+        if t.flags[f] & 2:
+            if not t.flags[f] & 16:
+                for i in range(4):
+                    t.map_idx[f][i] = ptr + 1 - t.p_map
+                    ptr += 1 + data[ptr]
+            else:
+                ptr += ptr & 0x01
+                for i in range(4):
+                    t.map_idx[f][i] = (ptr + 2 - t.p_map) // 2
+                    ptr += 2 + 2 * _u16(data + ptr)
+    ptr += ptr & 0x01
+
+    for f in range(t.files):
+        t.precomp[f][0].indextable = ptr
+        ptr += size[3 * f]
+    for f in range(t.files):
+        t.precomp[f][0].sizetable = ptr
+        ptr += size[3 * f + 1]
+    for f in range(t.files):
+        ptr = (ptr + 0x3f) & ~0x3f
+        t.precomp[f][0].data = ptr
+        ptr += size[3 * f + 2]
+
+    if not t.has_pawns:
+        t.key = _pieces_key(t.pieces[0][0], t.num, False)
+        t.mirrored_key = _pieces_key(t.pieces[0][0], t.num, True)
+    return True
+
+
+cdef bint _map_table(TBTable* t, bytes path) noexcept:
+    """memory-map a table file and read its headers; False if it can't be used"""
+    cdef int fd, i
+    cdef struct_stat st
+    cdef void* mapped
+    cdef const unsigned char* magic = _WDL_MAGIC
+    if t.is_dtz: magic = _DTZ_MAGIC
+
+    fd = c_open(path, O_RDONLY)
+    if fd < 0: return False
+    if fstat(fd, &st) != 0 or st.st_size % 64 != 16:
+        c_close(fd)
+        return False
+    mapped = mmap(NULL, st.st_size, PROT_READ, MAP_SHARED, fd, 0)
+    c_close(fd)
+    if mapped == MAP_FAILED: return False
+    posix_madvise(mapped, st.st_size, POSIX_MADV_RANDOM)
+
+    t.data = <const unsigned char*>mapped
+    t.size = st.st_size
+    for i in range(4):
+        if t.data[i] != magic[i]: return False
+    return _init_dtz(t) if t.is_dtz else _init_wdl(t)
+
+
+# --- indexing ---
+
+cdef unsigned long long _encode_piece(TBTable* t, const unsigned char* norm, int* pos,
+                                      const unsigned long long* factor) noexcept:
+    cdef int n = t.num, i, j, k, m, l, p, first_off
+    cdef unsigned long long idx, s
+
+    if pos[0] & 0x04:
+        for i in range(n): pos[i] ^= 0x07
+    if pos[0] & 0x20:
+        for i in range(n): pos[i] ^= 0x38
+
+    # mirror in the a1-h8 diagonal when the first piece off it is above it
+    first_off = n - 1
+    for i in range(n):
+        if _offdiag(pos[i]):
+            first_off = i
+            break
+    if first_off < (3 if t.enc_type == 0 else 2) and _offdiag(pos[first_off]) > 0:
+        for i in range(n): pos[i] = _flipdiag(pos[i])
+
+    if t.enc_type == 0:  # three unique pieces lead
+        i = pos[1] > pos[0]
+        j = (pos[2] > pos[0]) + (pos[2] > pos[1])
+        if _offdiag(pos[0]):
+            idx = _TRIANGLE[pos[0]] * 63 * 62 + (pos[1] - i) * 62 + (pos[2] - j)
+        elif _offdiag(pos[1]):
+            idx = 6 * 63 * 62 + _DIAG[pos[0]] * 28 * 62 + _LOWER[pos[1]] * 62 + pos[2] - j
+        elif _offdiag(pos[2]):
+            idx = 6 * 63 * 62 + 4 * 28 * 62 + _DIAG[pos[0]] * 7 * 28 + (_DIAG[pos[1]] - i) * 28 + _LOWER[pos[2]]
+        else:
+            idx = 6 * 63 * 62 + 4 * 28 * 62 + 4 * 7 * 28 + _DIAG[pos[0]] * 7 * 6 + (_DIAG[pos[1]] - i) * 6 + (_DIAG[pos[2]] - j)
+        i = 3
+    else:  # the two kings lead
+        idx = _KK_IDX[_TRIANGLE[pos[0]]][pos[1]]
+        i = 2
+
+    idx *= factor[0]
+    while i < n:
+        k = norm[i]
+        _sort(pos, i, i + k)
+        s = 0
+        for m in range(i, i + k):
+            p = pos[m]
+            j = 0
+            for l in range(i): j += p > pos[l]
+            s += _BINOM[m - i + 1][p - j]
+        idx += s * factor[i]
+        i += k
+    return idx
+
+
+cdef inline void _sort(int* pos, int start, int end) noexcept:
+    cdef int j, k, tmp
+    for j in range(start, end):
+        for k in range(j + 1, end):
+            if pos[j] > pos[k]:
+                tmp = pos[j]; pos[j] = pos[k]; pos[k] = tmp
+
+
+cdef int _pawn_file(TBTable* t, int* pos) noexcept:
+    cdef int i, tmp
+    for i in range(1, t.pawns[0]):
+        if _FLAP[pos[0]] > _FLAP[pos[i]]:
+            tmp = pos[0]; pos[0] = pos[i]; pos[i] = tmp
+    return _FILE_TO_FILE[pos[0] & 0x07]
+
+
+cdef unsigned long long _encode_pawn(TBTable* t, const unsigned char* norm, int* pos,
+                                     const unsigned long long* factor) noexcept:
+    cdef int n = t.num, i, j, k, m, p, lead, tmp
+    cdef unsigned long long idx, s
+
+    if pos[0] & 0x04:
+        for i in range(n): pos[i] ^= 0x07
+
+    for i in range(1, t.pawns[0]):
+        for j in range(i + 1, t.pawns[0]):
+            if _PTWIST[pos[i]] < _PTWIST[pos[j]]:
+                tmp = pos[i]; pos[i] = pos[j]; pos[j] = tmp
+
+    lead = t.pawns[0] - 1
+    idx = _PAWNIDX[lead][_FLAP[pos[0]]]
+    for i in range(lead, 0, -1):
+        idx += _BINOM[lead - i + 1][_PTWIST[pos[i]]]
+    idx *= factor[0]
+
+    # the other side's pawns
+    i = t.pawns[0]
+    k = i + t.pawns[1]
+    if k > i:
+        _sort(pos, i, k)
+        s = 0
+        for m in range(i, k):
+            p = pos[m]
+            j = 0
+            for tmp in range(i): j += p > pos[tmp]
+            s += _BINOM[m - i + 1][p - j - 8]
+        idx += s * factor[i]
+        i = k
+
+    while i < n:
+        k = norm[i]
+        _sort(pos, i, i + k)
+        s = 0
+        for m in range(i, i + k):
+            p = pos[m]
+            j = 0
+            for tmp in range(i): j += p > pos[tmp]
+            s += _BINOM[m - i + 1][p - j]
+        idx += s * factor[i]
+        i += k
+    return idx
+
+
+cdef int _decompress_pairs(TBTable* t, PairsData* d, unsigned long long idx) noexcept:
+    cdef const unsigned char* data = t.data
+    cdef unsigned long long mainidx, code, block
+    cdef long long litidx, ptr, w
+    cdef int m, l, sym, s1, bitcnt
+
+    if not d.idxbits: return d.min_len
+
+    mainidx = idx >> d.idxbits
+    litidx = <long long>(idx & ((1ULL << d.idxbits) - 1)) - (1LL << (d.idxbits - 1))
+    block = _u32(data + d.indextable + 6 * mainidx)
+    litidx += _u16(data + d.indextable + 6 * mainidx + 4)
+
+    if litidx < 0:
+        while litidx < 0:
+            block -= 1
+            litidx += _u16(data + d.sizetable + 2 * block) + 1
+    else:
+        while litidx > _u16(data + d.sizetable + 2 * block):
+            litidx -= _u16(data + d.sizetable + 2 * block) + 1
+            block += 1
+
+    ptr = d.data + (block << d.blocksize)
+    m = d.min_len
+    code = _u64_be(data + ptr)
+    ptr += 8
+    bitcnt = 0  # bits of code used up since the last refill
+    while True:
+        l = m
+        while code < d.base[l - m]: l += 1
+        sym = _u16(data + d.offset + 2 * l)
+        sym += <int>((code - d.base[l - m]) >> (64 - l))
+        if litidx < d.symlen[sym] + 1: break
+        litidx -= d.symlen[sym] + 1
+        code <<= l
+        bitcnt += l
+        if bitcnt >= 32:
+            bitcnt -= 32
+            code |= <unsigned long long>_u32_be(data + ptr) << bitcnt
+            ptr += 4
+
+    while d.symlen[sym]:
+        w = d.sympat + 3 * sym
+        s1 = ((data[w + 1] & 0xf) << 8) | data[w]
+        if litidx < d.symlen[s1] + 1:
+            sym = s1
+        else:
+            litidx -= d.symlen[s1] + 1
+            sym = (data[w + 2] << 4) | (data[w + 1] >> 4)
+
+    w = d.sympat + 3 * sym
+    if t.is_dtz: return ((data[w + 1] & 0x0f) << 8) | data[w]
+    return data[w]
+
+
+cdef inline int _gather(State state, const unsigned char* pieces, int start, int num, int cmirror,
+                        int mirror, int* pos) noexcept:
+    """squares of pieces[start:num] into pos, one run of identical pieces per bitboard"""
+    cdef int i = start, code
+    cdef unsigned long long bb
+    while i < num:
+        code = pieces[i]
+        bb = state.bitboards[_ENGINE_TYPE[code & 7] << 1 | (((code ^ cmirror) >> 3) ^ 1)]
+        if not bb: return i
+        while bb and i < TB_PIECES:
+            pos[i] = lsb(bb) ^ mirror
+            bb = pop_lsb(bb)
+            i += 1
+    return i
+
+
+# --- move-level probing: resolves captures and en passant like the reference prober ---
+
+cdef inline int _dtz_before_zeroing(int wdl) noexcept:
+    return ((wdl > 0) - (wdl < 0)) * (1 if wdl == 2 or wdl == -2 else 101)
+
+
+cdef inline bint _is_pawn_move(State state, unsigned int move) noexcept:
+    return state.board[move_source(move)] >> 1 == 1
+
+
+cdef bint _only_en_passant(MoveList* moves) noexcept:
+    cdef int i
+    for i in range(moves.count):
+        if not is_en_passant(moves.moves[i]): return False
+    return True
+
+
+cdef class SyzygyTables:
+    """
+    syzygy wdl (.rtbw) and dtz (.rtbz) tables read natively: files are
+    registered by name up front and memory-mapped on their first probe, and a
+    position is indexed straight from the bitboards. probes return TB_FAIL when
+    a table they need is missing or unreadable
+    """
+
+    def __cinit__(self, path):
+        cdef int n
+        cdef TBTable* t
+        cdef str name, ext, white, black
+
+        self.path = path
+        self.paths = []
+        self.count = 0
+        self.max_pieces = 0
+
+        names = []
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                name, ext = os.path.splitext(filename)
+                if ext in ('.rtbw', '.rtbz') and _TABLE_NAME.match(name) and len(name) - 1 <= TB_PIECES:
+                    names.append((name, ext == '.rtbz', os.path.join(path, filename)))
+
+        n = 1
+        while n < 4 * len(names) + 4: n <<= 1
+        self.slot_mask = n - 1
+        self.tables = <TBTable*>calloc(max(1, len(names)), sizeof(TBTable))
+        self.wdl_slots = <TBSlot*>calloc(n, sizeof(TBSlot))
+        self.dtz_slots = <TBSlot*>calloc(n, sizeof(TBSlot))
+        if not self.tables or not self.wdl_slots or not self.dtz_slots:
+            raise MemoryError("SyzygyTables: failed to allocate the table index")
+
+        for name, is_dtz, file_path in names:
+            t = &self.tables[self.count]
+            white, black = name.split('v')
+            t.is_dtz = is_dtz
+            t.num = len(name) - 1
+            t.key = _name_key(white, black)
+            t.mirrored_key = _name_key(black, white)
+            t.symmetric = t.key == t.mirrored_key
+            t.has_pawns = 'P' in name
+            if t.has_pawns:
+                # the leading pawns are the side with fewer, if it has any
+                t.pawns[0] = black.count('P')
+                t.pawns[1] = white.count('P')
+                if t.pawns[1] > 0 and (t.pawns[0] == 0 or t.pawns[1] < t.pawns[0]):
+                    t.pawns[0], t.pawns[1] = t.pawns[1], t.pawns[0]
+            else:
+                unique = sum((white.count(c) == 1) + (black.count(c) == 1) for c in 'KQRBN')
+                t.enc_type = 0 if unique >= 3 else 2
+
+            self._insert(self.dtz_slots if is_dtz else self.wdl_slots, t.key, self.count)
+            self._insert(self.dtz_slots if is_dtz else self.wdl_slots, t.mirrored_key, self.count)
+            self.paths.append(os.fsencode(file_path))
+            if not is_dtz: self.max_pieces = max(self.max_pieces, t.num)
+            self.count += 1
+
+    def __dealloc__(self):
+        self.close()
+        free(self.tables)
+        free(self.wdl_slots)
+        free(self.dtz_slots)
+
+    def close(self):
+        """unmap every table; they are mapped again on their next probe"""
+        cdef int i, f, s
+        cdef TBTable* t
+        for i in range(self.count):
+            t = &self.tables[i]
+            for f in range(4):
+                for s in range(2):
+                    free(t.precomp[f][s].symlen)
+                    free(t.precomp[f][s].base)
+                    t.precomp[f][s].symlen = NULL
+                    t.precomp[f][s].base = NULL
+            if t.data: munmap(<void*>t.data, t.size)
+            t.data = NULL
+            t.state = 0
+
+    cdef void _insert(self, TBSlot* slots, unsigned long long key, int table):
+        cdef unsigned long long i = (key * 0x9E3779B97F4A7C15ULL) >> 32
+        while True:
+            i &= self.slot_mask
+            if slots[i].key == 0 or slots[i].key == key:
+                slots[i].key = key
+                slots[i].table = table
+                return
+            i += 1
+
+    cdef TBTable* _find(self, TBSlot* slots, unsigned long long key) noexcept:
+        """the table for a material key, mapped on first use; NULL if there is none"""
+        cdef unsigned long long i = (key * 0x9E3779B97F4A7C15ULL) >> 32
+        cdef TBTable* t
+        while True:
+            i &= self.slot_mask
+            if slots[i].key == 0: return NULL
+            if slots[i].key == key: break
+            i += 1
+        t = &self.tables[slots[i].table]
+        if t.state == 0:
+            t.state = 1 if _map_table(t, self.paths[slots[i].table]) else -1
+        return t if t.state == 1 else NULL
+
+    cdef int _side(self, TBTable* t, State state, unsigned long long key, int* cmirror, int* mirror) noexcept:
+        """which stored side the position reads from, and how to colour-flip into it"""
+        if t.symmetric:
+            cmirror[0] = 0 if state.is_white else 8
+            mirror[0] = 0 if state.is_white else 0x38
+            return 0
+        if key != t.key:
+            cmirror[0] = 8
+            mirror[0] = 0x38
+            return state.is_white
+        cmirror[0] = mirror[0] = 0
+        return not state.is_white
+
+    cdef int _wdl_table(self, State state) noexcept:
+        """wdl of the position as stored, captures not resolved"""
+        cdef unsigned long long key
+        cdef TBTable* t
+        cdef int pos[TB_PIECES]
+        cdef int bside, cmirror, mirror, i, f
+        cdef unsigned long long idx
+
+        if popcount(state.bitboards[_WHITE] | state.bitboards[_BLACK]) == 2: return 0
+        key = _position_key(state)
+        t = self._find(self.wdl_slots, key)
+        if t == NULL: return TB_FAIL
+
+        bside = self._side(t, state, key, &cmirror, &mirror)
+        if bside >= t.sides: return TB_FAIL
+        if not t.has_pawns:
+            if _gather(state, t.pieces[0][bside], 0, t.num, cmirror, 0, pos) != t.num: return TB_FAIL
+            idx = _encode_piece(t, t.norm[0][bside], pos, t.factor[0][bside])
+            return _decompress_pairs(t, &t.precomp[0][bside], idx) - 2
+
+        i = _gather(state, t.pieces[0][0], 0, t.pawns[0], cmirror, mirror, pos)
+        if i != t.pawns[0]: return TB_FAIL
+        f = _pawn_file(t, pos)
+        if _gather(state, t.pieces[f][bside], i, t.num, cmirror, mirror, pos) != t.num: return TB_FAIL
+        idx = _encode_pawn(t, t.norm[f][bside], pos, t.factor[f][bside])
+        return _decompress_pairs(t, &t.precomp[f][bside], idx) - 2
+
+    cdef int _dtz_table(self, State state, int wdl, int* success) noexcept:
+        """dtz of the position as stored; success is -1 if the table holds the other side to move"""
+        cdef unsigned long long key = _position_key(state)
+        cdef TBTable* t = self._find(self.dtz_slots, key)
+        cdef int pos[TB_PIECES]
+        cdef int bside, cmirror, mirror, i, f = 0, res
+        cdef unsigned long long idx
+
+        success[0] = 1
+        if t == NULL: return TB_FAIL
+
+        bside = self._side(t, state, key, &cmirror, &mirror)
+        if not t.has_pawns:
+            if (t.flags[0] & 1) != bside and not t.symmetric:
+                success[0] = -1
+                return 0
+            if _gather(state, t.pieces[0][0], 0, t.num, cmirror, 0, pos) != t.num: return TB_FAIL
+            idx = _encode_piece(t, t.norm[0][0], pos, t.factor[0][0])
+        else:
+            i = _gather(state, t.pieces[0][0], 0, t.pawns[0], cmirror, mirror, pos)
+            if i != t.pawns[0]: return TB_FAIL
+            f = _pawn_file(t, pos)
+            if (t.flags[f] & 1) != bside:
+                success[0] = -1
+                return 0
+            if _gather(state, t.pieces[f][0], i, t.num, cmirror, mirror, pos) != t.num: return TB_FAIL
+            idx = _encode_pawn(t, t.norm[f][0], pos, t.factor[f][0])
+
+        res = _decompress_pairs(t, &t.precomp[f][0], idx)
+        if t.flags[f] & 2:
+            if not t.flags[f] & 16:
+                res = t.data[t.p_map + t.map_idx[f][_WDL_TO_MAP[wdl + 2]] + res]
+            else:
+                res = _u16(t.data + t.p_map + 2 * (t.map_idx[f][_WDL_TO_MAP[wdl + 2]] + res))
+        if not (t.flags[f] & _PA_FLAGS[wdl + 2]) or (wdl & 1):
+            res *= 2
+        return res
+
+    cdef int _probe_ab(self, State state, int alpha, int beta, int* success) noexcept:
+        """wdl with captures searched out; success 2 when a capture decided it"""
+        cdef MoveList moves
+        cdef unsigned int move
+        cdef int i, v, child
+
+        if popcount(state.bitboards[_WHITE] | state.bitboards[_BLACK]) > TB_PIECES + 1: return TB_FAIL
+
+        generate_legal_move_list(state, &moves, True)
+        for i in range(moves.count):
+            move = moves.moves[i]
+            if not is_capture(move) or is_en_passant(move): continue
+            make_move(state, move)
+            v = self._probe_ab(state, -beta, -alpha, &child)
+            unmake_move(state, move)
+            if v == TB_FAIL: return TB_FAIL
+            v = -v
+            if v > alpha:
+                if v >= beta:
+                    success[0] = 2
+                    return v
+                alpha = v
+
+        v = self._wdl_table(state)
+        if v == TB_FAIL: return TB_FAIL
+        if alpha >= v:
+            success[0] = 1 + (alpha > 0)
+            return alpha
+        success[0] = 1
+        return v
+
+    cdef int _best_en_passant(self, State state, MoveList* moves) noexcept:
+        """best wdl over the legal en passant captures, -3 if there are none"""
+        cdef int i, v, best = -3, success
+        cdef unsigned int move
+        for i in range(moves.count):
+            move = moves.moves[i]
+            if not is_en_passant(move): continue
+            make_move(state, move)
+            v = self._probe_ab(state, -2, 2, &success)
+            unmake_move(state, move)
+            if v == TB_FAIL: return TB_FAIL
+            if -v > best: best = -v
+        return best
+
+    cdef int probe_wdl(self, State state) noexcept:
+        """
+        2 win, 1 cursed win, 0 draw, -1 blessed loss, -2 loss for the side to
+        move, as if the last move zeroed the fifty-move counter
+        """
+        cdef MoveList moves
+        cdef int v, v1, success
+
+        v = self._probe_ab(state, -2, 2, &success)
+        if v == TB_FAIL or state.en_passant_square == _NULL_SQ: return v
+
+        generate_legal_move_list(state, &moves, False)
+        v1 = self._best_en_passant(state, &moves)
+        if v1 == TB_FAIL: return TB_FAIL
+        if v1 > -3:
+            if v1 >= v: v = v1
+            elif v == 0 and _only_en_passant(&moves): v = v1
+        return v
+
+    cdef int _probe_dtz_no_ep(self, State state) noexcept:
+        cdef MoveList moves
+        cdef unsigned int move
+        cdef int i, v, wdl, dtz, success, best
+
+        wdl = self._probe_ab(state, -2, 2, &success)
+        if wdl == TB_FAIL or wdl == 0: return wdl
+        if success == 2: return _dtz_before_zeroing(wdl)
+
+        generate_legal_move_list(state, &moves, False)
+        if wdl > 0:
+            # a pawn push that keeps the win zeroes the counter at once
+            for i in range(moves.count):
+                move = moves.moves[i]
+                if is_capture(move) or not _is_pawn_move(state, move): continue
+                make_move(state, move)
+                v = self.probe_wdl(state)
+                unmake_move(state, move)
+                if v == TB_FAIL: return TB_FAIL
+                if -v == wdl: return 1 if wdl == 2 else 101
+
+        dtz = self._dtz_table(state, wdl, &success)
+        if dtz == TB_FAIL: return TB_FAIL
+        if success >= 0: return _dtz_before_zeroing(wdl) + (dtz if wdl > 0 else -dtz)
+
+        # the table only holds the other side to move: one ply of search
+        if wdl > 0:
+            best = 0xffff
+            for i in range(moves.count):
+                move = moves.moves[i]
+                if is_capture(move) or _is_pawn_move(state, move): continue
+                make_move(state, move)
+                v = self.probe_dtz(state)
+                if v != TB_FAIL:
+                    v = -v
+                    if v == 1 and self._is_mate(state): best = 1
+                    elif v > 0 and v + 1 < best: best = v + 1
+                unmake_move(state, move)
+                if v == TB_FAIL: return TB_FAIL
+            return best
+
+        best = -1
+        for i in range(moves.count):
+            move = moves.moves[i]
+            make_move(state, move)
+            if state.halfmove_clock == 0:
+                if wdl == -2: v = -1
+                else:
+                    v = self._probe_ab(state, 1, 2, &success)
+                    if v != TB_FAIL: v = 0 if v == 2 else -101
+            else:
+                v = self.probe_dtz(state)
+                if v != TB_FAIL: v = -v - 1
+            unmake_move(state, move)
+            if v == TB_FAIL: return TB_FAIL
+            if v < best: best = v
+        return best
+
+    cdef int probe_dtz(self, State state) noexcept:
+        """
+        distance to the next zeroing move in plies, signed like probe_wdl and
+        beyond 100 when the fifty-move rule turns the result; may be one ply
+        long (the dtz50'' rounding the tables are stored with)
+        """
+        cdef MoveList moves
+        cdef int v, v1
+
+        v = self._probe_dtz_no_ep(state)
+        if v == TB_FAIL or state.en_passant_square == _NULL_SQ: return v
+
+        generate_legal_move_list(state, &moves, False)
+        v1 = self._best_en_passant(state, &moves)
+        if v1 == TB_FAIL: return TB_FAIL
+        if v1 > -3:
+            v1 = _WDL_TO_DTZ[v1 + 2]
+            if v < -100:
+                if v1 >= 0: v = v1
+            elif v < 0:
+                if v1 >= 0 or v1 < -100: v = v1
+            elif v > 100:
+                if v1 > 0: v = v1
+            elif v > 0:
+                if v1 == 1: v = v1
+            elif v1 >= 0:
+                v = v1
+            elif _only_en_passant(&moves):
+                v = v1
+        return v
+
+    cdef bint _is_mate(self, State state) noexcept:
+        cdef MoveList moves
+        generate_legal_move_list(state, &moves, False)
+        return moves.count == 0 and king_in_check(state, state.is_white)
+
+    def wdl(self, State state):
+        """probe_wdl for python callers: None if the tables don't cover the position"""
+        if state.castling_rights: return None
+        cdef int v = self.probe_wdl(state)
+        return None if v == TB_FAIL else v
+
+    def dtz(self, State state):
+        """probe_dtz for python callers: None if the tables don't cover the position"""
+        if state.castling_rights: return None
+        cdef int v = self.probe_dtz(state)
+        return None if v == TB_FAIL else v
@@ -0,0 +1,21 @@
+# declaration header for tbprobe.pyx
+
+from engine.board.state cimport State
+from engine.search.tbcore cimport SyzygyTables
+
+cdef packed struct TBCacheEntry:
+    unsigned long long key
+    short              dtz
+    signed char        wdl
+    unsigned char      status    # 0 = empty, 1 = probed, 2 = no table
+
+cdef class TablebaseProber:
+    cdef TBCacheEntry*     cache
+    cdef unsigned long long mask
+    cdef public SyzygyTables tables
+    cdef public int        probe_depth
+    cdef public int        max_pieces
+    cdef public long long  probes
+    cdef public long long  cache_hits
+
+    cdef bint probe(self, State state, int* out_wdl, int* out_dtz)
@@ -0,0 +1,92 @@
+# cython: language_level=3
+# cython: boundscheck=False
+# cython: wraparound=False
+# cython: cdivision=True
+
+from libc.stdlib cimport calloc, free
+from libc.string cimport memset
+
+from engine.core.bits cimport popcount
+from engine.core.constants import WHITE, BLACK, SYZYGY_PIECE_THRESHOLD
+from engine.search.tbcore cimport SyzygyTables, TB_FAIL
+
+cdef int _WHITE = WHITE
+cdef int _BLACK = BLACK
+
+cdef unsigned char _EMPTY = 0
+cdef unsigned char _PROBED = 1
+cdef unsigned char _NO_TABLE = 2
+
+
+cdef class TablebaseProber:
+    """
+    in-search wdl/dtz probes with a fixed-size probe cache in front. results
+    (and positions with no table) are cached by zobrist key for the life of the
+    engine, since a tablebase result doesn't depend on the search that asked.
+    a miss probes the memory-mapped tables straight from the bitboards
+    """
+
+    def __cinit__(self, SyzygyTables tables=None, int cache_mb=1, int probe_depth=1):
+        cdef long long n = <long long>cache_mb * 1024 * 1024 // sizeof(TBCacheEntry)
+        cdef long long power = 1
+        while (power << 1) <= n:
+            power <<= 1
+
+        self.mask = <unsigned long long>(power - 1)
+        self.cache = <TBCacheEntry*>calloc(power, sizeof(TBCacheEntry))
+        if not self.cache:
+            raise MemoryError(f"TablebaseProber: failed to allocate {cache_mb} MB")
+
+        self.tables = tables
+        self.probe_depth = probe_depth
+        self.max_pieces = min(SYZYGY_PIECE_THRESHOLD, tables.max_pieces if tables is not None else 0)
+        self.probes = 0
+        self.cache_hits = 0
+
+    def __dealloc__(self):
+        if self.cache:
+            free(self.cache)
+            self.cache = NULL
+
+    def clear(self):
+        memset(self.cache, 0, (self.mask + 1) * sizeof(TBCacheEntry))
+
+    cdef bint probe(self, State state, int* out_wdl, int* out_dtz):
+        """True with wdl/dtz filled in if the tables cover the position"""
+        cdef TBCacheEntry* slot
+        cdef unsigned long long key = state.hash
+        cdef int wdl, dtz
+
+        # syzygy has no castling, and nothing bigger than the largest table
+        if state.castling_rights: return False
+        if popcount(state.bitboards[_WHITE] | state.bitboards[_BLACK]) > self.max_pieces: return False
+
+        self.probes += 1
+        slot = &self.cache[key & self.mask]
+        if slot.status != _EMPTY and slot.key == key:
+            self.cache_hits += 1
+            out_wdl[0] = slot.wdl
+            out_dtz[0] = slot.dtz
+            return slot.status == _PROBED
+
+        slot.key = key
+        slot.status = _NO_TABLE
+        wdl = self.tables.probe_wdl(state)
+        if wdl == TB_FAIL: return False
+        dtz = self.tables.probe_dtz(state)
+        if dtz == TB_FAIL:
+            dtz = 0  # wdl without its dtz table: still a result, just not a distance
+
+        slot.status = _PROBED
+        slot.wdl = <signed char>wdl
+        slot.dtz = <short>dtz
+        out_wdl[0] = wdl
+        out_dtz[0] = dtz
+        return True
+
+    def probe_position(self, State state):
+        """(wdl, dtz) or None, for python callers"""
+        cdef int wdl, dtz
+        if self.probe(state, &wdl, &dtz): return wdl, dtz
+        return None
+
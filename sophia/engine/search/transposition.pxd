@@ -18,3 +18,4 @@ cdef class TranspositionTable:
                     unsigned char* out_flag, unsigned int* out_move) noexcept
     cdef void store(self, unsigned long long key, short depth, int score,
                     unsigned char flag, unsigned int move) noexcept
+    cdef int _count_entries(self) noexcept
@@ -3,9 +3,13 @@
 # cython: wraparound=False
 # cython: cdivision=True
 
+import struct
+
 from libc.stdlib cimport malloc, free, calloc
 from libc.string cimport memset
 
+from engine.core.zobrist import ZOBRIST_SEED, ZOBRIST_KEYS
+
 FLAG_EXACT      = 0
 FLAG_LOWERBOUND = 1
 FLAG_UPPERBOUND = 2
@@ -13,6 +17,10 @@ FLAG_UPPERBOUND = 2
 # sentinel for "no move stored"
 cdef unsigned int _NO_MOVE = 0
 
+# save file: magic, entry size, entry count, zobrist seed, black-to-move key, then the raw entries
+_FILE_MAGIC = b'SOPHTT01'
+_FILE_HEADER = struct.Struct('<8sQQQQ')
+
 
 cdef class TranspositionTable:
     def __init__(self, size_mb: int = 64):
@@ -126,6 +134,63 @@ cdef class TranspositionTable:
 
         return total, exact, bound, empty
 
+    def save(self, path):
+        """write the table as a header plus the raw entry array, in one write straight from memory"""
+        cdef char[::1] raw = <char[:self.size * sizeof(TTEntry)]><char*>self.table
+        with open(path, 'wb') as f:
+            f.write(_FILE_HEADER.pack(_FILE_MAGIC, sizeof(TTEntry), self.size,
+                                      ZOBRIST_SEED, ZOBRIST_KEYS.black_to_move))
+            f.write(raw)
+
+    def load(self, path):
+        """
+        replace the table with a saved one; returns the number of entries loaded.
+        a file of the same size is read straight into the table, any other size is
+        rehashed through store. ValueError if the file isn't a table, or was saved
+        under different zobrist keys
+        """
+        cdef char[::1] raw
+        cdef const unsigned char[::1] data
+        cdef const TTEntry* saved
+        cdef long long i, n
+
+        with open(path, 'rb') as f:
+            try:
+                magic, entry_size, n, seed, fingerprint = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            except struct.error:
+                raise ValueError(f"{path}: truncated header")
+            if magic != _FILE_MAGIC or entry_size != sizeof(TTEntry):
+                raise ValueError(f"{path}: not a transposition table file")
+            if seed != ZOBRIST_SEED or fingerprint != ZOBRIST_KEYS.black_to_move:
+                raise ValueError(f"{path}: saved with different zobrist keys")
+
+            self.clear()
+            if n == self.size:
+                raw = <char[:self.size * sizeof(TTEntry)]><char*>self.table
+                if f.readinto(raw) != self.size * sizeof(TTEntry):
+                    self.clear()
+                    raise ValueError(f"{path}: truncated entries")
+                self.entries_count = self._count_entries()
+                return self.entries_count
+
+            data = f.read(n * sizeof(TTEntry))
+            if len(data) != n * sizeof(TTEntry):
+                raise ValueError(f"{path}: truncated entries")
+
+        saved = <const TTEntry*>&data[0]
+        for i in range(n):
+            if saved[i].key != 0:
+                self.store(saved[i].key, saved[i].depth, saved[i].score, saved[i].flag, saved[i].move)
+        return self.entries_count
+
+    cdef int _count_entries(self) noexcept:
+        cdef long long i
+        cdef int count = 0
+        for i in range(self.size):
+            if self.table[i].key != 0:
+                count += 1
+        return count
+
     def clear(self):
         memset(self.table, 0, self.size * sizeof(TTEntry))
         self.entries_count = 0
@@ -1,4 +1,3 @@
-import chess
 from engine.core.constants import (
     WP, WN, WB, WR, WQ, WK,
     BP, BN, BB, BR, BQ, BK,
@@ -9,6 +8,8 @@ from engine.core.constants import (
 
 def state_to_board(state):
     """Convert internal state to python-chess board"""
+    import chess  # only tablebase and debug paths need python-chess
+
     board = chess.Board(fen=None)
     board.clear()
 
@@ -5,7 +5,7 @@ import threading
 
 from engine.board.fen_parser import load_from_fen
 from engine.board.move_exec import make_move, is_repetition
-from engine.moves.generator import get_legal_moves
+from engine.moves.generator import parse_uci_move
 from engine.moves.legality import is_in_check
 from engine.core.constants import (
     NAME, AUTHOR, INFINITE_TIME,
@@ -16,21 +16,37 @@ from engine.core.parameters import (
     MOVE_OVERHEAD, PONDERHIT_HARD_FACTOR, PONDERHIT_HARD_OFFSET,
 )
 from engine.search.search import SearchEngine
-from engine.uci.utils import send_command, send_info_string
+import engine.uci.utils as uci_utils
+from engine.uci.utils import send_command, send_info_string, queue_command
 from engine.core.move import move_to_uci
 from engine.search.book import OpeningBook
+from engine.search.position_cache import PositionCache, DEFAULT_MIN_DEPTH
 
 from engine.uci.tests import (
     evaluate, perft, draw, win_percentage, move_accuracy,
     legal_moves, see, eval_breakdown, debug_toggle, debug_eval_toggle, order_moves,
-    history_top, tt_stats,
+    history_top, tt_stats, bench, BENCH_DEPTH,
 )
 
+TT_FILE = 'hash.tt'
+
 class UCI:
     def __init__(self):
-        self.engine = SearchEngine()
+        # book and tablebases are loaded by _load_subsystems (isready or the
+        # first go), so uci is answered before python-chess is imported
+        self.engine = SearchEngine(load_tablebases=False)
         self.state = load_from_fen()
-        self.book = OpeningBook()
+        self.book = None
+
+        # fen and moves of the last position command, to apply only what a new one adds
+        self._position_fen = None
+        self._position_moves = []
+
+        # position cache settings; the file is opened once PositionCache is on
+        self.cache_enabled = False
+        self.cache_file = 'position_cache.bin'
+        self.cache_size_mb = 64
+        self.cache_min_depth = DEFAULT_MIN_DEPTH
 
         self._ponder_thread = None
         self._ponder_lock = threading.Lock()
@@ -56,7 +72,10 @@ class UCI:
         command = parts[0]
 
         if command == 'uci': self.handle_uci()
-        elif command == 'isready': send_command('readyok')
+        elif command == 'isready':
+            self._load_subsystems()
+            send_command('readyok')
+        elif command == 'setoption': self.handle_setoption(parts[1:])
         elif command == 'ucinewgame': self.handle_new_game()
         elif command == 'position': self.handle_position(parts[1:])
         elif command == 'go': self.handle_go(parts[1:])
@@ -67,6 +86,7 @@ class UCI:
         elif command == 'd':       draw(self.state)
         elif command == 'eval':    evaluate(self.state)
         elif command == 'perft':   perft(self.state, int(parts[1]) if len(parts) > 1 else 1)
+        elif command == 'bench':   bench(int(parts[1]) if len(parts) > 1 else BENCH_DEPTH)
         elif command == 'win':     win_percentage(self.state)
         elif command == 'acc':     move_accuracy(self.state, parts[1] if len(parts) > 1 else '0000')
         elif command == 'legal':   legal_moves(self.state)
@@ -77,6 +97,8 @@ class UCI:
         elif command == 'order':   order_moves(self.state)
         elif command == 'hist':    history_top(self.engine.ordering)
         elif command == 'ttstats': tt_stats(self.engine.tt)
+        elif command == 'ttsave':  self.handle_tt_file(parts[1] if len(parts) > 1 else TT_FILE, save=True)
+        elif command == 'ttload':  self.handle_tt_file(parts[1] if len(parts) > 1 else TT_FILE, save=False)
 
     def _compute_time_limit(self, args):
         w_time = None
@@ -149,16 +171,13 @@ class UCI:
         self._ponder_args = None
         self._ponder_time_limit = None
 
-    def _book_ponder(self, state, book_move_uci, legal_moves_list):
-        """look up book move for the position after uci is played"""
+    def _book_ponder(self, state, move):
+        """look up book move for the position after move is played"""
         try:
             ponder_state = state.clone()
-            for lm in legal_moves_list:
-                if move_to_uci(lm) == book_move_uci:
-                    make_move(ponder_state, lm)
-                    break
+            make_move(ponder_state, move)
             result = self.book.get_move(ponder_state)
-            if result:
+            if result and parse_uci_move(ponder_state, result[0]):
                 return result[0]
         except Exception:
             pass
@@ -169,13 +188,11 @@ class UCI:
         if not book_result: return None
 
         book_move, book_pct, book_nodes, book_ms = book_result
-        legal_moves_list = get_legal_moves(state)
-        legal_ucis = {move_to_uci(lm) for lm in legal_moves_list}
-
-        if book_move not in legal_ucis: return None
+        move = parse_uci_move(state, book_move)
+        if not move: return None
 
         book_nps = max(1, int(book_nodes / (book_ms / 1000)))
-        ponder_move = self._book_ponder(state, book_move, legal_moves_list)
+        ponder_move = self._book_ponder(state, move)
         ponder_suffix = f' ponder {ponder_move}' if ponder_move else ''
 
         return book_move, ponder_suffix, book_pct, book_nodes, book_ms, book_nps
@@ -223,7 +240,13 @@ class UCI:
             with self._ponder_lock:
                 self._ponder_result = ('0000', '')
 
+    def _load_subsystems(self):
+        if self.book is not None: return
+        self.book = OpeningBook()
+        self.engine.load_tablebases()
+
     def handle_go(self, args):
+        self._load_subsystems()
         time_limit, opponent_time, depth_limit, nodes_limit, is_movetime, is_ponder = self._compute_time_limit(args)
 
         # stop any in-flight search or ponder; discard results (wrong position)
@@ -266,7 +289,7 @@ class UCI:
 
         if book_bestmove:
             book_move, ponder_suffix, book_pct, book_nodes, book_ms, book_nps = book_bestmove
-            send_command(f'info score cp {book_pct} depth 1 nodes {book_nodes} time {book_ms} nps {book_nps} pv {book_move}')
+            queue_command(f'info score cp {book_pct} depth 1 nodes {book_nodes} time {book_ms} nps {book_nps} pv {book_move}')
 
             send_command(f'bestmove {book_move}{ponder_suffix}')
             return
@@ -354,11 +377,71 @@ class UCI:
             self.engine.stop_flag.set()
 
     def handle_uci(self):
-        send_command(f'id name {NAME}')
-        send_command(f'id author {AUTHOR}')
-        send_command('option name Ponder type check default false')
+        queue_command(f'id name {NAME}')
+        queue_command(f'id author {AUTHOR}')
+        queue_command('option name Ponder type check default false')
+        queue_command(f'option name InfoStrings type check default {str(uci_utils.info_strings).lower()}')
+        queue_command(f'option name SyzygyProbeDepth type spin default {self.engine.tb_prober.probe_depth} min 1 max 100')
+        queue_command('option name PositionCache type check default false')
+        queue_command(f'option name PositionCacheFile type string default {self.cache_file}')
+        queue_command(f'option name PositionCacheSize type spin default {self.cache_size_mb} min 1 max 65536')
+        queue_command(f'option name PositionCacheMinDepth type spin default {self.cache_min_depth} min 1 max 64')
         send_command('uciok')
 
+    def handle_setoption(self, args):
+        # setoption name <id> [value <x>]; names are case-insensitive
+        if 'name' not in args: return
+        value_idx = args.index('value') if 'value' in args else len(args)
+        name = ' '.join(args[args.index('name') + 1:value_idx]).lower()
+        value = ' '.join(args[value_idx + 1:])
+
+        try:
+            if name == 'infostrings':
+                uci_utils.info_strings = value.lower() == 'true'
+                return
+            if name == 'syzygyprobedepth':
+                self.engine.tb_prober.probe_depth = max(1, int(value))
+                return
+
+            if name == 'positioncache': self.cache_enabled = value.lower() == 'true'
+            elif name == 'positioncachefile': self.cache_file = value
+            elif name == 'positioncachesize': self.cache_size_mb = max(1, int(value))
+            elif name == 'positioncachemindepth': self.cache_min_depth = max(1, int(value))
+            else: return
+        except ValueError:
+            send_info_string(f"bad value for {name}: {value}")
+            return
+        self._open_position_cache()
+
+    def _open_position_cache(self):
+        self._stop_search()
+        self._stop_ponder()
+        if self.engine.position_cache is not None:
+            self.engine.position_cache.close()
+            self.engine.position_cache = None
+        if not self.cache_enabled: return
+        try:
+            self.engine.position_cache = PositionCache(self.cache_file, self.cache_size_mb, self.cache_min_depth)
+        except (OSError, ValueError) as e:
+            send_info_string(f"position cache error: {e}")
+
+    def handle_tt_file(self, path, save):
+        # the table can't change under a save or be swapped under a running search
+        self._stop_search()
+        self._stop_ponder()
+        t0 = time.perf_counter()
+        try:
+            if save:
+                self.engine.tt.save(path)
+                entries = self.engine.tt.entries_count
+            else:
+                entries = self.engine.tt.load(path)
+        except (OSError, ValueError) as e:
+            send_info_string(f"tt {'save' if save else 'load'} failed: {e}")
+            return
+        send_info_string(f"tt {'saved to' if save else 'loaded from'} '{path}': {entries} entries, "
+                         f"hashfull {self.engine.tt.get_hashfull()} in {int((time.perf_counter() - t0) * 1000)} ms")
+
     def handle_new_game(self):
         self._stop_search()
         self._stop_ponder()
@@ -371,6 +454,8 @@ class UCI:
         self.engine.ordering.clear()
         self.engine.pawn_hash = type(self.engine.pawn_hash)(16)
         self.state = load_from_fen()
+        self._position_fen = None
+        self._position_moves = []
 
     def handle_position(self, args):
         if not args: return
@@ -387,17 +472,31 @@ class UCI:
                 fen_str = ' '.join(args[1:])
         else: return
 
-        try:
-            self.state = load_from_fen(fen_str)
-        except ValueError:
-            send_info_string(f"error parsing fen: {fen_str}")
-            return
+        moves = args[moves_idx + 1:] if moves_idx != -1 else []
 
-        if moves_idx != -1:
-            moves = args[moves_idx + 1:]
-            for move_str in moves:
-                legal_moves_list = get_legal_moves(self.state)
-                for legal_move in legal_moves_list:
-                    if move_to_uci(legal_move) == move_str.lower():
-                        make_move(self.state, legal_move)
-                        break
+        # a gui resends the whole game every move: when this extends the last
+        # position, only the new moves need playing
+        applied = self._position_moves
+        if (fen_str == self._position_fen and len(moves) >= len(applied)
+                and moves[:len(applied)] == applied):
+            new_moves = moves[len(applied):]
+        else:
+            try:
+                self.state = load_from_fen(fen_str)
+            except ValueError:
+                send_info_string(f"error parsing fen: {fen_str}")
+                self._position_fen = None
+                return
+            self._position_fen = fen_str
+            self._position_moves = []
+            new_moves = moves
+
+        for move_str in new_moves:
+            move = parse_uci_move(self.state, move_str)
+            if not move:
+                # later moves would be played from the wrong position
+                send_info_string(f"illegal move in position: {move_str}")
+                self._position_fen = None
+                return
+            make_move(self.state, move)
+            self._position_moves.append(move_str)
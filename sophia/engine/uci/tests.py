@@ -5,16 +5,18 @@ from engine.moves.legality import is_in_check
 from engine.search.evaluation import evaluate as static_eval, MAX_PHASE, PawnHashTable
 from engine.core.move import move_to_uci
 from engine.search.utils import state_to_board
-from engine.uci.utils import send_command
+from engine.uci.utils import send_command, queue_command
 from engine.search.see import see_full, see_fast
 from engine.search.ordering import MoveOrdering, pick_next_move
+from engine.board.fen_parser import load_from_fen
+import engine.search.search as _search
 import engine.core.constants as _const
 from engine.core.constants import (
     WHITE, BLACK, NULL,
     WP, WN, WB, WR, WQ, WK,
     BP, BN, BB, BR, BQ, BK,
     PIECE_STR, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
-    MASK_SOURCE,
+    MASK_SOURCE, INFINITE_TIME,
 )
 from engine.core.parameters import PIECE_VALUES
 from engine.core.move import SHIFT_TARGET, SHIFT_FLAG, SQUARE_NAMES
@@ -30,9 +32,9 @@ def evaluate(state):
     mg_phase = min(state.phase, MAX_PHASE)
     eg_phase = MAX_PHASE - mg_phase
     
-    send_command(f"Evaluation: {score / 100 :.1f}")
-    send_command(f"Phase: {state.phase}/{MAX_PHASE}")
-    send_command(f"MG Score: {state.mg_score :,} (Weight: {mg_phase / MAX_PHASE * 100 :.1f}%)")
+    queue_command(f"Evaluation: {score / 100 :.1f}")
+    queue_command(f"Phase: {state.phase}/{MAX_PHASE}")
+    queue_command(f"MG Score: {state.mg_score :,} (Weight: {mg_phase / MAX_PHASE * 100 :.1f}%)")
     send_command(f"EG Score: {state.eg_score :,} (Weight: {eg_phase / MAX_PHASE * 100 :.1f}%)")
 
 
@@ -45,19 +47,62 @@ def perft(state, depth):
     total_nodes = 0
     for move, nodes in rows:
         total_nodes += nodes
-        send_command(f"{move_to_uci(move)}: {nodes :,}")
+        queue_command(f"{move_to_uci(move)}: {nodes :,}")
 
     t_end = time.time()
     dt = t_end - t_start
     nps = int(total_nodes / dt) if dt > 0 else 0
 
-    send_command(f"\nNodes: {total_nodes :,}")
-    send_command(f"Time: {dt :.3f} s")
+    queue_command(f"\nNodes: {total_nodes :,}")
+    queue_command(f"Time: {dt :.3f} s")
     send_command(f"NPS: {nps :,}\n")
 
 
+BENCH_DEPTH = 8
+BENCH_FENS = [
+    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+    'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8',
+    'r2q1rk1/pP1p2pp/Q4n2/bbp1p3/Np6/1B3NBn/pPPP1PPP/R3K2R b KQ - 0 1',
+    'r1bqk2r/pp2bppp/2n1pn2/2pp4/3P4/2PBPN2/PP1N1PPP/R1BQK2R w KQkq - 0 7',
+    '2r2rk1/1bqnbppp/p2ppn2/1p6/3NP3/1BN1BP2/PPPQ2PP/2KR3R w - - 0 14',
+    '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+    '6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1',
+    '8/5pk1/6p1/3P3p/1r5P/6P1/5PK1/2R5 b - - 0 40',
+]
+
+
+def bench(depth=BENCH_DEPTH):
+    """
+    searches BENCH_FENS to a fixed depth, each from a fresh engine, and prints
+    the total node count and nps. the count only changes when the search or
+    evaluation does, so it is the signature to compare across a refactor or build
+    """
+    muted = _search.send_info, _search.send_info_string
+    _search.send_info = _search.send_info_string = lambda *a, **k: None
+
+    total_nodes = 0
+    t_start = time.perf_counter()
+    try:
+        for fen in BENCH_FENS:
+            engine = _search.SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=16, load_tablebases=False)
+            engine.get_best_move(load_from_fen(fen), INFINITE_TIME, depth, None)
+            total_nodes += engine.nodes_searched
+    finally:
+        _search.send_info, _search.send_info_string = muted
+
+    dt = time.perf_counter() - t_start
+    nps = int(total_nodes / dt) if dt > 0 else 0
+
+    queue_command(f"\nPositions: {len(BENCH_FENS)} (depth {depth})")
+    queue_command(f"Time: {dt :.3f} s")
+    queue_command(f"Nodes searched: {total_nodes}")
+    send_command(f"NPS: {nps :,}\n")
+    return total_nodes
+
+
 def draw(state):
-    send_command("\n")
+    queue_command("\n")
     
     for rank in range(7, -1, -1):
         line = f" {rank + 1}   "
@@ -73,13 +118,13 @@ def draw(state):
                     symbol = ' '
             line += f" {symbol} "
             
-        send_command(line)
+        queue_command(line)
     
     caption = '\n' + '      ' + '  '.join(rank for rank in 'abcdefgh')
-    send_command(caption)
+    queue_command(caption)
     
     side = "White" if state.is_white else "Black"
-    send_command(f"\nTurn: {side}")
+    queue_command(f"\nTurn: {side}")
     send_command(f"Hash: {state.hash:016x}\n")
 
 def _clamp_percentage(percentage):
@@ -95,7 +140,7 @@ def _get_move_accuracy(win_percent_before, win_percent_after):
     return _clamp_percentage(accuracy)
 
 def win_percentage(state):
-    send_command(f'{_get_win_percentage(state) :.2f}%')
+    queue_command(f'{_get_win_percentage(state) :.2f}%')
     send_command("\n")
 
 def move_accuracy(state, move_str):
@@ -122,7 +167,7 @@ def legal_moves(state):
     move_strings = [move_to_uci(m) for m in moves]
     move_strings.sort()
     
-    send_command(f"count: {len(moves)}")
+    queue_command(f"count: {len(moves)}")
     send_command(f"moves: {' '.join(move_strings)}\n")
 
 def see(state, move_str):
@@ -152,8 +197,8 @@ def order_moves(state):
         [(ordering.get_move_score(m, 0, 0, state, 1, 0, 0), move_to_uci(m)) for m in get_legal_moves(state)],
         reverse=True
     )
-    send_command(f"Move ordering ({len(scored)} moves):")
-    for score, uci in scored: send_command(f"  {uci}  score={score}")
+    queue_command(f"Move ordering ({len(scored)} moves):")
+    for score, uci in scored: queue_command(f"  {uci}  score={score}")
     send_command("")
 
 def history_top(ordering, n=10):
@@ -162,8 +207,8 @@ def history_top(ordering, n=10):
          for f in range(64) for t in range(64) if ordering.history_table[f][t] > 0],
         reverse=True
     )
-    send_command(f"Top {n} history entries:")
-    for val, sq in entries[:n]: send_command(f"  {sq}  {val}")
+    queue_command(f"Top {n} history entries:")
+    for val, sq in entries[:n]: queue_command(f"  {sq}  {val}")
     send_command("")
 
 def tt_stats(tt):
@@ -176,9 +221,9 @@ def tt_stats(tt):
         bound = sum(1 for e in entries if e and e[3] != 0)
         empty = sum(1 for e in entries if e is None)
         total = exact + bound + empty
-    send_command(f"TT stats (sampled {total} of {tt.size}):")
-    send_command(f"  hashfull: {tt.get_hashfull()}/1000")
-    send_command(f"  exact:    {exact} ({100*exact//total if total else 0}%)")
-    send_command(f"  bound:    {bound} ({100*bound//total if total else 0}%)")
-    send_command(f"  empty:    {empty} ({100*empty//total if total else 0}%)")
+    queue_command(f"TT stats (sampled {total} of {tt.size}):")
+    queue_command(f"  hashfull: {tt.get_hashfull()}/1000")
+    queue_command(f"  exact:    {exact} ({100*exact//total if total else 0}%)")
+    queue_command(f"  bound:    {bound} ({100*bound//total if total else 0}%)")
+    queue_command(f"  empty:    {empty} ({100*empty//total if total else 0}%)")
     send_command("")
@@ -1,5 +1,81 @@
+import sys
+import threading
+import time
+
+# seconds between search info lines; a faster one waits its turn. in-process
+# tools that parse every depth's line set it to 0, which sends each one
+INFO_INTERVAL = 0.1
+
+_lock = threading.Lock()
+_pending = []        # lines for the next write
+_held_info = None    # newest info line inside the interval, replaced by any newer one
+_last_info = 0.0
+
+info_strings = True  # InfoStrings option: diagnostic `info string` output
+
+
+def _flush():
+    # sys.stdout looked up per write, so contextlib.redirect_stdout captures it
+    out = sys.stdout
+    out.write('\n'.join(_pending) + '\n')
+    _pending.clear()
+    out.flush()
+
+
+def _release_held():
+    global _held_info
+    if _held_info is not None:
+        _pending.append(_held_info)
+        _held_info = None
+
+
+def queue_command(command : str):
+    """buffer a line for the next send_command, so a block of output goes out in one write"""
+    with _lock:
+        _pending.append(command)
+
+
 def send_command(command : str) -> str:
-    print(command, flush=True)
+    # a held info line goes out ahead of it, in the same write
+    with _lock:
+        _release_held()
+        _pending.append(command)
+        _flush()
+
+
+def send_info(line : str):
+    """
+    search info line, rate limited to one per INFO_INTERVAL: one arriving sooner
+    is held (and replaced by any newer one) until the interval is up, the next
+    send_command or flush_info, so the last info before bestmove always goes out
+    """
+    global _held_info, _last_info
+    now = time.monotonic()
+    with _lock:
+        if now - _last_info < INFO_INTERVAL:
+            _held_info = line
+            return
+        _last_info = now
+        _held_info = None
+        _pending.append(line)
+        _flush()
+
+
+def flush_info():
+    """write a held info line once its interval is up; called from the search's time checks"""
+    global _last_info
+    if _held_info is None: return
+    now = time.monotonic()
+    if now - _last_info < INFO_INTERVAL: return
+    with _lock:
+        _last_info = now
+        _release_held()
+        if _pending: _flush()
+
 
 def send_info_string(string : str) -> str:
-    send_command(f'info string {string}')
+    # diagnostics don't release a held info line, or they'd undo the rate limit
+    if not info_strings: return
+    with _lock:
+        _pending.append(f'info string {string}')
+        _flush()
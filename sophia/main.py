@@ -1,5 +1,13 @@
+import sys
+
 from engine.uci.handler import UCI
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['bench']:
+        # python main.py bench [depth]: node count signature and nps, then exit
+        from engine.uci.tests import bench, BENCH_DEPTH
+        bench(int(sys.argv[2]) if len(sys.argv) > 2 else BENCH_DEPTH)
+        sys.exit()
+
     uci = UCI()
-    uci.run()
\ No newline at end of file
+    uci.run()
@@ -0,0 +1,35 @@
+#!/bin/bash
+# profile-guided build: an instrumented build runs the bench to collect
+# profiles, then everything is recompiled from them. the bench's node count
+# must come out the same from both builds, or the optimised build is refused
+set -eo pipefail
+cd "$(dirname "$0")"
+
+PYTHON=${PYTHON:-../venv/bin/python}
+DEPTH=${1:-}
+
+if [ ! -x "$PYTHON" ]; then
+    echo "Python interpreter not found: $PYTHON" >&2
+    exit 1
+fi
+
+signature() {
+    "$PYTHON" main.py bench $DEPTH | tee /dev/stderr | sed -n 's/^Nodes searched: //p'
+}
+
+rm -rf build/pgo
+
+echo "instrumented build..." >&2
+SOPHIA_PGO=generate "$PYTHON" setup.py build_ext --inplace --force --quiet 2>&1 | tail -3 >&2
+expected=$(signature)
+
+echo "optimised build..." >&2
+SOPHIA_PGO=use "$PYTHON" setup.py build_ext --inplace --force --quiet 2>&1 | tail -3 >&2
+actual=$(signature)
+
+if [ "$actual" != "$expected" ]; then
+    echo "bench mismatch: instrumented $expected nodes, optimised $actual" >&2
+    echo "rebuild without profiles: $PYTHON setup.py build_ext --inplace --force" >&2
+    exit 1
+fi
+echo "pgo build ok: bench $actual nodes" >&2
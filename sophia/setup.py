@@ -1,3 +1,5 @@
+import os
+
 from setuptools import setup, Extension
 from Cython.Build import cythonize
 
@@ -7,9 +9,29 @@ from Cython.Build import cythonize
 EXTRA_COMPILE = ["-O3", "-march=native", "-ffast-math"]
 EXTRA_LINK    = []
 
+# profile-guided build (pgo.sh drives it): SOPHIA_PGO=generate builds the
+# instrumented extensions that write profiles to PGO_DIR as the bench runs,
+# SOPHIA_PGO=use rebuilds from those profiles. -fprofile-correction tolerates
+# the counters being slightly off; -Wno-missing-profile quiets the modules the
+# bench never reaches
+PGO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "pgo")
+PGO_FLAGS = {
+    "generate": [f"-fprofile-generate={PGO_DIR}"],
+    "use":      [f"-fprofile-use={PGO_DIR}", "-fprofile-correction", "-Wno-missing-profile"],
+}
+pgo = os.environ.get("SOPHIA_PGO")
+if pgo:
+    if pgo not in PGO_FLAGS:
+        raise SystemExit(f"SOPHIA_PGO must be one of {', '.join(PGO_FLAGS)}, not '{pgo}'")
+    EXTRA_COMPILE += PGO_FLAGS[pgo]
+    EXTRA_LINK    += PGO_FLAGS[pgo]
+
 # build order matters for .pxd resolution: bits and state must come before
 # anything that cimports them. cython resolves .pxd at compile time, so the
 # order here only affects incremental builds — a clean build is always safe.
+# calls between modules go through cython's function pointer tables and can't
+# be inlined, so the small hot primitives (bits, move fields, slider lookups)
+# are cdef inline in their .pxd and compiled into each module that cimports them
 PYX_FILES = [
     "engine/core/bits.pyx",
     "engine/core/move.pyx",
@@ -21,12 +43,25 @@ PYX_FILES = [
     "engine/moves/generator.pyx",
     "engine/uci/perft.pyx",
     "engine/search/transposition.pyx",
+    "engine/search/polyglot.pyx",
+    "engine/search/tbcore.pyx",
+    "engine/search/tbprobe.pyx",
+    "engine/search/bitbase.pyx",
     "engine/search/see.pyx",
     "engine/search/evaluation.pyx",
     "engine/search/ordering.pyx",
     "engine/search/search.pyx",
 ]
 
+# generated tables, included by the .pyx files that probe them so nothing is
+# built at import; each is rebuilt when its generator is newer than its output
+from engine.core import gen_zobrist
+from engine.moves import gen_magics
+from engine.search import gen_kpk
+for generator in (gen_zobrist, gen_magics, gen_kpk):
+    if not os.path.exists(generator.OUTPUT) or os.path.getmtime(generator.OUTPUT) < os.path.getmtime(generator.__file__):
+        generator.write()
+
 extensions = cythonize(
     PYX_FILES,
     compiler_directives={
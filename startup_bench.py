@@ -0,0 +1,156 @@
+"""
+engine startup cost: what every tournament game pays before its first move
+
+usage: python startup_bench.py [engine_dir] [runs]
+       python startup_bench.py --check [engine_dir] [--budget ms]
+
+times, over fresh interpreters, the import of the engine (engine.uci.handler)
+and the full spawn of main.py up to `uciok`, then lists the slowest modules
+from one `python -X importtime` run
+
+--check is the regression check: from `python -X importtime`, the engine's
+import must stay within the budget and must not pull in the modules that are
+only loaded once a book or tablebase is found, and neither may `isready` when
+it finds no book or tablebase files (exits 1 if any fails)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BAR_WIDTH = 100
+TOP_MODULES = 12
+
+STARTUP_BUDGET_MS = 120               # import of engine.uci.handler, under -X importtime
+DEFERRED_MODULES = ('chess',)         # only the debug helpers use python-chess, never before uciok
+
+
+def _median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def time_import(target_dir, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import engine.uci.handler'], cwd=target_dir,
+                       check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def time_uciok(target_dir, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, 'main.py'], cwd=target_dir, text=True,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        proc.stdin.write('uci\n')
+        proc.stdin.flush()
+        for line in proc.stdout:
+            if line.strip() == 'uciok': break
+        samples.append(time.perf_counter() - t0)
+        proc.communicate('quit\n')
+    return samples
+
+
+def import_times(target_dir):
+    """(self us, cumulative us, module) for every module the engine's import loads"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import engine.uci.handler'],
+                            cwd=target_dir, check=True, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line: continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+# what isready loads: whether it found a book or tables, and the deferred modules imported
+LOAD_PROBE = f"""
+import sys
+from engine.uci.handler import UCI
+uci = UCI()
+uci._load_subsystems()
+found = bool(uci.book.books) or uci.engine.syzygy.max_pieces > 0
+loaded = sorted(name for name in sys.modules if name.split('.')[0] in {DEFERRED_MODULES!r})
+print(int(found), *loaded)
+"""
+
+
+def load_imports(target_dir):
+    """(found a book or tablebase, deferred modules imported) after the engine's isready"""
+    result = subprocess.run([sys.executable, '-c', LOAD_PROBE], cwd=target_dir,
+                            check=True, capture_output=True, text=True)
+    found, *loaded = result.stdout.splitlines()[-1].split()
+    return found == '1', loaded
+
+
+def check(target_dir, budget_ms):
+    """list of failures, empty if startup is within budget"""
+    rows = import_times(target_dir)
+    failures = []
+
+    total_ms = next(cumulative for _, cumulative, name in rows if name == 'engine.uci.handler') / 1000
+    if total_ms > budget_ms:
+        failures.append(f'import engine.uci.handler took {total_ms:.1f} ms, budget {budget_ms} ms')
+
+    for _, cumulative, name in rows:
+        if name.split('.')[0] in DEFERRED_MODULES:
+            failures.append(f'{name} imported at startup ({cumulative / 1000:.1f} ms)')
+
+    found, loaded = load_imports(target_dir)
+    if not found and loaded:
+        failures.append(f"isready imported {', '.join(loaded)} with no book or tablebase present")
+    return failures
+
+
+def benchmark(target_dir, runs):
+    # one untimed run so the first sample isn't paying for a cold disk cache
+    time_import(target_dir, 1)
+    interpreter = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        interpreter.append(time.perf_counter() - t0)
+
+    imports = time_import(target_dir, runs)
+    uciok = time_uciok(target_dir, runs)
+
+    print(f'Engine: {target_dir} ({runs} runs, medians)')
+    print('=' * BAR_WIDTH)
+    print(f"{'bare interpreter':<28}{_median_ms(interpreter):>10.1f} ms")
+    print(f"{'import engine.uci.handler':<28}{_median_ms(imports):>10.1f} ms")
+    print(f"{'spawn to uciok':<28}{_median_ms(uciok):>10.1f} ms")
+    print('-' * BAR_WIDTH)
+    print(f"{'self [ms]':>10}{'cumulative [ms]':>18}   module")
+    for self_us, cumulative_us, name in sorted(import_times(target_dir), reverse=True)[:TOP_MODULES]:
+        print(f'{self_us / 1000:>10.1f}{cumulative_us / 1000:>18.1f}   {name}')
+    print('=' * BAR_WIDTH)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('engine', nargs='?', default='sophia')
+    parser.add_argument('runs', nargs='?', type=int, default=10)
+    parser.add_argument('--check', action='store_true', help='fail if startup is over budget')
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_MS, help='import budget for --check, ms')
+    args = parser.parse_args()
+    target_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.engine)
+
+    if not args.check:
+        benchmark(target_dir, args.runs)
+        return
+
+    failures = check(target_dir, args.budget)
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    if failures: sys.exit(1)
+    print(f'startup ok: within {args.budget:g} ms, no deferred modules imported early')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,23 @@
 from gui.config import Config
 from gui.coordinator import ParallelTournament
+from gui.async_coordinator import AsyncTournament
 from gui.sequential import SequentialTournament
 
 if __name__ == '__main__':
     # 'tui' = parallel games with live ANSI dashboard
     # 'gui' = sequential games with pygame board
     # 'headless' = gui but with no terminal output
+    # 'async' = like tui, but every game runs on one event loop in this process
     mode = 'gui'
 
     # engines
     new = 'sophia/engine.sh'
     old = 'sophia/engine.sh'
 
+    # sprt: stop each round as soon as SPRT(elo0, elo1) decides — games is then a cap
+    sprt = False
+    elo0, elo1 = 0, 5
+
     # rounds
     # (time_control_secs, increment_secs, total_games)
     rounds = [
@@ -31,10 +37,15 @@ if __name__ == '__main__':
             time_control=tc,
             increment=inc,
             total_games=games,
+            sprt=sprt,
+            elo0=elo0,
+            elo1=elo1,
         )
 
         if mode == 'gui':
             SequentialTournament(config).run()
+        elif mode == 'async':
+            AsyncTournament(config).run()
         elif mode == 'headless':
             ParallelTournament(config, headless=True).run()
         else:
@@ -0,0 +1,353 @@
+"""
+streaming, resumable annotation over a pool of long-lived UCI engines
+
+shared by annotate_fens.py (WDL labels) and annotate_fens_cp.py (CP labels).
+the input is read lazily and deduplicated as it streams; a feeder thread fills
+a bounded queue with fixed-size batches, each worker process owns one engine
+for its whole life (restarted only if it dies) and the main process writes
+results back in input order, so neither the input nor the output is ever held
+in memory. dedup keys go to a disk-backed key set, <output>.keys; only the keys
+of batches in flight or written since the last checkpoint are kept in memory
+
+every CHECKPOINT_EVERY seconds the output is flushed + fsynced and
+<output>.ckpt records the input byte offset and output size reached. rerunning
+the same command after a crash truncates the output to the checkpoint and
+resumes from that input offset; the checkpoint and key set are removed once
+the run ends. a worker process that dies takes its batch with it, so the run
+stops there and the rerun resumes from the last checkpoint
+"""
+
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import multiprocessing as mp
+
+import chess
+import chess.engine
+
+from dedup_filter import DiskKeySet
+
+BATCH_SIZE       = 64     # positions per work item
+QUEUE_BATCHES    = 4      # queued batches per worker (bounds memory + reorder buffer)
+CHECKPOINT_EVERY = 30.0   # seconds between checkpoints
+REPORT_EVERY     = 10.0   # seconds between progress lines
+MIN_PIECES       = 6      # ≤5 pieces is syzygy territory — dropped
+
+
+def checkpoint_path(output_file):
+    return f'{output_file}.ckpt'
+
+
+def keys_path(output_file):
+    return f'{output_file}.keys'
+
+
+def _fen_key(fen):
+    # stable across processes, unlike hash(), since the key set outlives the run
+    return int.from_bytes(hashlib.blake2b(fen.encode(), digest_size=8).digest(), 'little')
+
+
+class _Dedup:
+    """
+    input dedup shared by the feeder thread and the writer
+
+    keys whose output is checkpointed live in the DiskKeySet; keys of batches
+    still in flight or written since the last checkpoint are held in memory.
+    keys only reach the disk after the checkpoint covering them, so a resume
+    never drops a line as a duplicate of one it hasn't written (a crash between
+    the two at worst lets a duplicate through)
+    """
+
+    def __init__(self, path):
+        self.keys = DiskKeySet(path)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._batches = {}
+        self._written = []
+
+    def claim(self, key):
+        """False if key was already seen, else reserves it"""
+        with self._lock:
+            if key in self._pending or key in self.keys:
+                return False
+            self._pending.add(key)
+            return True
+
+    def dispatched(self, seq, keys):
+        with self._lock:
+            self._batches[seq] = keys
+
+    def written(self, seq):
+        with self._lock:
+            self._written.extend(self._batches.pop(seq))
+
+    def commit(self):
+        """move the keys of written batches to disk, once a checkpoint covers them"""
+        with self._lock:
+            for key in self._written:
+                self.keys.add(key)
+                self._pending.discard(key)
+            self._written.clear()
+            self.keys.flush()
+
+    def close(self):
+        self.keys.close()
+
+
+def _load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _open_engine(engine_path, options):
+    engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    engine.configure(options)
+    return engine
+
+
+def _worker(engine_path, options, depth, label_fn, work_q, result_q):
+    engine = None
+    restarts = 0
+    limit = chess.engine.Limit(depth=depth)
+    try:
+        while True:
+            item = work_q.get()
+            if item is None:
+                break
+            seq, end_offset, fens = item
+            lines = []
+            skipped = 0
+            for fen in fens:
+                try:
+                    board = chess.Board(fen)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if len(board.piece_map()) < MIN_PIECES:
+                    skipped += 1
+                    continue
+
+                info = None
+                for _ in range(2):  # one retry on a fresh engine if it died mid-search
+                    try:
+                        if engine is None:
+                            engine = _open_engine(engine_path, options)
+                        info = engine.analyse(board, limit)
+                        break
+                    except chess.engine.EngineTerminatedError:
+                        engine = None
+                        restarts += 1
+                    except chess.engine.EngineError:
+                        break
+
+                label = label_fn(info) if info is not None else None
+                if label is None:
+                    skipped += 1
+                    continue
+                lines.append(f'{fen} | {label}\n')
+            result_q.put((seq, end_offset, lines, skipped, restarts))
+            restarts = 0
+    finally:
+        if engine is not None:
+            try:
+                engine.quit()
+            except chess.engine.EngineError:
+                pass
+
+
+def _iter_input(path, start_offset):
+    """(end_offset, fen) per non-empty line, from a byte offset"""
+    with open(path, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for raw in f:
+            offset += len(raw)
+            line = raw.decode().strip()
+            if not line:
+                continue
+            yield offset, line.split(' | ')[0].strip()
+
+
+def _feeder(path, start_offset, dedup, work_q, n_workers, state):
+    batch = []
+    batch_keys = []
+    seq = 0
+    end = start_offset
+    try:
+        for end, fen in _iter_input(path, start_offset):
+            key = _fen_key(fen)
+            if not dedup.claim(key):
+                state['dupes'] += 1
+                continue
+            batch.append(fen)
+            batch_keys.append(key)
+            if len(batch) == BATCH_SIZE:
+                dedup.dispatched(seq, batch_keys)
+                work_q.put((seq, end, batch))
+                seq += 1
+                batch = []
+                batch_keys = []
+        if batch:
+            dedup.dispatched(seq, batch_keys)
+            work_q.put((seq, end, batch))
+            seq += 1
+    except BaseException as e:
+        state['error'] = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        # the batches already queued still drain, so run() stops waiting at seq either way
+        state['batches'] = seq
+        for _ in range(n_workers):
+            work_q.put(None)
+
+
+def run(input_file, output_file, engine_path, options, depth, n_workers, label_fn, label_desc):
+    """annotate input_file -> output_file; label_fn(info) returns the label text or None"""
+    ckpt_path = checkpoint_path(output_file)
+    ckpt = _load_checkpoint(ckpt_path)
+
+    if ckpt is None and os.path.exists(output_file):
+        print(f'output already exists, refusing to overwrite labelled data: {output_file}')
+        sys.exit(1)
+    if ckpt is not None and ckpt.get('input') != os.path.abspath(input_file):
+        print(f'checkpoint {ckpt_path} belongs to {ckpt.get("input")}, not {input_file}')
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+
+    # a resume keeps the key set of the consumed prefix; a fresh run starts a new one
+    start_offset = 0
+    written = skipped = 0
+    if ckpt is None and os.path.exists(keys_path(output_file)):
+        os.remove(keys_path(output_file))
+    if ckpt is not None:
+        start_offset = ckpt['input_offset']
+        written, skipped = ckpt['written'], ckpt['skipped']
+        with open(output_file, 'r+b') as f:
+            f.truncate(ckpt['output_size'])
+        print(f'resuming from checkpoint: input offset {start_offset:,}, '
+              f'{written:,} written, {skipped:,} skipped', flush=True)
+
+    input_size = os.path.getsize(input_file)
+    print(f'annotating {input_file} with {label_desc} at depth {depth}, '
+          f'{n_workers} workers\n', flush=True)
+
+    work_q = mp.Queue(maxsize=n_workers * QUEUE_BATCHES)
+    result_q = mp.Queue()
+    workers = [
+        mp.Process(target=_worker,
+                   args=(engine_path, options, depth, label_fn, work_q, result_q),
+                   daemon=True)
+        for _ in range(n_workers)
+    ]
+    for p in workers:
+        p.start()
+
+    dedup = _Dedup(keys_path(output_file))
+    feed_state = {'batches': None, 'dupes': 0, 'error': None}
+    feeder = threading.Thread(target=_feeder,
+                              args=(input_file, start_offset, dedup, work_q, n_workers, feed_state),
+                              daemon=True)
+    feeder.start()
+
+    t_start = last_report = last_ckpt = time.monotonic()
+    run_written = 0
+    restarts = 0
+    reorder = {}
+    next_seq = 0
+    offset = start_offset
+
+    out = open(output_file, 'ab')
+    try:
+        while feed_state['batches'] is None or next_seq < feed_state['batches']:
+            # a worker only exits cleanly on its sentinel; any other exit lost a batch
+            failed = [p.exitcode for p in workers if p.exitcode not in (None, 0)]
+            if failed:
+                print(f'a worker exited with code {failed[0]}, losing its batch — rerun to '
+                      f'resume from the last checkpoint', flush=True)
+                sys.exit(1)
+            try:
+                seq, end_offset, lines, n_skipped, n_restarts = result_q.get(timeout=1.0)
+            except queue.Empty:
+                if feed_state['batches'] is not None and next_seq >= feed_state['batches']:
+                    continue  # the feeder finished while this waited
+                if not any(p.is_alive() for p in workers):
+                    print('all workers exited with batches outstanding — rerun to resume '
+                          'from the last checkpoint', flush=True)
+                    sys.exit(1)
+                continue
+
+            reorder[seq] = (end_offset, lines, n_skipped)
+            restarts += n_restarts
+            while next_seq in reorder:
+                end_offset, lines, n_skipped = reorder.pop(next_seq)
+                out.write(''.join(lines).encode())
+                written += len(lines)
+                run_written += len(lines)
+                skipped += n_skipped
+                offset = end_offset
+                dedup.written(next_seq)
+                next_seq += 1
+
+            now = time.monotonic()
+            if now - last_ckpt >= CHECKPOINT_EVERY:
+                last_ckpt = now
+                out.flush()
+                os.fsync(out.fileno())
+                _save_checkpoint(ckpt_path, {
+                    'input': os.path.abspath(input_file),
+                    'input_offset': offset,
+                    'output_size': out.tell(),
+                    'written': written,
+                    'skipped': skipped,
+                })
+                dedup.commit()
+            if now - last_report >= REPORT_EVERY:
+                last_report = now
+                elapsed = now - t_start
+                rate = run_written / elapsed if elapsed > 0 else 0
+                done = (offset - start_offset) / max(1, input_size - start_offset)
+                eta = elapsed / done - elapsed if done > 0 else 0
+                print(f'  {written:,} written, {skipped:,} skipped, '
+                      f'{100 * offset / max(1, input_size):.1f}% of input, '
+                      f'{rate:.0f}/s, ETA {eta / 60:.1f}m, {restarts} engine restarts', flush=True)
+
+        if feed_state['error'] is not None:
+            print(f'reading {input_file} failed ({feed_state["error"]}) — fix it and rerun to resume from '
+                  f'the last checkpoint', flush=True)
+            sys.exit(1)
+    except BaseException:
+        # interrupted or failed: don't block exit flushing the work queue into dead workers
+        work_q.cancel_join_thread()
+        for p in workers:
+            p.terminate()
+        raise
+    finally:
+        out.close()
+        dedup.close()
+
+    for p in workers:
+        p.join()
+    for path in (ckpt_path, keys_path(output_file)):
+        if os.path.exists(path):
+            os.remove(path)
+
+    elapsed = time.monotonic() - t_start
+    rate = run_written / elapsed if elapsed > 0 else 0
+    print(f'\nDone: {written:,} positions -> {output_file}  ({elapsed:.0f}s, {rate:.0f}/s, '
+          f'{skipped:,} skipped, {feed_state["dupes"]:,} duplicates removed, '
+          f'{restarts} engine restarts)')
+    return written
@@ -157,9 +157,11 @@ def search_fen(fen, depth, nodes):
     from engine.core.constants import INFINITE_TIME
     import engine.core.constants as _const
     from engine.search.search import SearchEngine
+    import engine.uci.utils as uci_utils
 
     state = load_from_fen(fen)
     _const.DEBUG = True
+    uci_utils.INFO_INTERVAL = 0  # every depth's info line, not the rate-limited few
     buf = io.StringIO()
     with contextlib.redirect_stdout(buf):
         engine = SearchEngine()
@@ -1,4 +1,10 @@
-"""compare multiple eval candidates head-to-head using fixed-node game matches"""
+"""
+compare multiple eval candidates head-to-head using fixed-node game matches
+
+games run in-process by default (see inprocess_match.py): each worker loads the
+engine once and swaps the candidates' parameters per move. --uci plays through
+engine.sh subprocesses instead, e.g. to check a result against the real binary
+"""
 
 import argparse
 import json
@@ -13,6 +19,8 @@ from pathlib import Path
 import chess
 import chess.engine
 
+import inprocess_match
+
 ROOT = Path(__file__).resolve().parents[1]
 ENGINE_CMD = [str(ROOT / "sophia" / "engine.sh")]
 OPENINGS_FILE = ROOT / "gui" / "assets" / "openings.txt"
@@ -30,6 +38,7 @@ def parse_args():
     parser.add_argument("--parallel", type=int, default=4)
     parser.add_argument("--seed", type=int, default=20260621)
     parser.add_argument("--out")
+    parser.add_argument("--uci", action="store_true", help="play through engine.sh subprocesses")
     return parser.parse_args()
 
 
@@ -123,16 +132,10 @@ def play_chunk(args):
     return scores
 
 
-def run_match(candidate_a, candidate_b, n_games, n_parallel, openings):
+def run_match_uci(candidate_a, candidate_b, games, n_parallel):
     path_a = write_temp_candidate(candidate_a)
     path_b = write_temp_candidate(candidate_b)
     try:
-        games = []
-        for _ in range(n_games // 2):
-            fen = random.choice(openings)
-            games.append((fen, True))
-            games.append((fen, False))
-
         chunks = [[] for _ in range(n_parallel)]
         for i, game in enumerate(games):
             chunks[i % n_parallel].append(game)
@@ -159,8 +162,12 @@ def main():
     random.seed(args.seed)
     candidate_a = load_candidate(args.candidate_a)
     candidate_b = load_candidate(args.candidate_b)
-    openings = load_openings()
-    score, played = run_match(candidate_a, candidate_b, args.games, args.parallel, openings)
+    games = inprocess_match.paired_games(load_openings(), args.games)
+    if args.uci:
+        score, played = run_match_uci(candidate_a, candidate_b, games, args.parallel)
+    else:
+        score, played = inprocess_match.run_match(candidate_a, candidate_b, games, args.parallel,
+                                                  NODES_PER_MOVE, MAX_PLIES)
 
     report = {
         "candidate_a": str(Path(args.candidate_a).resolve()) if candidate_a else "baseline",
@@ -170,6 +177,7 @@ def main():
         "score_fraction_for_a": score / played,
         "nodes_per_move": NODES_PER_MOVE,
         "parallel": args.parallel,
+        "mode": "uci" if args.uci else "in-process",
         "seed": args.seed,
     }
     out_path = Path(args.out).resolve() if args.out else default_out(args.candidate_a, args.candidate_b)
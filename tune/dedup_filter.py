@@ -0,0 +1,259 @@
+"""
+deduplicate and filter a position dataset into the packed binary format
+
+dedup is keyed on the engine's 64-bit Zobrist key (clocks aren't hashed, so
+the same position at a different move number counts as a duplicate). keys
+live in a memory-mapped open-addressing table on disk (<output>.keys by
+default), so memory stays bounded on tens of millions of positions and the
+same index can be passed to later runs to dedup new data against old
+
+positions are dropped when:
+  - the side to move is in check
+  - there is no legal quiet move (every move captures or promotes, or none)
+  - the qsearch score differs from the static eval (tactics still pending)
+
+input is either packed records (.bin) or "fen | label" text; text labels are
+read as WDL expected scores by default, or as white-relative centipawns with
+--labels cp (stored in the score field, result left unknown)
+
+usage:
+    venv/bin/python tune/dedup_filter.py tune/data/fens_wdl.txt tune/data/fens_wdl.bin
+    venv/bin/python tune/dedup_filter.py new.bin out.bin --index tune/data/all.keys
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'sophia'))
+
+from engine.board.fen_parser import load_from_fen
+from engine.moves.generator import get_legal_moves
+from engine.moves.legality import is_in_check
+from engine.core.move import CAPTURE_FLAG, PROMO_FLAG
+from engine.search.evaluation import evaluate
+from engine.search.search import SearchEngine
+
+import packed_positions as packed
+
+_KEYSET_MAGIC = b'SOPHKEYS'
+_KEYSET_HEADER = struct.Struct('<8sQQ')   # magic, capacity, count
+_KEYSET_HEADER_SIZE = 64                 # keeps the slot array 8-byte aligned
+MAX_LOAD = 0.7
+REPORT_EVERY = 10.0
+
+
+class DiskKeySet:
+    """
+    set of non-zero u64 keys in a memory-mapped linear-probing table
+
+    capacity is a power of two; the table doubles (rehashing into a fresh
+    file) once it passes MAX_LOAD. key 0 marks an empty slot, so a genuine 0
+    key is stored as 1 — one collision in 2^64 is fine for dedup
+    """
+
+    def __init__(self, path, capacity=1 << 20):
+        self.path = path
+        if os.path.exists(path):
+            self._open()
+        else:
+            self._create(path, _next_pow2(capacity))
+            self._open()
+
+    def _create(self, path, capacity):
+        with open(path, 'wb') as f:
+            f.write(_KEYSET_HEADER.pack(_KEYSET_MAGIC, capacity, 0).ljust(_KEYSET_HEADER_SIZE, b'\0'))
+            f.truncate(_KEYSET_HEADER_SIZE + capacity * 8)
+
+    def _open(self):
+        self._file = open(self.path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, self.capacity, self.count = _KEYSET_HEADER.unpack_from(self._mm)
+        if magic != _KEYSET_MAGIC:
+            raise ValueError(f'{self.path} is not a key index')
+        self._mask = self.capacity - 1
+        self._slots = memoryview(self._mm)[_KEYSET_HEADER_SIZE:].cast('Q')
+
+    def _close_map(self):
+        self._slots.release()
+        self._mm.close()
+        self._file.close()
+
+    def __contains__(self, key):
+        key = key or 1
+        slots = self._slots
+        mask = self._mask
+        i = key & mask
+        while True:
+            k = slots[i]
+            if k == key:
+                return True
+            if k == 0:
+                return False
+            i = (i + 1) & mask
+
+    def add(self, key):
+        """insert key; returns False if it was already present"""
+        key = key or 1
+        slots = self._slots
+        mask = self._mask
+        i = key & mask
+        while True:
+            k = slots[i]
+            if k == key:
+                return False
+            if k == 0:
+                slots[i] = key
+                self.count += 1
+                if self.count > self.capacity * MAX_LOAD:
+                    self._grow()
+                return True
+            i = (i + 1) & mask
+
+    def _grow(self):
+        tmp = f'{self.path}.grow'
+        new_capacity = self.capacity * 2
+        self._create(tmp, new_capacity)
+        with open(tmp, 'r+b') as f:
+            mm = mmap.mmap(f.fileno(), 0)
+            dst = memoryview(mm)[_KEYSET_HEADER_SIZE:].cast('Q')
+            mask = new_capacity - 1
+            for k in self._slots:
+                if k:
+                    i = k & mask
+                    while dst[i]:
+                        i = (i + 1) & mask
+                    dst[i] = k
+            _KEYSET_HEADER.pack_into(mm, 0, _KEYSET_MAGIC, new_capacity, self.count)
+            dst.release()
+            mm.close()
+        self._close_map()
+        os.replace(tmp, self.path)
+        self._open()
+
+    def flush(self):
+        _KEYSET_HEADER.pack_into(self._mm, 0, _KEYSET_MAGIC, self.capacity, self.count)
+        self._mm.flush()
+
+    def close(self):
+        self.flush()
+        self._close_map()
+
+
+def _next_pow2(n):
+    p = 1
+    while p < n:
+        p <<= 1
+    return p
+
+
+def iter_input(path, labels):
+    """(state, result, score) per input position"""
+    if path.endswith('.bin'):
+        for rec in packed.iter_records(path):
+            fen, result, score, _ = packed.unpack(rec)
+            yield load_from_fen(fen), result, score
+        return
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            fen, _, label = line.partition(' | ')
+            try:
+                state = load_from_fen(fen.strip())
+            except (ValueError, KeyError, IndexError):
+                continue
+            if not label:
+                yield state, packed.RESULT_UNKNOWN, 0
+            elif labels == 'cp':
+                yield state, packed.RESULT_UNKNOWN, int(float(label))
+            else:
+                yield state, packed.result_from_label(label), 0
+
+
+def has_quiet_move(state):
+    for move in get_legal_moves(state):
+        if not move & (CAPTURE_FLAG | PROMO_FLAG):
+            return True
+    return False
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--index', help='persistent key index (default <output>.keys)')
+    parser.add_argument('--capacity', type=int, default=1 << 22,
+                        help='initial key slots for a new index (grows automatically)')
+    parser.add_argument('--labels', choices=['wdl', 'cp'], default='wdl')
+    parser.add_argument('--keep-tactical', action='store_true',
+                        help='skip the qsearch == static eval filter')
+    parser.add_argument('--overwrite', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.input):
+        print(f'input not found: {args.input}', file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(args.output) and not args.overwrite:
+        print(f'refusing to overwrite existing output: {args.output}', file=sys.stderr)
+        sys.exit(1)
+
+    index_path = args.index or f'{args.output}.keys'
+    if not args.index and args.overwrite and os.path.exists(index_path):
+        os.remove(index_path)  # the default index belongs to the output being replaced
+    keys = DiskKeySet(index_path, args.capacity)
+    print(f'key index {index_path}: {keys.count:,} keys, {keys.capacity:,} slots', flush=True)
+
+    engine = SearchEngine()
+
+    counts = {'read': 0, 'duplicate': 0, 'in_check': 0, 'no_quiet': 0, 'tactical': 0, 'kept': 0}
+    t0 = last = time.monotonic()
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    try:
+        with open(args.output, 'wb') as out:
+            for state, result, score in iter_input(args.input, args.labels):
+                counts['read'] += 1
+                if not keys.add(state.hash):
+                    counts['duplicate'] += 1
+                    continue
+                if is_in_check(state, state.is_white):
+                    counts['in_check'] += 1
+                    continue
+                if not has_quiet_move(state):
+                    counts['no_quiet'] += 1
+                    continue
+                if not args.keep_tactical:
+                    static = evaluate(state, engine.pawn_hash)
+                    if engine.quiescence(state) != static:
+                        counts['tactical'] += 1
+                        continue
+
+                out.write(packed.pack_state(state, result, score))
+                counts['kept'] += 1
+
+                now = time.monotonic()
+                if now - last >= REPORT_EVERY:
+                    last = now
+                    print(f"  {counts['read']:,} read, {counts['kept']:,} kept "
+                          f"({counts['read'] / (now - t0):.0f}/s)", flush=True)
+    finally:
+        keys.close()
+
+    elapsed = time.monotonic() - t0
+    print(f"done in {elapsed:.0f}s: {counts['read']:,} read -> {counts['kept']:,} kept -> {args.output}")
+    for name in ['duplicate', 'in_check', 'no_quiet', 'tactical']:
+        pct = 100.0 * counts[name] / counts['read'] if counts['read'] else 0.0
+        print(f'  dropped {name}: {counts[name]:,} ({pct:.1f}%)')
+
+
+if __name__ == '__main__':
+    main()
@@ -86,6 +86,7 @@ def worker(args):
     # stdout per iteration. Both flood the log and stall on the write.
     import engine.search.search as _search  # silence UCI output flooding the log
     _search.send_command = lambda *a, **k: None
+    _search.send_info = lambda *a, **k: None
     _search.send_info_string = lambda *a, **k: None
     engine = SearchEngine()
     with open(OPENINGS_FILE) as f:
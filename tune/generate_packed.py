@@ -0,0 +1,202 @@
+"""
+fixed-node self-play generator streaming the packed position format
+
+each worker process keeps one SearchEngine for its whole life and plays games
+purely on the engine State — legality, mate, stalemate, repetition and the
+fifty-move rule all come from the engine, no python-chess board alongside.
+a game's positions are labelled when it ends and appended to the output
+straight away (see packed_positions.py for the record layout), deduplicated on
+the Zobrist key
+
+rerunning on an existing output resumes: a torn trailing record is dropped,
+existing keys seed the dedup set and existing records count toward the target
+
+usage:
+    venv/bin/python tune/generate_packed.py [output.bin] [num_positions] [nodes] [num_workers]
+"""
+
+import os
+import sys
+import time
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'sophia'))
+
+from engine.board.fen_parser import load_from_fen
+from engine.board.move_exec import make_move, has_insufficient_material
+from engine.moves.generator import get_legal_moves
+from engine.moves.legality import is_in_check
+from engine.core.move import move_to_uci
+from engine.core.constants import INFINITE_TIME, FIFTY_MOVE_LIMIT
+from engine.search.search import SearchEngine
+
+import packed_positions as packed
+
+OUTPUT_FILE   = sys.argv[1] if len(sys.argv) > 1 else 'tune/data/selfplay.bin'
+NUM_POSITIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+NODES         = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+NUM_WORKERS   = int(sys.argv[4]) if len(sys.argv) > 4 else max(1, multiprocessing.cpu_count() - 1)
+OPENINGS_FILE = os.path.join(ROOT, 'gui', 'assets', 'openings.txt')
+TT_SIZE_MB    = 16    # cleared every game; fixed-node games don't fill more
+MIN_MOVE      = 4
+TAIL_SKIP     = 8
+MAX_PLIES     = 300
+REPORT_EVERY  = 10.0  # seconds
+
+
+_engine = None
+_openings = None
+
+
+def _init_worker():
+    global _engine, _openings
+    # same silencing as generate_fens.py — per-iteration info lines flood the pipe
+    import engine.search.search as _search
+    _search.send_command = lambda *a, **k: None
+    _search.send_info = lambda *a, **k: None
+    _search.send_info_string = lambda *a, **k: None
+    _engine = SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=TT_SIZE_MB)
+    with open(OPENINGS_FILE) as f:
+        _openings = [line.strip() for line in f if line.strip()]
+
+
+def play_game(engine, opening_fen, nodes):
+    state = load_from_fen(opening_fen + ' 0 1')
+    records = []
+    seen = {}
+    nodes_total = 0
+
+    while True:
+        moves = get_legal_moves(state)
+        if not moves:
+            if is_in_check(state, state.is_white):
+                result = packed.RESULT_BLACK if state.is_white else packed.RESULT_WHITE
+            else:
+                result = packed.RESULT_DRAW
+            break
+
+        seen[state.hash] = seen.get(state.hash, 0) + 1
+        if (seen[state.hash] >= 3 or state.halfmove_clock >= FIFTY_MOVE_LIMIT
+                or len(records) > MAX_PLIES or has_insufficient_material(state)):
+            result = packed.RESULT_DRAW
+            break
+
+        # search a clone: a node-limit abort unwinds without unmaking the line
+        move = engine.get_best_move(state.clone(), INFINITE_TIME, None, nodes)
+        nodes_total += engine.nodes_searched
+        if isinstance(move, str):  # syzygy hit returns a uci string, not an int move
+            move = next((m for m in moves if move_to_uci(m) == move), None)
+        if move is None:
+            move = random.choice(moves)
+
+        # root entry holds the last completed iteration's score (side to move)
+        entry = engine.tt.probe_entry(state.hash)
+        score = entry[2] if entry else 0
+        records.append(packed.pack_state(state, packed.RESULT_UNKNOWN,
+                                         score if state.is_white else -score))
+        make_move(state, move)
+
+    total = len(records)
+    kept = [packed.with_result(rec, result)
+            for idx, rec in enumerate(records)
+            if MIN_MOVE <= idx < total - TAIL_SKIP]
+    return kept, nodes_total
+
+
+def run_game(seed):
+    random.seed(seed)
+    _engine.tt.clear()
+    _engine.ordering.clear()
+    t0 = time.perf_counter()
+    try:
+        records, nodes = play_game(_engine, random.choice(_openings), NODES)
+    except Exception:
+        # never let one bad game kill the worker (and thus the whole pool)
+        records, nodes = None, 0
+    return records, nodes, time.perf_counter() - t0
+
+
+def load_existing(path):
+    kept = packed.truncate_partial(path)
+    seen = set()
+    if kept:
+        for rec in packed.iter_records(path):
+            seen.add(packed.record_hash(rec))
+    return kept, seen
+
+
+def main():
+    os.makedirs(os.path.dirname(OUTPUT_FILE) or '.', exist_ok=True)
+
+    existing, seen = load_existing(OUTPUT_FILE)
+    remaining = NUM_POSITIONS - existing
+    if existing:
+        print(f'resuming {OUTPUT_FILE}: {existing} records ({len(seen)} unique keys)', flush=True)
+    if remaining <= 0:
+        print(f'target of {NUM_POSITIONS} positions already reached')
+        return
+
+    print(f'generating {remaining} positions with {NUM_WORKERS} workers at {NODES} nodes/move...',
+          flush=True)
+
+    # fresh seeds per run so a resumed run doesn't replay the same openings
+    seeds = iter(range(random.SystemRandom().getrandbits(48), 1 << 62))
+    written = games = dupes = errors = 0
+    nodes_total = 0
+    busy = 0.0
+    start = last_report = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS, initializer=_init_worker) as pool, \
+         open(OUTPUT_FILE, 'ab') as out:
+        # keep a couple of games queued per worker — bounded, unlike map() over an endless range
+        pending = {pool.submit(run_game, next(seeds)) for _ in range(NUM_WORKERS * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                records, nodes, elapsed = fut.result()
+                busy += elapsed
+                nodes_total += nodes
+                if records is None:
+                    errors += 1
+                else:
+                    games += 1
+                    fresh = []
+                    for rec in records:
+                        key = packed.record_hash(rec)
+                        if key in seen:
+                            dupes += 1
+                            continue
+                        seen.add(key)
+                        fresh.append(rec)
+                    fresh = fresh[:remaining - written]
+                    out.write(b''.join(fresh))
+                    out.flush()
+                    written += len(fresh)
+
+                if written < remaining:
+                    pending.add(pool.submit(run_game, next(seeds)))
+
+            now = time.perf_counter()
+            if now - last_report >= REPORT_EVERY or written >= remaining:
+                last_report = now
+                wall = now - start
+                print(f'  {existing + written}/{NUM_POSITIONS} positions, {games} games, '
+                      f'{dupes} dupes, {errors} skipped | '
+                      f'{written / wall:.0f} pos/s total, '
+                      f'{written / busy if busy else 0:.0f} pos/s/core, '
+                      f'{nodes_total / busy if busy else 0:.0f} nps/core', flush=True)
+
+            if written >= remaining:
+                for fut in pending:
+                    fut.cancel()
+                break
+
+    print(f'done: {written} positions appended to {OUTPUT_FILE} '
+          f'({existing + written} total)')
+
+
+if __name__ == '__main__':
+    main()
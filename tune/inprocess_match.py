@@ -0,0 +1,145 @@
+"""
+fixed-node matches between two parameter sets without UCI engine processes
+
+each pool worker imports the engine once and keeps one SearchEngine per side
+(separate TT and pawn hash, since both hold scores computed under that side's
+parameters). before every move the mover's set is swapped in through
+engine.search.params.load_params and the move comes straight from
+SearchEngine.get_best_move(nodes_limit=...), so a game costs its search and
+nothing else — no engine.sh spawn, no position/bestmove text round-trips
+
+games are played on the engine State like generate_packed.py: mate, stalemate,
+threefold repetition, the fifty-move rule and insufficient material all come
+from the engine, no python-chess board alongside
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'sophia'))
+
+from engine.board.fen_parser import load_from_fen
+from engine.board.move_exec import make_move, has_insufficient_material
+from engine.moves.generator import get_legal_moves
+from engine.moves.legality import is_in_check
+from engine.core.move import move_to_uci
+from engine.core.constants import INFINITE_TIME, FIFTY_MOVE_LIMIT
+from engine.search.evaluation import calculate_initial_score
+from engine.search.params import load_params
+from engine.search.search import SearchEngine
+
+TT_SIZE_MB = 16  # cleared every game; fixed-node games don't fill more
+
+_sides = None   # [(params, SearchEngine)] for side a, side b
+_active = None  # index of the side whose params are loaded
+_nodes = None
+_max_plies = None
+
+
+def _init_worker(params_a, params_b, nodes, max_plies):
+    global _sides, _active, _nodes, _max_plies
+    # per-iteration info lines are wasted work with no gui to read them
+    import engine.search.search as _search
+    _search.send_command = lambda *a, **k: None
+    _search.send_info = lambda *a, **k: None
+    _search.send_info_string = lambda *a, **k: None
+    _sides = [(params_a, SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=TT_SIZE_MB)),
+              (params_b, SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=TT_SIZE_MB))]
+    _active = None
+    _nodes = nodes
+    _max_plies = max_plies
+
+
+def _select(side):
+    """load side's parameters (if not already loaded) and return its engine"""
+    global _active
+    params, engine = _sides[side]
+    if _active != side:
+        if _active is None or params != _sides[_active][0]:
+            load_params(params)
+        _active = side
+    return engine
+
+
+def _search_move(side, state, moves):
+    engine = _select(side)
+    # search a clone: a node-limit abort unwinds without unmaking the line, and
+    # the clone's mg/eg sums are rescored under the mover's tables
+    search_state = state.clone()
+    search_state.mg_score, search_state.eg_score, search_state.phase = calculate_initial_score(search_state)
+    move = engine.get_best_move(search_state, INFINITE_TIME, None, _nodes)
+    if isinstance(move, str):  # syzygy hit returns a uci string, not an int move
+        move = next((m for m in moves if move_to_uci(m) == move), None)
+    return move
+
+
+def play_game(spec):
+    """score for side a of one game; spec is (opening_fen, a_is_white)"""
+    opening_fen, a_is_white = spec
+    for _, engine in _sides:
+        engine.tt.clear()
+        engine.ordering.clear()
+
+    state = load_from_fen(opening_fen + ' 0 1')
+    seen = {}
+    plies = 0
+
+    while True:
+        moves = get_legal_moves(state)
+        a_to_move = bool(state.is_white) == a_is_white
+        if not moves:
+            if is_in_check(state, state.is_white):
+                return 0.0 if a_to_move else 1.0
+            return 0.5
+
+        seen[state.hash] = seen.get(state.hash, 0) + 1
+        if (seen[state.hash] >= 3 or state.halfmove_clock >= FIFTY_MOVE_LIMIT
+                or plies >= _max_plies or has_insufficient_material(state)):
+            return 0.5
+
+        try:
+            move = _search_move(0 if a_to_move else 1, state, moves)
+        except Exception:
+            move = None
+        if move is None or move not in moves:
+            # the side that failed to produce a legal move forfeits, as over UCI
+            return 0.0 if a_to_move else 1.0
+        make_move(state, move)
+        plies += 1
+
+
+def play_pair(opening_fen):
+    """side a's points (0 to 2) over both colours of one opening"""
+    return play_game((opening_fen, True)) + play_game((opening_fen, False))
+
+
+def paired_games(openings, n_games):
+    """n_games specs, each random opening played twice with colours reversed"""
+    games = []
+    for _ in range(n_games // 2):
+        fen = random.choice(openings)
+        games.append((fen, True))
+        games.append((fen, False))
+    return games
+
+
+def run_match(params_a, params_b, games, n_parallel, nodes, max_plies):
+    """(score for a, games played); params are tune json dicts, None for the defaults"""
+    with multiprocessing.Pool(n_parallel, initializer=_init_worker,
+                              initargs=(params_a, params_b, nodes, max_plies)) as pool:
+        scores = pool.map(play_game, games, chunksize=1)
+    return sum(scores), len(scores)
+
+
+def iter_pairs(params_a, params_b, fens, n_parallel, nodes, max_plies):
+    """
+    side a's points for each opening pair in fens, yielded as pairs finish (not
+    in order). closing the generator terminates the pool, so a sequential test
+    can stop mid-match without waiting for queued games
+    """
+    with multiprocessing.Pool(n_parallel, initializer=_init_worker,
+                              initargs=(params_a, params_b, nodes, max_plies)) as pool:
+        yield from pool.imap_unordered(play_pair, fens)
@@ -0,0 +1,181 @@
+"""
+compact binary position format shared by the data tools
+
+fixed 40-byte little-endian records, no header, so files can be appended to,
+concatenated, truncated back to a record boundary after a crash, and seeked
+by index:
+
+    u64  occupancy        bit per occupied square (a1 = bit 0)
+    16s  pieces           one nibble per occupied square in lsb order, low
+                          nibble first; the nibble is the engine piece code
+                          (WP..BK all fit in 4 bits)
+    u8   side_castling    bit 7 = white to move, bits 0-3 = castling rights
+    u8   en_passant       target square, 255 = none
+    u8   halfmove_clock   clamped to 255
+    u8   result           white expected score in 1/200ths: 0 = black win,
+                          100 = draw, 200 = white win, in between for
+                          engine-annotated WDL labels; 255 = unknown
+    u16  fullmove_number
+    i16  score            white-relative centipawns, clamped to +/-32000
+    u64  hash             engine Zobrist key, so dedup never has to decode
+
+label = result / 200 gives the same [0, 1] labels as the text "fen | label" files
+"""
+
+import os
+import struct
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'sophia'))
+
+from engine.core.constants import NULL, PIECE_STR
+
+RECORD = struct.Struct('<Q16sBBBBHhQ')
+RECORD_SIZE = RECORD.size
+
+RESULT_SCALE = 200
+RESULT_BLACK = 0
+RESULT_DRAW = RESULT_SCALE // 2
+RESULT_WHITE = RESULT_SCALE
+RESULT_UNKNOWN = 255
+
+NO_EP = 255
+SCORE_CLAMP = 32000
+
+# byte offsets for in-place patching of a packed record
+_RESULT_OFFSET = 8 + 16 + 3
+_SCORE_OFFSET = 8 + 16 + 4 + 2
+
+_CASTLE_CHARS = ((1, 'K'), (2, 'Q'), (4, 'k'), (8, 'q'))
+
+
+def result_from_label(label):
+    return max(0, min(RESULT_SCALE, int(round(float(label) * RESULT_SCALE))))
+
+
+def label_from_result(result):
+    return result / RESULT_SCALE
+
+
+def pack_state(state, result=RESULT_UNKNOWN, score=0):
+    board = state.board
+    occupancy = 0
+    nibbles = bytearray(16)
+    n = 0
+    for sq in range(64):
+        piece = board[sq]
+        if piece == NULL:
+            continue
+        occupancy |= 1 << sq
+        nibbles[n >> 1] |= piece << (4 * (n & 1))
+        n += 1
+
+    side_castling = (0x80 if state.is_white else 0) | (state.castling_rights & 0xF)
+    ep = state.en_passant_square
+    score = max(-SCORE_CLAMP, min(SCORE_CLAMP, int(score)))
+    return RECORD.pack(
+        occupancy, bytes(nibbles), side_castling,
+        NO_EP if ep == NULL else ep,
+        min(state.halfmove_clock, 255), result,
+        min(state.fullmove_number, 0xFFFF), score, state.hash,
+    )
+
+
+def with_result(record, result):
+    out = bytearray(record)
+    out[_RESULT_OFFSET] = result
+    return bytes(out)
+
+
+def with_score(record, score):
+    out = bytearray(record)
+    struct.pack_into('<h', out, _SCORE_OFFSET, max(-SCORE_CLAMP, min(SCORE_CLAMP, int(score))))
+    return bytes(out)
+
+
+def record_hash(record):
+    return RECORD.unpack_from(record)[8]
+
+
+def record_to_fen(record):
+    occupancy, nibbles, side_castling, ep, halfmove, _, fullmove, _, _ = RECORD.unpack(record)
+    squares = [NULL] * 64
+    n = 0
+    bb = occupancy
+    while bb:
+        sq = (bb & -bb).bit_length() - 1
+        bb &= bb - 1
+        squares[sq] = (nibbles[n >> 1] >> (4 * (n & 1))) & 0xF
+        n += 1
+
+    rows = []
+    for rank in range(7, -1, -1):
+        row = ''
+        empty = 0
+        for file in range(8):
+            piece = squares[rank * 8 + file]
+            if piece == NULL:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            row += PIECE_STR[piece]
+        if empty:
+            row += str(empty)
+        rows.append(row)
+
+    castling = ''.join(c for bit, c in _CASTLE_CHARS if side_castling & bit) or '-'
+    if ep == NO_EP:
+        ep_str = '-'
+    else:
+        ep_str = 'abcdefgh'[ep & 7] + str((ep >> 3) + 1)
+    side = 'w' if side_castling & 0x80 else 'b'
+    return f"{'/'.join(rows)} {side} {castling} {ep_str} {halfmove} {fullmove}"
+
+
+def unpack(record):
+    """(fen, result, score, hash) for one record"""
+    fields = RECORD.unpack(record)
+    return record_to_fen(record), fields[5], fields[7], fields[8]
+
+
+def iter_records(path, chunk_records=65536):
+    with open(path, 'rb') as f:
+        while True:
+            buf = f.read(RECORD_SIZE * chunk_records)
+            if not buf:
+                break
+            usable = len(buf) - len(buf) % RECORD_SIZE
+            for off in range(0, usable, RECORD_SIZE):
+                yield buf[off:off + RECORD_SIZE]
+            if usable != len(buf):
+                break
+
+
+def iter_labelled(path, labels='wdl'):
+    """(fen, label) per record for the tuners — wdl labels from the result byte,
+    cp labels from the score field; records without a wdl result are skipped"""
+    for rec in iter_records(path):
+        fen, result, score, _ = unpack(rec)
+        if labels == 'cp':
+            yield fen, float(score)
+        elif result != RESULT_UNKNOWN:
+            yield fen, label_from_result(result)
+
+
+def count_records(path):
+    return os.path.getsize(path) // RECORD_SIZE if os.path.exists(path) else 0
+
+
+def truncate_partial(path):
+    """drop a torn trailing record left by a crash mid-write; returns records kept"""
+    if not os.path.exists(path):
+        return 0
+    size = os.path.getsize(path)
+    whole = size - size % RECORD_SIZE
+    if whole != size:
+        with open(path, 'r+b') as f:
+            f.truncate(whole)
+    return whole // RECORD_SIZE
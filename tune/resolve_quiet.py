@@ -0,0 +1,157 @@
+"""
+resolve a labelled dataset to quiet positions for the eval tuners
+
+each position is run through the engine's qsearch (SearchEngine.quiescence_pv)
+and replaced by the quiet leaf at the end of its principal variation — the
+position whose static eval *is* the qsearch score — so the tuners fit the eval
+on positions with no hanging captures. labels carry over unchanged (WDL and
+white-relative CP labels both describe the root, which the capture line
+doesn't change). positions whose qsearch finds a mate are dropped
+
+output is packed records (see packed_positions.py) that texel_tune*.py read
+directly, so the resolve cost is paid once and reused by every tuning run.
+<output>.pv holds one "root fen | pv" line per record, in the same order
+
+input is packed records (.bin) or "fen | label" text, read as WDL expected
+scores by default or as white-relative centipawns with --labels cp
+
+usage:
+    venv/bin/python tune/resolve_quiet.py tune/data/fens_wdl.txt tune/data/fens_wdl_quiet.bin
+    venv/bin/python tune/resolve_quiet.py tune/data/fens_cp.txt tune/data/fens_cp_quiet.bin --labels cp
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'sophia'))
+
+from engine.board.fen_parser import load_from_fen
+from engine.board.move_exec import make_move
+from engine.core.move import move_to_uci
+from engine.core.constants import INFINITY, INFINITE_TIME
+from engine.search.search import SearchEngine
+
+import packed_positions as packed
+
+CHUNK = 256
+REPORT_EVERY = 10.0
+MATE_BOUND = INFINITY - 1000
+
+_engine = None
+
+
+def _init_worker():
+    global _engine
+    _engine = SearchEngine(time_limit=INFINITE_TIME, tt_size_mb=1)
+
+
+def _resolve(item):
+    """(leaf record, pv line, pv length) for one (fen, result, score), or None on a mate score"""
+    fen, result, score = item
+    state = load_from_fen(fen)
+    q_score, pv = _engine.quiescence_pv(state)
+    if abs(q_score) >= MATE_BOUND:
+        return None
+    for move in pv:
+        make_move(state, move)
+    return (packed.pack_state(state, result, score),
+            f"{fen} | {' '.join(move_to_uci(m) for m in pv)}\n", len(pv))
+
+
+def _resolve_chunk(items):
+    return [_resolve(item) for item in items]
+
+
+def iter_input(path, labels):
+    """(fen, result, score) per input position"""
+    if path.endswith('.bin'):
+        for rec in packed.iter_records(path):
+            fen, result, score, _ = packed.unpack(rec)
+            yield fen, result, score
+        return
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            fen, _, label = line.partition(' | ')
+            try:
+                value = float(label)
+            except ValueError:
+                continue
+            if labels == 'cp':
+                yield fen.strip(), packed.RESULT_UNKNOWN, int(value)
+            else:
+                yield fen.strip(), packed.result_from_label(value), 0
+
+
+def iter_chunks(items):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--labels', choices=['wdl', 'cp'], default='wdl')
+    parser.add_argument('--workers', type=int, default=max(1, mp.cpu_count() - 1))
+    parser.add_argument('--overwrite', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.input):
+        print(f'input not found: {args.input}', file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(args.output) and not args.overwrite:
+        print(f'refusing to overwrite existing output: {args.output}', file=sys.stderr)
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    print(f'resolving {args.input} with {args.workers} workers...', flush=True)
+
+    read = kept = mates = moved = pv_plies = 0
+    t0 = last = time.monotonic()
+    with mp.Pool(args.workers, initializer=_init_worker) as pool, \
+         open(args.output, 'wb') as out, open(f'{args.output}.pv', 'w') as pv_out:
+        # imap keeps input order, so record i in the output lines up with line i of .pv
+        for results in pool.imap(_resolve_chunk, iter_chunks(iter_input(args.input, args.labels))):
+            for res in results:
+                read += 1
+                if res is None:
+                    mates += 1
+                    continue
+                record, line, plies = res
+                out.write(record)
+                pv_out.write(line)
+                kept += 1
+                if plies:
+                    moved += 1
+                    pv_plies += plies
+
+            now = time.monotonic()
+            if now - last >= REPORT_EVERY:
+                last = now
+                print(f'  {read:,} read, {kept:,} kept ({read / (now - t0):.0f}/s)', flush=True)
+
+    elapsed = time.monotonic() - t0
+    print(f'done in {elapsed:.0f}s: {read:,} read -> {kept:,} quiet leaves -> {args.output}')
+    print(f'  already quiet: {kept - moved:,}, resolved through a capture line: {moved:,} '
+          f'(avg {pv_plies / moved if moved else 0:.1f} plies), dropped mate: {mates:,}')
+
+
+if __name__ == '__main__':
+    main()
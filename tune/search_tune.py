@@ -2,18 +2,29 @@
 search-parameter tuner for sophia using Optuna + self-play matches
 
 texel tuning can't see search params — two engines with different LMR settings
-produce identical static evals. so each trial plays a fast match: sophia/ with
-trial params injected via SOPHIA_TUNE_PARAMS vs sophia/ without overrides.
-objective = match score fraction, maximised
+produce identical static evals. so each trial plays a fast match: trial params
+vs the built-in defaults, both sides searched in-process with the parameters
+swapped per move (see inprocess_match.py). objective = match score fraction,
+maximised
 
 usage:
     python tune/search_tune.py [n_trials] [games_per_trial] [parallel_games]
 
     n_trials:       Optuna trials (default: 100)
-    games_per_trial: games per match, even number (default: 400)
+    games_per_trial: game budget per trial before any extension, even number (default: 400)
     parallel_games: concurrent games (default: 8)
 
-fixed node-count games avoid wall-clock contention artifacts. best params are
+each trial is a sequential test (SPRT over game pairs, trial vs defaults): it
+is pruned as soon as H0 is accepted, stops early on H1, and a trial still
+leaning H1 when its budget runs out gets another games_per_trial, up to
+MAX_EXTENSIONS times. losers cost tens of games instead of the full budget, so
+the same compute covers many more trials
+
+fixed node-count games avoid wall-clock contention artifacts: with 10+ parallel
+games oversubscribing the cores, a clock lets the trial "win" by pruning hard
+enough that the slower default side times out (trials inflated to 0.94 while
+defaults stayed ~0.5). every move searches exactly NODES_PER_MOVE regardless of
+load, so the objective is genuinely 'better moves per node'. best params are
 written to tune/best_search_params_cython.json on each improvement. resumable
 via tune/search_optuna_cython.db
 """
@@ -22,31 +33,35 @@ import json
 import os
 import random
 import sys
-import multiprocessing
-import tempfile
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 os.environ.pop('SOPHIA_TUNE_PARAMS', None)
+sys.path.insert(0, ROOT)
 sys.path.insert(0, os.path.join(ROOT, 'sophia'))
 
 import engine.core.parameters as _params
 
-import chess
-import chess.engine
+import inprocess_match
+from gui.sprt import SPRT
 import optuna
 optuna.logging.set_verbosity(optuna.logging.INFO)
 
-BASELINE_CMD = [os.path.join(ROOT, 'sophia', 'engine.sh')]
-TRIAL_CMD    = [os.path.join(ROOT, 'sophia', 'engine.sh')]
 OPENINGS_FILE = os.path.join(ROOT, 'gui', 'assets', 'openings.txt')
 SEARCH_DB = os.path.join(ROOT, 'tune', 'search_optuna_cython.db')
 SEARCH_PARAMS_OUT = os.path.join(ROOT, 'tune', 'best_search_params_cython.json')
 
-# fixed nodes/move instead of a clock — contention-immune (see play_one). ~15k
+# fixed nodes/move instead of a clock — contention-immune (see above). ~15k
 # nodes is a few plies of real search, enough to separate search-param quality.
 NODES_PER_MOVE = 15000
 MAX_PLIES = 300
 
+# sequential trials (logistic elo of trial vs defaults)
+SPRT_ELO0 = 0.0
+SPRT_ELO1 = 20.0
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.1
+MAX_EXTENSIONS = 3
+
 
 INT_PARAMS = [
     # pruning margins
@@ -71,14 +86,14 @@ INT_PARAMS = [
     ('SEE_PRUNING_DEPTH_CAP',    _params.SEE_PRUNING_DEPTH_CAP,      3,   9),
     ('IID_MIN_DEPTH',            _params.IID_MIN_DEPTH,              3,   7),
     # aspiration
-    ('ASPIRATION_MIN',           _params.ASPIRATION_MIN,            15, 100),
-    ('ASPIRATION_MAX',           _params.ASPIRATION_MAX,           250, 900),
+    ('ASPIRATION_DELTA',         _params.ASPIRATION_DELTA,          10,  80),
+    ('ASPIRATION_WIDEN_FACTOR',  _params.ASPIRATION_WIDEN_FACTOR,    2,   6),
+    ('ASPIRATION_MIN_DEPTH',     _params.ASPIRATION_MIN_DEPTH,       1,   6),
     # move ordering
     ('MOVE_REPETITION_PENALTY',  _params.MOVE_REPETITION_PENALTY, -100,   0),
 ]
 
 FLOAT_PARAMS = [
-    ('ASPIRATION_TIGHTEN_SCALE', _params.ASPIRATION_TIGHTEN_SCALE, 0.5, 0.95),
     # TIME_USAGE_LONG / TIME_USAGE_SHORT intentionally omitted: they are dead
     # under go nodes (only fire when nodes_limit is None) so tuning them here
     # adds noise to TPE without contributing signal.
@@ -96,118 +111,10 @@ def load_openings():
         return [line.strip() for line in f if line.strip()]
 
 
-def _open_engines(params_path):
-    trial_env = dict(os.environ, SOPHIA_TUNE_PARAMS=params_path)
-    baseline_env = dict(os.environ)
-    baseline_env.pop('SOPHIA_TUNE_PARAMS', None)
-    trial = chess.engine.SimpleEngine.popen_uci(TRIAL_CMD, env=trial_env)
-    baseline = chess.engine.SimpleEngine.popen_uci(BASELINE_CMD, env=baseline_env)
-    return trial, baseline
-
-
-def _quit(eng):
-    if eng is None:
-        return
-    try:
-        eng.quit()
-    except Exception:
-        try:
-            eng.close()
-        except Exception:
-            pass
-
-
-def play_one(trial_eng, baseline_eng, opening_fen, trial_is_white, game_id):
-    """play a single game with already-open engines. game_id changes per game so
-    python-chess emits `ucinewgame` (clears TT/killers) between games.
-
-    Fixed NODES per move, not a clock: 10+ parallel games oversubscribe the cores,
-    so wall-clock time control makes whichever engine searches *more* (the slower
-    default baseline) accumulate wall time and forfeit — the tuner then "wins" by
-    pruning hard enough to time the opponent out, a pure contention artifact (saw
-    trials inflate to 0.94 while defaults stayed ~0.5). Node limits are immune to
-    CPU contention: every move searches exactly NODES_PER_MOVE regardless of load,
-    so the objective is genuinely 'better moves per node'."""
-    board = chess.Board(opening_fen + ' 0 1')
-    limit = chess.engine.Limit(nodes=NODES_PER_MOVE)
-
-    while not board.is_game_over(claim_draw=True) and board.ply() < MAX_PLIES:
-        stm = board.turn
-        engine_is_trial = (stm == chess.WHITE) == trial_is_white
-        eng = trial_eng if engine_is_trial else baseline_eng
-
-        result = eng.play(board, limit, game=game_id)
-
-        if result.move is None or result.move not in board.legal_moves:
-            return 0.0 if engine_is_trial else 1.0
-        board.push(result.move)
-
-    outcome = board.outcome(claim_draw=True)
-    if outcome is None or outcome.winner is None:
-        return 0.5
-    trial_won = (outcome.winner == chess.WHITE) == trial_is_white
-    return 1.0 if trial_won else 0.0
-
-
-def play_chunk(args):
-    """play a list of games reusing one trial + one baseline engine. restarts an
-    engine if it crashes (the crashing side forfeits that single game)"""
-    game_specs, params_path = args  # list of (opening_fen, trial_is_white)
-
-    trial_eng, baseline_eng = _open_engines(params_path)
-    scores = []
-    trial_crashed = False
-    try:
-        for game_id, (fen, trial_is_white) in enumerate(game_specs):
-            try:
-                scores.append(play_one(trial_eng, baseline_eng, fen, trial_is_white, game_id))
-                trial_crashed = False
-            except (chess.engine.EngineError, chess.engine.EngineTerminatedError,
-                    BrokenPipeError) as e:
-                # identify which engine crashed by trying a ping; the one that
-                # fails is the culprit and forfeits. unstable trial params that
-                # crash should not be scored the same as a fair draw.
-                trial_alive = True
-                try:
-                    trial_eng.ping()
-                except Exception:
-                    trial_alive = False
-                score = 0.0 if not trial_alive else 1.0
-                scores.append(score)
-                _quit(trial_eng); _quit(baseline_eng)
-                trial_eng, baseline_eng = _open_engines(params_path)
-    finally:
-        _quit(trial_eng); _quit(baseline_eng)
-    return scores
-
-
 def run_match(params, n_games, n_parallel, openings):
-    fd, params_path = tempfile.mkstemp(suffix='.json', prefix='sophia_tune_')
-    with os.fdopen(fd, 'w') as f:
-        json.dump(params, f)
-
-    try:
-        # build the game list: each opening played twice (trial as W, then as B)
-        games = []
-        for _ in range(n_games // 2):
-            fen = random.choice(openings)
-            games.append((fen, True))
-            games.append((fen, False))
-
-        # split across workers so each worker reuses its engine pair for many games
-        # (cuts engine spawns from 2*n_games to 2*n_parallel per trial)
-        chunks = [[] for _ in range(n_parallel)]
-        for i, g in enumerate(games):
-            chunks[i % n_parallel].append(g)
-        tasks = [(chunk, params_path) for chunk in chunks if chunk]
-
-        with multiprocessing.Pool(len(tasks)) as pool:
-            results = pool.map(play_chunk, tasks)
-        scores = [s for chunk_scores in results for s in chunk_scores]
-        return sum(scores), len(scores)
-    finally:
-        os.remove(params_path)
-
+    # trial params vs the built-in defaults, each opening played with both colours
+    games = inprocess_match.paired_games(openings, n_games)
+    return inprocess_match.run_match(params, None, games, n_parallel, NODES_PER_MOVE, MAX_PLIES)
 
 
 _openings = None
@@ -232,9 +139,49 @@ def objective(trial):
             vals.append(vals[-1] + delta)
         params[name] = vals
 
-    score, played = run_match(params, _n_games, _n_parallel, _openings)
+    return run_sequential(trial, params)
+
+
+def run_sequential(trial, params):
+    """
+    play opening pairs until the SPRT decides or the budget runs out, reporting
+    the running score to Optuna after every pair. H0 raises TrialPruned
+    """
+    sprt = SPRT(SPRT_ELO0, SPRT_ELO1, SPRT_ALPHA, SPRT_BETA)
+    step = max(1, _n_games // 2)
+    budget = step
+    fens = [random.choice(_openings) for _ in range(step * (1 + MAX_EXTENSIONS))]
+    score = 0.0
+    status = None
+    verdict = ''
+
+    pairs = inprocess_match.iter_pairs(params, None, fens, _n_parallel, NODES_PER_MOVE, MAX_PLIES)
+    try:
+        for points in pairs:
+            sprt.add_pair(points)
+            score += points
+            trial.report(score / (2 * sprt.pairs), step=sprt.pairs)
+
+            status = sprt.status()
+            if status:
+                verdict = f'  {status}'
+                break
+            if sprt.pairs >= budget:
+                # out of games: extend only while the evidence leans towards H1
+                if sprt.llr() <= 0 or budget >= len(fens):
+                    break
+                budget += step
+                verdict = f'  extended to {2 * budget} games'
+    finally:
+        pairs.close()
+
+    played = 2 * sprt.pairs
     frac = score / played
-    print(f'  trial {trial.number}: {score}/{played} = {frac:.3f}', flush=True)
+    trial.set_user_attr('llr', sprt.llr())
+    trial.set_user_attr('games', played)
+    print(f'  trial {trial.number}: {score}/{played} = {frac:.3f}  LLR {sprt.llr():.2f}{verdict}', flush=True)
+    if status == 'H0':
+        raise optuna.TrialPruned()
     return frac
 
 
@@ -294,7 +241,9 @@ def main():
 
     n_params = len(INT_PARAMS) + len(FLOAT_PARAMS) + sum(len(d) - 1 for _, d, _, _ in LIST_PARAMS)
     print(f'search tuning: {n_trials} trials x {_n_games} games at {NODES_PER_MOVE} nodes/move, '
-          f'{_n_parallel} parallel games, {n_params} params\n', flush=True)
+          f'{_n_parallel} parallel games, {n_params} params', flush=True)
+    print(f'  SPRT [{SPRT_ELO0:g}, {SPRT_ELO1:g}] alpha {SPRT_ALPHA:g} beta {SPRT_BETA:g}, '
+          f'up to {MAX_EXTENSIONS} extensions\n', flush=True)
 
     study.optimize(objective, n_trials=n_trials, callbacks=[callback])
 
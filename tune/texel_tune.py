@@ -7,6 +7,9 @@ minimises: MSE = mean((sigmoid(white_eval / K) - label)^2)
 runs under the project CPython venv because the engine modules are Cython extensions:
     venv/bin/python tune/texel_tune.py [fens_file] [max_positions] [max_passes]
 
+fens_file is 'fen | label' text or a packed .bin (resolve_quiet.py output, so
+the eval is fit on quiet leaves instead of positions with captures pending)
+
 results are written to tune/best_params_cython_wdl.json and
 tune/best_parameters_cython_wdl.py whenever MSE improves
 """
@@ -20,11 +23,13 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(ROOT, 'sophia'))
 
 from engine.board.fen_parser import load_from_fen
-from engine.core.constants import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from engine.core.constants import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE, NULL, FLIP_BOARD
 import engine.core.parameters as _params
 import engine.search.evaluation as _eval
 from engine.moves.legality import is_in_check
-from engine.search.evaluation import evaluate
+from engine.search.evaluation import evaluate, calculate_initial_score
+
+import packed_positions as packed
 
 WDL_PARAMS_OUT = os.path.join('tune', 'best_params_cython_wdl.json')
 WDL_PARAMETERS_OUT = os.path.join('tune', 'best_parameters_cython_wdl.py')
@@ -92,6 +97,24 @@ PSQT_NAMES = ['mg_pawn', 'eg_pawn', 'mg_knight', 'eg_knight',
 
 PSQT_DELTA = 30
 
+PSQT_PIECE = {
+    'pawn': PAWN, 'knight': KNIGHT, 'bishop': BISHOP,
+    'rook': ROOK, 'queen': QUEEN, 'king': KING,
+}
+
+# scalars that gate on the eval crossing a threshold rather than on a board
+# feature — any position can flip, so trials on these rescore the whole set.
+# the trade and mop-up weights only count past such a gate, so which positions
+# they reach moves with every other parameter and a probe at the start goes stale
+DENSE_SCALARS = {
+    'mop_up_activation', 'mop_up_centre_weight', 'mop_up_distance_weight',
+    'trade_bonus_per_piece', 'trade_penalty_per_piece',
+}
+
+# probe offset for the scalar index; must be >= MAX_PHASE so a tapered term
+# can't round away to zero and hide a dependent position
+INDEX_PROBE = 64
+
 SCALAR_TO_CONST = {
     'doubled_pawn_penalty':    'DOUBLED_PAWN_PENALTY',
     'isolated_pawn_penalty':   'ISOLATED_PAWN_PENALTY',
@@ -174,14 +197,18 @@ def apply_all(scalars, floats, psqt):
 
 
 def load_dataset(path, cap):
-    raw = []
-    with open(path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            fen, label = line.rsplit(' | ', 1)
-            raw.append((fen, float(label)))
+    # .bin = packed records, e.g. quiet leaves from resolve_quiet.py
+    if path.endswith('.bin'):
+        raw = list(packed.iter_labelled(path, 'wdl'))
+    else:
+        raw = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                fen, label = line.rsplit(' | ', 1)
+                raw.append((fen, float(label)))
 
     # drop in-check positions (static eval can't model the check)
     kept = []
@@ -225,8 +252,10 @@ def mse(positions, white_eval, K):
 
 def fit_k(positions, white_eval):
     # cache raw white evals once (params are fixed during K fit), then scan K
-    evals = [(white_eval(fen), label) for fen, label in positions]
+    return fit_k_evals([(white_eval(fen), label) for fen, label in positions])
 
+
+def fit_k_evals(evals):
     def mse_for_k(K):
         inv_k = 1.0 / K
         total = 0.0
@@ -249,6 +278,119 @@ def fit_k(positions, white_eval):
     return K, mse_for_k(K)
 
 
+class DeltaMSE:
+    """
+    per-position cached white evals + squared errors for coordinate descent
+
+    a trial rescores only the positions listed for the parameter being moved
+    and patches the running total; revert() restores them if the step is
+    rejected. positions are parsed to States once and re-scored in place the
+    same way texel_tune_mp workers do (mg/eg/phase recomputed from the tables)
+    """
+
+    def __init__(self, positions, K):
+        self.states = [load_from_fen(fen) for fen, _ in positions]
+        self.labels = [label for _, label in positions]
+        self.n = len(positions)
+        self.evals = [0] * self.n
+        self.errs = [0.0] * self.n
+        self.everything = range(self.n)
+        self._undo = None
+        self.rescore_all(K)
+
+    def _white_eval(self, st):
+        st.mg_score, st.eg_score, st.phase = calculate_initial_score(st)
+        score = evaluate(st)
+        return score if st.is_white else -score
+
+    def rescore_all(self, K):
+        self.inv_k = 1.0 / K
+        for i, st in enumerate(self.states):
+            s = self._white_eval(st)
+            d = 1.0 / (1.0 + math.exp(-s * self.inv_k)) - self.labels[i]
+            self.evals[i] = s
+            self.errs[i] = d * d
+        self.total = math.fsum(self.errs)
+        self._undo = None
+        return self.total / self.n
+
+    def mse(self):
+        return self.total / self.n
+
+    def trial(self, idxs):
+        # params must already be applied; leaves the result pending until the
+        # caller either keeps it or calls revert()
+        undo = []
+        total = self.total
+        inv_k = self.inv_k
+        evals, errs, labels, states = self.evals, self.errs, self.labels, self.states
+        for i in idxs:
+            s = self._white_eval(states[i])
+            if s == evals[i]:
+                continue
+            d = 1.0 / (1.0 + math.exp(-s * inv_k)) - labels[i]
+            e = d * d
+            undo.append((i, evals[i], errs[i]))
+            total += e - errs[i]
+            evals[i] = s
+            errs[i] = e
+        self._undo = (undo, self.total)
+        self.total = total
+        return total / self.n
+
+    def revert(self):
+        undo, total = self._undo
+        for i, s, e in undo:
+            self.evals[i] = s
+            self.errs[i] = e
+        self.total = total
+        self._undo = None
+
+
+def build_feature_index(tracker, scalars, floats):
+    """
+    parameter -> positions whose eval depends on it
+
+    PSQT cells are indexed structurally (a piece of that type on the mirrored
+    square). scalars are probed at +/- INDEX_PROBE against the cached evals —
+    a scalar that never enters a position's eval can't move it at any value.
+    floats and DENSE_SCALARS are left out and rescore everything
+    """
+    index = {}
+    base = list(tracker.evals)
+
+    for name, default, lo, hi in SCALAR_PARAMS:
+        if name in DENSE_SCALARS:
+            continue
+        old = scalars[name]
+        hit = set()
+        for probe in (INDEX_PROBE, -INDEX_PROBE):
+            scalars[name] = old + probe
+            apply_scalars(scalars, floats)
+            _eval.init_eval_tables()
+            for i, st in enumerate(tracker.states):
+                if tracker._white_eval(st) != base[i]:
+                    hit.add(i)
+        scalars[name] = old
+        index[name] = sorted(hit)
+    apply_scalars(scalars, floats)
+    _eval.init_eval_tables()
+
+    cells = {}
+    for i, st in enumerate(tracker.states):
+        for sq, piece in enumerate(st.board):
+            if piece == NULL:
+                continue
+            idx = sq ^ FLIP_BOARD if piece & WHITE else sq
+            cells.setdefault((piece & ~WHITE, idx), []).append(i)
+    for name in PSQT_NAMES:
+        p_type = PSQT_PIECE[name.split('_', 1)[1]]
+        for sq in range(64):
+            index[(name, sq)] = sorted(set(cells.get((p_type, sq), ())))
+
+    return index
+
+
 def configure_outputs(params_path, parameters_path):
     global _OUTPUT_PARAMS_PATH, _OUTPUT_PARAMETERS_PATH
     _OUTPUT_PARAMS_PATH = params_path
@@ -307,12 +449,17 @@ def save_best(scalars, floats, psqt, K, mse_val):
 
 
 def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
-    white_eval = make_eval_fn()
     apply_all(scalars, floats, psqt)
-    best = mse(positions, white_eval, K)
+    tracker = DeltaMSE(positions, K)
+    best = tracker.mse()
     print(f'start MSE = {best:.6f} (K={K:.1f})', flush=True)
     save_best(scalars, floats, psqt, K, best)
 
+    index = build_feature_index(tracker, scalars, floats)
+    n_refs = sum(len(v) for v in index.values())
+    print(f'feature index: {len(index)} params, {n_refs} position refs '
+          f'({n_refs / max(1, len(index)):.0f} avg, {len(positions)} positions)', flush=True)
+
     # scalar/psqt steps shrink each pass; floats use their own small steps
     int_steps = [8, 4, 2, 1]
     float_steps = [0.04, 0.02, 0.01]
@@ -324,6 +471,7 @@ def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
 
         # scalar ints
         for name, default, lo, hi in SCALAR_PARAMS:
+            affected = index.get(name, tracker.everything)
             for delta in (istep, -istep):
                 v = scalars[name] + delta
                 if v < lo or v > hi:
@@ -332,12 +480,13 @@ def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
                 scalars[name] = v
                 apply_scalars(scalars, floats)
                 _eval.init_eval_tables()
-                m = mse(positions, white_eval, K)
+                m = tracker.trial(affected)
                 if m < best - 1e-9:
                     best = m
                     improved += 1
                     break
                 scalars[name] = old
+                tracker.revert()
             else:
                 apply_scalars(scalars, floats)
                 _eval.init_eval_tables()
@@ -352,12 +501,13 @@ def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
                 floats[name] = v
                 apply_scalars(scalars, floats)
                 _eval.init_eval_tables()
-                m = mse(positions, white_eval, K)
+                m = tracker.trial(tracker.everything)
                 if m < best - 1e-9:
                     best = m
                     improved += 1
                     break
                 floats[name] = old
+                tracker.revert()
             else:
                 apply_scalars(scalars, floats)
                 _eval.init_eval_tables()
@@ -369,6 +519,7 @@ def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
             for sq in range(64):
                 lo = base[sq] - PSQT_DELTA
                 hi = base[sq] + PSQT_DELTA
+                affected = index[(name, sq)]
                 for delta in (istep, -istep):
                     v = arr[sq] + delta
                     if v < lo or v > hi:
@@ -377,19 +528,21 @@ def coordinate_descent(positions, scalars, floats, psqt, K, max_passes):
                     arr[sq] = v
                     apply_psqt(psqt)
                     _eval.init_eval_tables()
-                    m = mse(positions, white_eval, K)
+                    m = tracker.trial(affected)
                     if m < best - 1e-9:
                         best = m
                         improved += 1
                         break
                     arr[sq] = old
+                    tracker.revert()
                 else:
                     apply_psqt(psqt)
                     _eval.init_eval_tables()
 
-        # refit K periodically — eval scale drifts as params move
-        K, _ = fit_k(positions, white_eval)
-        best = mse(positions, white_eval, K)
+        # refit K periodically — eval scale drifts as params move. the full
+        # rescore also resyncs the running total against accumulated fp error
+        K, _ = fit_k_evals(list(zip(tracker.evals, tracker.labels)))
+        best = tracker.rescore_all(K)
         save_best(scalars, floats, psqt, K, best)
         print(f'pass {p+1}/{max_passes}: MSE={best:.6f} K={K:.1f} '
               f'improvements={improved} (istep={istep})', flush=True)
@@ -17,7 +17,8 @@ sums. coordinate descent stays sequential
 
     venv/bin/python tune/texel_tune_cp.py [fens_cp_file] [max_positions] [max_passes] [workers]
 
-fens_cp_file must be output of annotate_fens_cp.py (format: 'fen | cp_int')
+fens_cp_file must be output of annotate_fens_cp.py (format: 'fen | cp_int'), or
+the packed .bin from resolve_quiet.py --labels cp
 """
 
 import json
@@ -37,6 +38,7 @@ import texel_tune as _serial
 import engine.core.parameters as _params
 from engine.board.fen_parser import load_from_fen
 from engine.moves.legality import is_in_check
+import packed_positions as packed
 
 CP_PARAMS_OUT = os.path.join('tune', 'best_params_cython_cp.json')
 CP_PARAMETERS_OUT = os.path.join('tune', 'best_parameters_cython_cp.py')
@@ -45,21 +47,24 @@ _OUTPUT_CP_PARAMETERS_PATH = CP_PARAMETERS_OUT
 
 
 def load_dataset_cp(fens_file, cap):
-    raw = []
-    with open(fens_file) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            parts = line.split(' | ')
-            if len(parts) != 2:
-                continue
-            fen = parts[0].strip()
-            try:
-                cp = float(parts[1].strip())
-            except ValueError:
-                continue
-            raw.append((fen, cp))
+    if fens_file.endswith('.bin'):
+        raw = list(packed.iter_labelled(fens_file, 'cp'))
+    else:
+        raw = []
+        with open(fens_file) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                parts = line.split(' | ')
+                if len(parts) != 2:
+                    continue
+                fen = parts[0].strip()
+                try:
+                    cp = float(parts[1].strip())
+                except ValueError:
+                    continue
+                raw.append((fen, cp))
 
     positions = []
     dropped_check = 0